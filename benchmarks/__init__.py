@@ -0,0 +1 @@
+"""Performance benchmarks for the PNML engine and its analysis tools."""
@@ -0,0 +1,128 @@
+"""Compare two benchmark result files and fail on regressions beyond a threshold.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.15 --metric "dap_*=0.3"
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import fnmatch
+import json
+import sys
+
+# Metric-name suffixes and whether larger values are better. Metrics matching
+# none of them (sizes, step counts) are reported but never fail a comparison.
+DIRECTIONS: Tuple[Tuple[str, bool], ...] = (
+    ("_per_s", True),
+    ("_s", False),
+    ("_overhead", False),
+    ("_kb", False),
+    ("_per_token", False),
+    ("_per_entry", False),
+    ("_per_op", False),
+    ("_per_element", False),
+)
+
+
+def higher_is_better(metric: str) -> Optional[bool]:
+    for suffix, higher in DIRECTIONS:
+        if metric.endswith(suffix):
+            return higher
+    return None
+
+
+@dataclass
+class Delta:
+    scenario: str
+    metric: str
+    base: float
+    head: float
+    # Relative change in the "worse" direction: 0.2 means 20% worse, negative is better.
+    regression: float
+    threshold: float
+
+    @property
+    def failed(self) -> bool:
+        return self.regression > self.threshold
+
+
+def compare(
+    base: Dict[str, object],
+    head: Dict[str, object],
+    threshold: float = 0.1,
+    overrides: Optional[Dict[str, float]] = None,
+) -> List[Delta]:
+    """Deltas for every directional metric present in both result files.
+
+    overrides maps fnmatch patterns over metric names (or "scenario.metric")
+    to their own relative threshold.
+    """
+    overrides = overrides or {}
+    deltas: List[Delta] = []
+    base_results: Dict[str, Dict[str, float]] = base.get("results", {})  # type: ignore[assignment]
+    head_results: Dict[str, Dict[str, float]] = head.get("results", {})  # type: ignore[assignment]
+    for scenario in sorted(set(base_results) & set(head_results)):
+        before, after = base_results[scenario], head_results[scenario]
+        for metric in sorted(set(before) & set(after)):
+            higher = higher_is_better(metric)
+            old, new = before[metric], after[metric]
+            if higher is None or not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+                continue
+            change = (new - old) / abs(old)
+            limit = threshold
+            for pattern, value in overrides.items():
+                if fnmatch.fnmatch(metric, pattern) or fnmatch.fnmatch(f"{scenario}.{metric}", pattern):
+                    limit = value
+            deltas.append(Delta(scenario, metric, float(old), float(new), -change if higher else change, limit))
+    return deltas
+
+
+def _parse_override(text: str) -> Tuple[str, float]:
+    pattern, _, value = text.partition("=")
+    if not pattern or not value:
+        raise argparse.ArgumentTypeError(f"expected PATTERN=FRACTION, got {text!r}")
+    return pattern, float(value)
+
+
+def _format(deltas: List[Delta], base: Dict[str, object], head: Dict[str, object]) -> str:
+    def label(report: Dict[str, object]) -> str:
+        meta = report.get("meta") or {}
+        return str(meta.get("commit") or "?")  # type: ignore[union-attr]
+
+    out = [f"base {label(base)} -> head {label(head)}"]
+    header = f"{'scenario':<14}{'metric':<28}{'base':>14}{'head':>14}{'change':>9}"
+    out += [header, "-" * len(header)]
+    for delta in deltas:
+        mark = "  REGRESSION" if delta.failed else ""
+        out.append(
+            f"{delta.scenario:<14}{delta.metric:<28}{delta.base:>14.6g}{delta.head:>14.6g}"
+            f"{-delta.regression if higher_is_better(delta.metric) else delta.regression:>+9.1%}{mark}"
+        )
+    failed = sum(delta.failed for delta in deltas)
+    out.append(f"{failed} regression(s) beyond threshold" if failed else "no regressions beyond threshold")
+    return "\n".join(out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown/growth that fails (0.1 = 10%%)")
+    parser.add_argument("--metric", type=_parse_override, action="append", default=[], help="PATTERN=FRACTION override")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+    with open(args.base, "r", encoding="utf-8") as handle:
+        base = json.load(handle)
+    with open(args.head, "r", encoding="utf-8") as handle:
+        head = json.load(handle)
+    deltas = compare(base, head, args.threshold, dict(args.metric))
+    print(_format(deltas, base, head))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump([dict(asdict(delta), failed=delta.failed) for delta in deltas], handle, indent=2)
+    return 1 if any(delta.failed for delta in deltas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
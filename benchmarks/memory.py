@@ -0,0 +1,280 @@
+"""Peak and retained memory per token, history entry, pending op and parsed element.
+
+    python -m benchmarks.memory --size 2000 --json mem.json
+    python -m benchmarks.compare base-mem.json mem.json --threshold 0.1
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import gc
+import json
+import os
+import tracemalloc
+
+from enginepy.async_engine import AsyncPNMLEngine
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.pnml_dap import PNMLDAPServer
+from enginepy.pnml_engine import DebugEngine, PNMLEngine
+from enginepy.pnml_parser import Inscription, parse_pnml
+
+from .netgen import deep_queue, fork_join, inscription_heavy, linear_chain
+from .throughput import metadata
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Allocations made by the measurement itself.
+_IGNORED = (tracemalloc.__file__, __file__)
+
+
+class Probe:
+    """tracemalloc window: bytes held and peak above the level at start().
+
+    Snapshots are taken after a gc.collect() so cycles freed late do not
+    count as retained.
+    """
+
+    def __init__(self) -> None:
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.base_bytes = 0
+
+    def start(self) -> None:
+        gc.collect()
+        tracemalloc.start(1)
+        self.baseline = tracemalloc.take_snapshot()
+        self.base_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def held(self) -> int:
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - self.base_bytes
+
+    def peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1] - self.base_bytes
+
+    def hotspots(self, limit: int, snapshot: Optional[tracemalloc.Snapshot] = None) -> List[Dict[str, object]]:
+        """Largest growth since start() by file:line (of snapshot, or of a fresh one)."""
+        gc.collect()
+        snapshot = snapshot or tracemalloc.take_snapshot()
+        filters = [tracemalloc.Filter(False, path) for path in _IGNORED]
+        stats = snapshot.filter_traces(filters).compare_to(self.baseline.filter_traces(filters), "lineno")  # type: ignore[union-attr]
+        spots: List[Dict[str, object]] = []
+        for stat in stats:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            path = os.path.relpath(frame.filename, _ROOT) if frame.filename.startswith(_ROOT) else frame.filename
+            spots.append({"where": f"{path}:{frame.lineno}", "kb": stat.size_diff / 1024, "blocks": stat.count_diff})
+            if len(spots) >= limit:
+                break
+        return spots
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+
+Result = Tuple[Dict[str, float], List[Dict[str, object]]]
+
+
+def engine_tokens(size: int, hotspots: int) -> Result:
+    """Tokens moved through a three-stage queue; retained is what the finished engine holds.
+
+    The token objects are created before measuring, so only the engine's own
+    per-token cost (queue slots, moved-token lists, bookkeeping) counts.
+    """
+    net, _ = parse_pnml(deep_queue(size, stages=3))
+    extra = [{"id": i} for i in range(size)]
+    probe = Probe()
+    probe.start()
+    try:
+        engine = PNMLEngine(net)
+        engine.marking["p1"].extend(extra)
+        engine.run()
+        held = probe.held()
+        peak = probe.peak()
+        spots = probe.hotspots(hotspots)
+    finally:
+        probe.stop()
+    tokens = 2 * size
+    return {
+        "tokens": tokens,
+        "peak_kb": peak / 1024,
+        "retained_kb": held / 1024,
+        "peak_bytes_per_token": peak / tokens,
+        "retained_bytes_per_token": held / tokens,
+    }, spots
+
+
+def debug_history(size: int, hotspots: int) -> Result:
+    """DebugEngine stepping a chain; every step appends a history entry."""
+    debug = DebugEngine()
+    debug.load(linear_chain(20, tokens=max(1, size // 20)))
+    probe = Probe()
+    probe.start()
+    try:
+        entries = 0
+        while entries < size and debug.step_once() is not None:
+            entries += 1
+        held = probe.held()
+        peak = probe.peak()
+        spots = probe.hotspots(hotspots)
+    finally:
+        probe.stop()
+    entries = max(entries, 1)
+    return {
+        "entries": entries,
+        "peak_kb": peak / 1024,
+        "retained_kb": held / 1024,
+        "peak_bytes_per_entry": peak / entries,
+        "retained_bytes_per_entry": held / entries,
+    }, spots
+
+
+def pending_ops(size: int, hotspots: int) -> Result:
+    """size outstanding form ops on an engine that keeps firing, then all completed.
+
+    leftover_bytes_per_op is what stays behind once every op was delivered and
+    its tokens consumed; it should be close to zero.
+    """
+    net, _ = parse_pnml(linear_chain(2, tokens=size))
+    net.transitions["t0"].inscriptions = [
+        Inscription(id="form", kind="expression", exec_mode="async", func=lambda token: AsyncOpRequest(operation_type="form")),
+    ]
+    engine = AsyncPNMLEngine(net)
+    probe = Probe()
+    probe.start()
+    try:
+        while engine.step_once() is not None:
+            pass
+        opened = len(engine.pending_ops_by_id)
+        held = probe.held()
+        peak = probe.peak()
+        spots = probe.hotspots(hotspots)
+        for op_id in list(engine.pending_ops_by_id):
+            engine.submit_async(op_id=op_id, result={"ok": True, "_drop_moved_tokens": True})
+        engine.run()
+        engine.marking["p2"].clear()
+        leftover = probe.held()
+    finally:
+        probe.stop()
+    opened = max(opened, 1)
+    return {
+        "ops": opened,
+        "peak_kb": peak / 1024,
+        "retained_kb": held / 1024,
+        "peak_bytes_per_op": peak / opened,
+        "retained_bytes_per_op": held / opened,
+        "leftover_bytes_per_op": leftover / opened,
+    }, spots
+
+
+def parsed_elements(size: int, hotspots: int) -> Result:
+    """parse_pnml on an inscription-heavy chain plus a fork/join; retained is the parsed nets."""
+    texts = [inscription_heavy(max(1, size // 20), guards=2), fork_join(max(1, size // 10), depth=2)]
+    probe = Probe()
+    probe.start()
+    try:
+        parsed = [parse_pnml(text) for text in texts]
+        held = probe.held()
+        peak = probe.peak()
+        spots = probe.hotspots(hotspots)
+    finally:
+        probe.stop()
+    elements = sum(len(net.places) + len(net.transitions) + len(net.arcs) for net, _index in parsed)
+    return {
+        "elements": elements,
+        "yaml_bytes": sum(len(text) for text in texts),
+        "peak_kb": peak / 1024,
+        "retained_kb": held / 1024,
+        "peak_bytes_per_element": peak / elements,
+        "retained_bytes_per_element": held / elements,
+    }, spots
+
+
+class _SnapshotSink:
+    """DAP stdout replacement that snapshots the heap on the first write, while the payload is alive."""
+
+    def __init__(self) -> None:
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def write(self, data: bytes) -> int:
+        if self.snapshot is None and tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def dap_marking(size: int, hotspots: int) -> Result:
+    """One DAP marking output event for a place holding size tokens."""
+    server = PNMLDAPServer(start_reader=False)
+    sink = _SnapshotSink()
+    server.protocol.out = sink  # type: ignore[assignment]
+    server.engine.load(deep_queue(size, stages=1))
+    engine = server.engine.engine
+    assert engine is not None
+    for i in range(size):
+        engine.marking["p0"][i] = {"id": i, "payload": "x" * 16}
+    probe = Probe()
+    probe.start()
+    try:
+        server._emit_marking()
+        peak = probe.peak()
+        held = probe.held()
+        spots = probe.hotspots(hotspots, sink.snapshot)
+    finally:
+        probe.stop()
+    return {
+        "tokens": size,
+        "peak_kb": peak / 1024,
+        "retained_kb": held / 1024,
+        "peak_bytes_per_token": peak / size,
+    }, spots
+
+
+SCENARIOS: Dict[str, Callable[[int, int], Result]] = {
+    "engine_tokens": engine_tokens,
+    "debug_history": debug_history,
+    "pending_ops": pending_ops,
+    "parse": parsed_elements,
+    "dap_marking": dap_marking,
+}
+
+
+def run(scenarios: Sequence[str], size: int = 2000, hotspots: int = 8) -> Dict[str, object]:
+    results: Dict[str, Dict[str, float]] = {}
+    spots: Dict[str, List[Dict[str, object]]] = {}
+    for name in scenarios:
+        results[name], spots[name] = SCENARIOS[name](size, hotspots)
+    meta = metadata()
+    meta.update({"suite": "memory", "size": size})
+    return {"meta": meta, "results": results, "hotspots": spots}
+
+
+def _format(report: Dict[str, object]) -> str:
+    out: List[str] = []
+    for name, row in report["results"].items():  # type: ignore[union-attr]
+        per_unit = ", ".join(f"{key} {value:.1f}" for key, value in row.items() if "_per_" in key)
+        out.append(f"{name}: peak {row['peak_kb']:.1f} KiB, retained {row['retained_kb']:.1f} KiB; {per_unit}")
+        for spot in report["hotspots"][name]:  # type: ignore[index]
+            out.append(f"    {spot['kb']:>9.1f} KiB {spot['blocks']:>7} blocks  {spot['where']}")
+    return "\n".join(out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, object]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--hotspots", type=int, default=8)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+    report = run(args.scenarios, args.size, args.hotspots)
+    print(_format(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
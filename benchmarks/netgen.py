@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import random
+
+# (kind, inline python body) pairs; bodies see the head token as ``token``.
+Inscriptions = Dict[str, List[Tuple[str, str]]]
+
+
+def render_net(
+    net_id: str,
+    places: Sequence[str],
+    transitions: Sequence[str],
+    arcs: Sequence[Tuple[str, str]],
+    initial: Optional[Dict[str, int]] = None,
+    inscriptions: Optional[Inscriptions] = None,
+) -> str:
+    """PNML YAML for a net given as node ids and (source, target) arcs."""
+    initial = initial or {}
+    inscriptions = inscriptions or {}
+    lines: List[str] = [
+        "pnml:",
+        "  net:",
+        f"    - id: {net_id}",
+        "      page:",
+        "        - id: page1",
+        "          place:",
+    ]
+    for pid in places:
+        lines.append(f"            - id: {pid}")
+        count = initial.get(pid, 0)
+        if count:
+            lines.append("              evolve:")
+            lines.append("                initialTokens:")
+            lines.extend(["                  - value: token"] * count)
+    lines.append("          transition:")
+    for tid in transitions:
+        lines.append(f"            - id: {tid}")
+        if inscriptions.get(tid):
+            lines.append("              evolve:")
+            lines.append("                inscriptions:")
+            for i, (kind, code) in enumerate(inscriptions[tid]):
+                lines.append(f"                  - id: {tid}_{kind}{i}")
+                lines.append("                    language: python")
+                lines.append(f"                    kind: {kind}")
+                lines.append("                    source: inline")
+                lines.append("                    code: |")
+                lines.extend(f"                      {line}" for line in code.splitlines())
+    lines.append("          arc:")
+    for i, (source, target) in enumerate(arcs):
+        lines.append(f"            - id: a{i}")
+        lines.append(f"              source: {source}")
+        lines.append(f"              target: {target}")
+    return "\n".join(lines) + "\n"
+
+
+def linear_chain(length: int, tokens: int = 1) -> str:
+    """p0 -> t0 -> p1 -> ... -> p<length>, with tokens in p0."""
+    places = [f"p{i}" for i in range(length + 1)]
+    transitions = [f"t{i}" for i in range(length)]
+    arcs: List[Tuple[str, str]] = []
+    for i, tid in enumerate(transitions):
+        arcs += [(places[i], tid), (tid, places[i + 1])]
+    return render_net(f"chain_{length}", places, transitions, arcs, {"p0": tokens})
+
+
+def fork_join(width: int, depth: int = 1, tokens: int = 1) -> str:
+    """start -> fork into width branches of depth steps each -> join -> end."""
+    places = ["start", "end"]
+    transitions = ["t_fork", "t_join"]
+    arcs: List[Tuple[str, str]] = [("start", "t_fork"), ("t_join", "end")]
+    for b in range(width):
+        previous = "t_fork"
+        for d in range(depth + 1):
+            pid = f"b{b}_{d}"
+            places.append(pid)
+            arcs.append((previous, pid))
+            if d < depth:
+                previous = f"t{b}_{d}"
+                transitions.append(previous)
+                arcs.append((pid, previous))
+            else:
+                arcs.append((pid, "t_join"))
+    return render_net(f"fork_join_{width}x{depth}", places, transitions, arcs, {"start": tokens})
+
+
+def dense_conflict(places: int, transitions: int, fan_in: int = 2, tokens: int = 2, seed: int = 0) -> str:
+    """Every transition takes from fan_in random places and returns to one, so they all compete.
+
+    Firing conserves tokens but piles them up in some places; runs stay live
+    for roughly places * tokens firings.
+    """
+    rng = random.Random(seed)
+    pids = [f"p{i}" for i in range(places)]
+    tids = [f"t{i}" for i in range(transitions)]
+    arcs: List[Tuple[str, str]] = []
+    for tid in tids:
+        for pid in rng.sample(pids, fan_in):
+            arcs.append((pid, tid))
+        arcs.append((tid, rng.choice(pids)))
+    return render_net(f"conflict_{places}x{transitions}", pids, tids, arcs, {pid: tokens for pid in pids})
+
+
+def inscription_heavy(length: int, guards: int = 3, tokens: int = 5) -> str:
+    """linear_chain whose transitions each carry guards and a sync expression."""
+    places = [f"p{i}" for i in range(length + 1)]
+    transitions = [f"t{i}" for i in range(length)]
+    arcs: List[Tuple[str, str]] = []
+    inscriptions: Inscriptions = {}
+    for i, tid in enumerate(transitions):
+        arcs += [(places[i], tid), (tid, places[i + 1])]
+        inscriptions[tid] = [("guard", f"return token is not None and len(str(token)) > {g - 1}") for g in range(guards)]
+        inscriptions[tid].append(("expression", "total = sum(range(32))\nreturn {'value': token, 'total': total}"))
+    return render_net(f"inscriptions_{length}", places, transitions, arcs, {"p0": tokens}, inscriptions)
+
+
+def deep_queue(tokens: int, stages: int = 3) -> str:
+    """A short chain whose first place holds many tokens."""
+    text = linear_chain(stages, tokens)
+    return text.replace(f"id: chain_{stages}", f"id: queue_{tokens}x{stages}", 1)
@@ -0,0 +1,71 @@
+"""State counts with and without stubborn-set reduction on synthetic nets.
+
+    python -m benchmarks.por --widths 2 4 8 12 --depth 2 --json por.json
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+import argparse
+import json
+
+from enginepy.analysis.reachability import REDUCTION_STUBBORN, explore
+from enginepy.pnml_parser import parse_pnml
+
+from .netgen import fork_join, linear_chain
+
+
+def _row(name: str, text: str, max_states: int) -> Dict[str, object]:
+    net, _ = parse_pnml(text)
+    full = explore(net, max_states=max_states)
+    reduced = explore(net, max_states=max_states, reduction=REDUCTION_STUBBORN)
+    return {
+        "net": name,
+        "places": len(net.places),
+        "transitions": len(net.transitions),
+        "states": full.states,
+        "states_complete": full.complete,
+        "reduced_states": reduced.states,
+        "reduced_complete": reduced.complete,
+        "deadlocks": full.deadlock_count,
+        "reduced_deadlocks": reduced.deadlock_count,
+        "seconds": round(full.wall_time, 4),
+        "reduced_seconds": round(reduced.wall_time, 4),
+    }
+
+
+def run(widths: Sequence[int], depth: int, max_states: int) -> List[Dict[str, object]]:
+    rows = [_row(f"fork_join_{w}x{depth}", fork_join(w, depth), max_states) for w in widths]
+    rows.append(_row("chain_50", linear_chain(50, tokens=2), max_states))
+    return rows
+
+
+def _format(rows: List[Dict[str, object]]) -> str:
+    header = f"{'net':<18}{'states':>12}{'reduced':>10}{'seconds':>10}{'reduced s':>11}"
+    out = [header, "-" * len(header)]
+    for row in rows:
+        states = f"{row['states']}{'' if row['states_complete'] else '+'}"
+        out.append(
+            f"{row['net']:<18}{states:>12}{row['reduced_states']:>10}"
+            f"{row['seconds']:>10}{row['reduced_seconds']:>11}"
+        )
+    out.append("'+' marks a full exploration cut off at --max-states.")
+    return "\n".join(out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> List[Dict[str, object]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", type=int, nargs="+", default=[2, 4, 8, 12, 16])
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--max-states", type=int, default=200_000)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+    rows = run(args.widths, args.depth, args.max_states)
+    print(_format(rows))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(rows, handle, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Parse, engine, debugger and project-generation timings on synthetic nets.
+
+    python -m benchmarks.throughput --scale 1 --json base.json
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from enginepy.pnml_dap import PNMLDAPServer
+from enginepy.pnml_engine import SCHEDULER_INCREMENTAL, DebugEngine, PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+from enginepy.project_gen import generate_python_project
+from enginepy.vector_engine import create_engine
+
+from .netgen import deep_queue, dense_conflict, fork_join, inscription_heavy, linear_chain
+
+# Scenario name -> net generator taking the --scale factor.
+SCENARIOS: Dict[str, Callable[[int], str]] = {
+    "chain": lambda scale: linear_chain(200 * scale, tokens=10),
+    "fork_join": lambda scale: fork_join(40 * scale, depth=3, tokens=5),
+    "conflict": lambda scale: dense_conflict(40 * scale, 80 * scale, tokens=50),
+    "inscriptions": lambda scale: inscription_heavy(50 * scale, guards=3, tokens=10),
+    "deep_queue": lambda scale: deep_queue(5000 * scale, stages=3),
+}
+
+
+class _Sink:
+    """Replaces the DAP server's stdout: messages are still encoded, then dropped."""
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def _best_time(fn: Callable[[], object], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _timed_engine_rate(
+    text: str, steps: int, repeats: int, factory: Callable[..., object] = PNMLEngine, **kwargs: object
+) -> float:
+    best = 0.0
+    for _ in range(repeats):
+        net, _ = parse_pnml(text)
+        engine = factory(net, **kwargs)
+        stats = engine.run(max_steps=steps)
+        if stats.steps and stats.wall_time > 0:
+            best = max(best, stats.steps / stats.wall_time)
+    return best
+
+
+def _debug_rate(text: str, steps: int, repeats: int) -> float:
+    best = 0.0
+    for _ in range(repeats):
+        debug = DebugEngine()
+        debug.load(text)
+        started = time.perf_counter()
+        taken = 0
+        while taken < steps and debug.step_once() is not None:
+            taken += 1
+        elapsed = time.perf_counter() - started
+        if taken and elapsed > 0:
+            best = max(best, taken / elapsed)
+    return best
+
+
+def _dap_rate(text: str, steps: int, repeats: int) -> float:
+    """handle_next() round trips per second, including marking and stopped events."""
+    best = 0.0
+    for _ in range(repeats):
+        server = PNMLDAPServer(start_reader=False)
+        server.protocol.out = _Sink()  # type: ignore[assignment]
+        server.engine.load(text)
+        started = time.perf_counter()
+        taken = 0
+        while taken < steps:
+            before = server.engine.step_counter
+            server.handle_next({"seq": taken + 1, "type": "request", "command": "next"})
+            if server.engine.step_counter == before:
+                break
+            taken += 1
+        elapsed = time.perf_counter() - started
+        if taken and elapsed > 0:
+            best = max(best, taken / elapsed)
+    return best
+
+
+def _project_gen_time(text: str, repeats: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        return _best_time(lambda: generate_python_project(text, tmp, source_name="bench"), repeats)
+
+
+def _peak_kb(text: str, steps: int) -> float:
+    tracemalloc.start()
+    try:
+        net, _ = parse_pnml(text)
+        PNMLEngine(net).run(max_steps=steps)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure(text: str, steps: int, dap_steps: int, repeats: int) -> Dict[str, object]:
+    net, _ = parse_pnml(text)
+    engine_rate = _timed_engine_rate(text, steps, repeats)
+    debug_rate = _debug_rate(text, steps, repeats)
+    dap_rate = _dap_rate(text, dap_steps, repeats)
+    return {
+        "places": len(net.places),
+        "transitions": len(net.transitions),
+        "yaml_bytes": len(text.encode("utf-8")),
+        "steps": PNMLEngine(net).run(max_steps=steps).steps,
+        "parse_s": _best_time(lambda: parse_pnml(text), repeats),
+        "engine_steps_per_s": engine_rate,
+        "incremental_steps_per_s": _timed_engine_rate(text, steps, repeats, scheduler_mode=SCHEDULER_INCREMENTAL),
+        # Whatever create_engine picks: the vector engine on uncoloured nets.
+        "auto_steps_per_s": _timed_engine_rate(text, steps, repeats, factory=create_engine),
+        "debug_steps_per_s": debug_rate,
+        "debug_overhead": engine_rate / debug_rate if debug_rate else 0.0,
+        "dap_steps_per_s": dap_rate,
+        "dap_overhead": engine_rate / dap_rate if dap_rate else 0.0,
+        "project_gen_s": _project_gen_time(text, repeats),
+        "peak_kb": _peak_kb(text, steps),
+    }
+
+
+def metadata() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+    }
+
+
+def run(
+    scenarios: Sequence[str],
+    scale: int = 1,
+    steps: int = 2000,
+    dap_steps: int = 300,
+    repeats: int = 3,
+) -> Dict[str, object]:
+    results = {name: measure(SCENARIOS[name](scale), steps, dap_steps, repeats) for name in scenarios}
+    meta = metadata()
+    meta.update({"suite": "throughput", "scale": scale, "steps": steps, "dap_steps": dap_steps, "repeats": repeats})
+    return {"meta": meta, "results": results}
+
+
+def _format(report: Dict[str, object]) -> str:
+    columns = [
+        ("parse_s", "parse ms", 1000.0),
+        ("engine_steps_per_s", "steps/s", 1.0),
+        ("incremental_steps_per_s", "incr/s", 1.0),
+        ("auto_steps_per_s", "auto/s", 1.0),
+        ("debug_overhead", "debug x", 1.0),
+        ("dap_overhead", "dap x", 1.0),
+        ("project_gen_s", "gen ms", 1000.0),
+        ("peak_kb", "peak KiB", 1.0),
+    ]
+    header = f"{'scenario':<14}" + "".join(f"{label:>11}" for _key, label, _scale in columns)
+    out: List[str] = [header, "-" * len(header)]
+    for name, row in report["results"].items():  # type: ignore[union-attr]
+        out.append(f"{name:<14}" + "".join(f"{row[key] * scale:>11.1f}" for key, _label, scale in columns))
+    return "\n".join(out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, object]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--dap-steps", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+    report = run(args.scenarios, args.scale, args.steps, args.dap_steps, args.repeats)
+    print(_format(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Static and state-space analysis of PNML nets."""
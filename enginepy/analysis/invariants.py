@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from ..compiled_net import compile_net
+from ..pnml_parser import PNMLNet
+from .reachability import StateSpace
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+def incidence_matrix(net: PNMLNet) -> Tuple["np.ndarray", "np.ndarray", List[str], List[str]]:
+    """Pre and incidence matrices (places x transitions) under the engine's firing rule.
+
+    pre[p, t] is the number of arcs from p to t; firing t adds, per output
+    arc, one token for each consumed token, so C = post - pre uses that
+    weight. Transitions without input arcs never fire and get zero columns.
+    """
+    if np is None:
+        raise RuntimeError("structural analysis requires numpy")
+    space = StateSpace(net)
+    pre = np.zeros((len(space.place_ids), len(space.transition_ids)), dtype=np.int64)
+    incidence = np.zeros_like(pre)
+    for t in space.firable:
+        for p, w in space.needs[t]:
+            pre[p, t] = w
+        for p, d in space.deltas[t]:
+            incidence[p, t] = d
+    return pre, incidence, space.place_ids, space.transition_ids
+
+
+def precheck(net: PNMLNet) -> Tuple[bool, List[str]]:
+    """Whether any transition can ever fire, plus hints, read off the arcs in O(arcs).
+
+    This is what pnml_validator.validate runs; it needs no numpy. Only a net
+    whose transitions all lack input arcs is reported as unable to fire. An
+    empty initial marking is a hint, since tokens may be added at runtime
+    (CaseRunner.add_case, the DAP).
+    """
+    compiled = compile_net(net)
+    hints: List[str] = []
+    sourceless = [tid for t, tid in enumerate(compiled.transition_ids) if not compiled.inputs[t]]
+    if sourceless:
+        hints.append(f"transitions without input places never fire: {', '.join(sourceless)}")
+    isolated = [
+        pid for p, pid in enumerate(compiled.place_ids) if not compiled.consumers[p] and not compiled.producers[p]
+    ]
+    if isolated:
+        hints.append(f"places on no arc: {', '.join(isolated)}")
+    if not compiled.initial_places:
+        hints.append("no initial tokens: transitions fire only once tokens are added at runtime")
+    else:
+        # Unmarked places nothing produces into stay empty, so their consumers never fire.
+        starved = sorted({
+            compiled.transition_ids[t]
+            for p in range(len(compiled.place_ids))
+            if p not in compiled.initial_places and not compiled.producers[p]
+            for t in compiled.consumers[p]
+        })
+        if starved:
+            hints.append(f"transitions reading unmarked source places never fire: {', '.join(starved)}")
+    return bool(compiled.enable_order), hints
+
+
+def _normalize(rows: "np.ndarray") -> "np.ndarray":
+    if not len(rows):
+        return rows
+    divisor = np.gcd.reduce(np.abs(rows), axis=1)
+    divisor[divisor == 0] = 1
+    return rows // divisor[:, None]
+
+
+def _contained(small: "np.ndarray", large: "np.ndarray", chunk: int = 64) -> "np.ndarray":
+    """[i, j] is True when packed support small[i] is a subset of packed support large[j]."""
+    out = np.zeros((len(small), len(large)), dtype=bool)
+    for start in range(0, len(large), chunk):
+        block = ~large[start:start + chunk]
+        out[:, start:start + chunk] = ~(small[:, None, :] & block[None, :, :]).any(axis=2)
+    return out
+
+
+class _Rows:
+    """Growable integer rows with packed support bitsets of their columns from offset.
+
+    Removing a row only clears its alive flag, so a Farkas step touches the
+    rows it combines and the new ones instead of copying the whole matrix.
+    """
+
+    def __init__(self, rows: "np.ndarray", offset: int) -> None:
+        self.offset = offset
+        self.data = rows
+        self.bits = np.packbits(rows[:, offset:] != 0, axis=1)
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.size = len(rows)
+
+    @property
+    def held(self) -> int:
+        return int(self.alive[:self.size].sum())
+
+    def column(self, j: int) -> "np.ndarray":
+        return np.where(self.alive[:self.size], self.data[:self.size, j], 0)
+
+    def add_minimal(self, new: "np.ndarray") -> None:
+        """Add the new rows whose support is minimal, one per support, dropping held rows they shrink.
+
+        Held rows are already minimal among themselves; rows with equal
+        support are multiples of one another once normalized.
+        """
+        live = np.nonzero(self.alive[:self.size])[0]
+        held_bits = self.bits[live]
+        new_bits = np.packbits(new[:, self.offset:] != 0, axis=1)
+        fresh = ~_contained(held_bits, new_bits).any(axis=0)
+        new, new_bits = new[fresh], new_bits[fresh]
+        if len(new) > 1:
+            sizes = (new[:, self.offset:] != 0).sum(axis=1)
+            order = np.arange(len(new))
+            smaller = (sizes[:, None] < sizes[None, :]) | ((sizes[:, None] == sizes[None, :]) & (order[:, None] < order[None, :]))
+            fresh = ~(_contained(new_bits, new_bits) & smaller).any(axis=0)
+            new, new_bits = new[fresh], new_bits[fresh]
+        if not len(new):
+            return
+        self.alive[live[_contained(new_bits, held_bits).any(axis=0)]] = False
+        if self.size + len(new) > len(self.data):
+            self._grow(self.size + len(new))
+        end = self.size + len(new)
+        self.data[self.size:end] = new
+        self.bits[self.size:end] = new_bits
+        self.alive[self.size:end] = True
+        self.size = end
+
+    def _grow(self, needed: int) -> None:
+        live = np.nonzero(self.alive[:self.size])[0]
+        capacity = max(2 * len(live), needed - self.size + len(live), 16)
+        data = np.zeros((capacity, self.data.shape[1]), dtype=self.data.dtype)
+        bits = np.zeros((capacity, self.bits.shape[1]), dtype=self.bits.dtype)
+        data[:len(live)] = self.data[live]
+        bits[:len(live)] = self.bits[live]
+        self.data, self.bits = data, bits
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.alive[:len(live)] = True
+        self.size = len(live)
+
+    def rows(self) -> "np.ndarray":
+        return self.data[:self.size][self.alive[:self.size]]
+
+
+def semi_positive_invariants(matrix: "np.ndarray", max_rows: int = 2000) -> Tuple["np.ndarray", bool]:
+    """Minimal-support semi-positive integer rows y with y @ matrix == 0 (Farkas algorithm).
+
+    Returns the invariants as rows and whether max_rows cut the computation
+    short (then the result may miss invariants). Combinations are only built
+    while fewer than max(max_rows, rows of matrix) rows are held, which bounds
+    time and memory.
+    """
+    n, m = matrix.shape
+    rows = _Rows(np.hstack([matrix.astype(np.int64), np.eye(n, dtype=np.int64)]), m)
+    limit = max(max_rows, n)
+    truncated = False
+    for j in range(m):
+        col = rows.column(j)
+        pos, neg = np.nonzero(col > 0)[0], np.nonzero(col < 0)[0]
+        if not len(pos) and not len(neg):
+            continue
+        combined = None
+        pairs = len(pos) * len(neg)
+        room = max(limit - (rows.held - len(pos) - len(neg)), 0)
+        if pairs > room:
+            pairs = room
+            truncated = True
+        if pairs:
+            pi, ni = np.divmod(np.arange(pairs), len(neg))
+            p_rows, n_rows = pos[pi], neg[ni]
+            data = rows.data
+            combined = (-col[n_rows])[:, None] * data[p_rows] + col[p_rows][:, None] * data[n_rows]
+        rows.alive[pos] = False
+        rows.alive[neg] = False
+        if combined is not None:
+            rows.add_minimal(_normalize(combined))
+    return rows.rows()[:, m:], truncated
+
+
+def _minimal_sets(
+    count: int,
+    violation: Callable[[FrozenSet[int]], Optional[Tuple[int, ...]]],
+    budget: int,
+) -> Tuple[List[FrozenSet[int]], bool]:
+    """Minimal non-empty sets closed under violation().
+
+    violation(S) returns the places one of which must be added to S, () when
+    S cannot be repaired, or None when S is closed.
+    """
+    found: List[FrozenSet[int]] = []
+    seen: Set[FrozenSet[int]] = set()
+    # A place is dominated when every closed set containing it contains a
+    # closed singleton (or none exists): {p} is closed, unrepairable, or
+    # forces a single dominated place. Sets holding one are never minimal
+    # unless they are that singleton, which keeps chains linear.
+    forced: Dict[int, Optional[Tuple[int, ...]]] = {}
+    for p in range(count):
+        single = frozenset((p,))
+        forced[p] = violation(single)
+        if forced[p] is None:
+            found.append(single)
+            seen.add(single)
+    dominated: Set[int] = set()
+    for p in range(count):
+        path: List[int] = []
+        q: Optional[int] = p
+        while q is not None and q not in dominated and q not in path:
+            path.append(q)
+            choices = forced[q]
+            if choices is None or not choices:
+                dominated.update(path)
+                break
+            q = choices[0] if len(choices) == 1 else None
+        else:
+            if q is not None and q in dominated:
+                dominated.update(path)
+    stack = [frozenset((p,)) for p in reversed(range(count)) if p not in dominated]
+    explored = count
+    while stack:
+        current = stack.pop()
+        if current in seen or not current.isdisjoint(dominated) or any(s <= current for s in found):
+            continue
+        seen.add(current)
+        explored += 1
+        if explored > budget:
+            return _drop_supersets(found), True
+        choices = violation(current)
+        if choices is None:
+            found.append(current)
+        else:
+            stack.extend(current | {p} for p in choices)
+    return _drop_supersets(found), False
+
+
+def _drop_supersets(sets: List[FrozenSet[int]]) -> List[FrozenSet[int]]:
+    return [s for s in sets if not any(o < s for o in sets)]
+
+
+@dataclass
+class StructuralReport:
+    """Structural facts about a net that hold for every run (guards ignored).
+
+    Invariants map place or transition ids to weights; siphons and traps are
+    sorted place-id lists. ``truncated`` is set when a computation limit was
+    hit, in which case the lists may be incomplete.
+    """
+
+    p_invariants: List[Dict[str, int]] = field(default_factory=list)
+    t_invariants: List[Dict[str, int]] = field(default_factory=list)
+    rank: int = 0
+    siphons: List[List[str]] = field(default_factory=list)
+    traps: List[List[str]] = field(default_factory=list)
+    # Places in no semi-positive P-invariant: their token count is not conserved.
+    uncovered_places: List[str] = field(default_factory=list)
+    # Siphons without initial tokens stay empty, so their consumers never fire.
+    unmarked_siphons: List[List[str]] = field(default_factory=list)
+    dead_transitions: List[str] = field(default_factory=list)
+    # Siphons that contain no initially marked trap and so may empty out later
+    # (the source place of a terminating workflow is one).
+    unprotected_siphons: List[List[str]] = field(default_factory=list)
+    firable_transitions: int = 0
+    truncated: bool = False
+
+    @property
+    def conservative(self) -> bool:
+        """Every place is covered by a P-invariant, so the net is bounded from any initial marking."""
+        return not self.uncovered_places
+
+    @property
+    def all_dead(self) -> bool:
+        return self.firable_transitions > 0 and len(self.dead_transitions) == self.firable_transitions
+
+    def hints(self) -> List[str]:
+        hints: List[str] = []
+        if self.dead_transitions:
+            hints.append(f"transitions never enabled (empty siphon): {', '.join(self.dead_transitions)}")
+        if self.uncovered_places:
+            hints.append(f"places not covered by a P-invariant (may be unbounded): {', '.join(self.uncovered_places)}")
+        return hints
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["conservative"] = self.conservative
+        data["hints"] = self.hints()
+        return data
+
+
+def analyze(net: PNMLNet, max_rows: int = 2000, max_sets: int = 20_000) -> StructuralReport:
+    """P/T-invariants, minimal siphons and traps of net, with the hints derived from them."""
+    pre, incidence, place_ids, transition_ids = incidence_matrix(net)
+    report = StructuralReport()
+    if not place_ids:
+        return report
+    firable = [t for t in range(len(transition_ids)) if pre[:, t].any()]
+    report.firable_transitions = len(firable)
+    p_rows, p_cut = semi_positive_invariants(incidence, max_rows)
+    # Only transitions that can fire take part in T-invariants.
+    t_rows, t_cut = semi_positive_invariants(incidence[:, firable].T, max_rows)
+    report.p_invariants = [_weights(row, place_ids) for row in p_rows]
+    report.t_invariants = [_weights(row, [transition_ids[t] for t in firable]) for row in t_rows]
+    report.rank = int(np.linalg.matrix_rank(incidence.astype(float))) if incidence.size else 0
+    covered = (p_rows != 0).any(axis=0) if len(p_rows) else np.zeros(len(place_ids), dtype=bool)
+    report.uncovered_places = [pid for pid, ok in zip(place_ids, covered) if not ok]
+
+    post = incidence + pre
+    inputs = {t: frozenset(np.nonzero(pre[:, t])[0].tolist()) for t in firable}
+    outputs = {t: frozenset(np.nonzero(post[:, t])[0].tolist()) for t in firable}
+    consumers: Dict[int, List[int]] = {}
+    producers: Dict[int, List[int]] = {}
+    for t in firable:
+        for p in inputs[t]:
+            consumers.setdefault(p, []).append(t)
+        for p in outputs[t]:
+            producers.setdefault(p, []).append(t)
+
+    def siphon_violation(places: FrozenSet[int]) -> Optional[Tuple[int, ...]]:
+        # A transition feeding the set must also take from it.
+        for p in places:
+            for t in producers.get(p, ()):
+                if places.isdisjoint(inputs[t]):
+                    return tuple(sorted(inputs[t]))
+        return None
+
+    def trap_violation(places: FrozenSet[int]) -> Optional[Tuple[int, ...]]:
+        # A transition taking from the set must also feed it.
+        for p in places:
+            for t in consumers.get(p, ()):
+                if places.isdisjoint(outputs[t]):
+                    return tuple(sorted(outputs[t]))
+        return None
+
+    siphons, s_cut = _minimal_sets(len(place_ids), siphon_violation, max_sets)
+    traps, r_cut = _minimal_sets(len(place_ids), trap_violation, max_sets)
+    report.truncated = p_cut or t_cut or s_cut or r_cut
+    report.siphons = [sorted(place_ids[p] for p in s) for s in siphons]
+    report.traps = [sorted(place_ids[p] for p in s) for s in traps]
+
+    marked = {p for p, pid in enumerate(place_ids) if net.places[pid].tokens}
+    dead: Set[int] = set()
+    for siphon in siphons:
+        if not siphon & marked:
+            report.unmarked_siphons.append(sorted(place_ids[p] for p in siphon))
+            dead.update(t for t in firable if siphon.intersection(inputs[t]))
+        elif not any(trap <= siphon and trap & marked for trap in traps):
+            report.unprotected_siphons.append(sorted(place_ids[p] for p in siphon))
+    report.dead_transitions = [transition_ids[t] for t in firable if t in dead]
+    return report
+
+
+def _weights(row: "np.ndarray", ids: List[str]) -> Dict[str, int]:
+    return {ids[i]: int(w) for i, w in enumerate(row) if w}
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+import pickle
+import sys
+import time
+
+from ..compiled_net import compile_net
+from ..pnml_parser import PNMLNet
+
+ORDER_BFS = "bfs"
+ORDER_DFS = "dfs"
+
+# Partial-order reduction: explore a stubborn subset of the enabled transitions.
+REDUCTION_STUBBORN = "stubborn"
+
+STOP_COMPLETE = "complete"
+STOP_MAX_STATES = "max_states"
+STOP_MAX_MEMORY = "max_memory"
+
+State = Tuple[int, ...]
+Successors = List[Tuple[int, State]]
+
+
+class StateSpace:
+    """Token-count view of a PNMLNet that follows PNMLEngine's firing rule.
+
+    A transition with input arcs is enabled when every input place holds one
+    token per arc; firing moves the consumed tokens to each output place.
+    Transitions without input arcs never fire. Guards, expressions and join
+    keys are ignored, so the explored graph over-approximates what the engine
+    can reach. Markings are tuples of counts in CompiledNet place order.
+
+    ``dependent[t]`` lists the transitions that can disable t or be disabled
+    by it (one decreases an input place of the other) and ``raisers[p]`` the
+    transitions that increase p; both feed stubborn_successors().
+    """
+
+    def __init__(self, net: PNMLNet) -> None:
+        compiled = compile_net(net)
+        self.place_ids: List[str] = list(compiled.place_ids)
+        self.transition_ids: List[str] = list(compiled.transition_ids)
+        self.initial: State = tuple(len(net.places[pid].tokens) for pid in self.place_ids)
+        self.needs: List[Tuple[Tuple[int, int], ...]] = []
+        self.deltas: List[Tuple[Tuple[int, int], ...]] = []
+        for t in range(len(self.transition_ids)):
+            weights: Dict[int, int] = {}
+            for p in compiled.inputs[t]:
+                weights[p] = weights.get(p, 0) + 1
+            delta = {p: -w for p, w in weights.items()}
+            for p in compiled.outputs[t]:
+                delta[p] = delta.get(p, 0) + len(compiled.inputs[t])
+            self.needs.append(tuple(weights.items()))
+            self.deltas.append(tuple((p, d) for p, d in delta.items() if d))
+        self.firable: List[int] = list(compiled.enable_order)
+        # Places nothing consumes from; a dead marking with tokens only here has terminated.
+        self.sinks = frozenset(p for p in range(len(self.place_ids)) if not compiled.consumers[p])
+        inputs = {t: {p for p, _w in self.needs[t]} for t in self.firable}
+        decreases = {t: {p for p, d in self.deltas[t] if d < 0} for t in self.firable}
+        self.dependent: Dict[int, Tuple[int, ...]] = {
+            t: tuple(u for u in self.firable if u != t and (decreases[t] & inputs[u] or decreases[u] & inputs[t]))
+            for t in self.firable
+        }
+        raisers: List[List[int]] = [[] for _ in self.place_ids]
+        for t in self.firable:
+            for p, d in self.deltas[t]:
+                if d > 0:
+                    raisers[p].append(t)
+        self.raisers: List[Tuple[int, ...]] = [tuple(ts) for ts in raisers]
+
+    def enabled(self, state: State) -> List[int]:
+        needs = self.needs
+        return [t for t in self.firable if all(state[p] >= w for p, w in needs[t])]
+
+    def fire(self, state: State, t: int) -> State:
+        counts = list(state)
+        for p, d in self.deltas[t]:
+            counts[p] += d
+        return tuple(counts)
+
+    def successors(self, state: State) -> Successors:
+        return [(t, self.fire(state, t)) for t in self.enabled(state)]
+
+    def stubborn_successors(self, state: State) -> Successors:
+        """Successors through the smallest stubborn set found, seeded from each enabled transition.
+
+        The closure adds ``dependent`` transitions of enabled members and, for
+        a disabled member, the raisers of one input place it lacks tokens in.
+        Every enabled member is then a key transition, so all dead markings
+        (deadlocks and terminal ones) stay reachable in the reduced graph.
+        """
+        enabled = self.enabled(state)
+        if len(enabled) <= 1:
+            return [(t, self.fire(state, t)) for t in enabled]
+        enabled_set = set(enabled)
+        best = enabled
+        for seed in enabled:
+            chosen = self._stubborn(state, seed, enabled_set, len(best))
+            if chosen is not None:
+                best = chosen
+                if len(best) == 1:
+                    break
+        return [(t, self.fire(state, t)) for t in best]
+
+    def _stubborn(self, state: State, seed: int, enabled: Set[int], bound: int) -> Optional[List[int]]:
+        """Enabled members of the closure of {seed}, or None once it reaches bound of them."""
+        members = {seed}
+        work = [seed]
+        count = 1
+        if count >= bound:
+            return None
+        needs, dependent, raisers = self.needs, self.dependent, self.raisers
+        while work:
+            t = work.pop()
+            if t in enabled:
+                added: Tuple[int, ...] = dependent[t]
+            else:
+                scapegoat = next(p for p, w in needs[t] if state[p] < w)
+                added = raisers[scapegoat]
+            for u in added:
+                if u in members:
+                    continue
+                members.add(u)
+                work.append(u)
+                if u in enabled:
+                    count += 1
+                    if count >= bound:
+                        return None
+        return [t for t in enabled if t in members]
+
+    def is_terminal(self, state: State) -> bool:
+        return all(p in self.sinks for p, count in enumerate(state) if count)
+
+    def marking_of(self, state: State) -> Dict[str, int]:
+        return {self.place_ids[p]: count for p, count in enumerate(state) if count}
+
+
+@dataclass
+class ReachabilityReport:
+    """Outcome of explore().
+
+    When ``complete`` is false the limits stopped exploration early:
+    ``dead_transitions`` then only lists transitions not fired *so far* and
+    ``bounds`` are lower bounds. ``deadlocks`` holds up to max_reports dead
+    markings that still have tokens outside sink places; dead markings with
+    tokens only in sinks count as ``terminal``.
+
+    With ``reduction`` set only the dead markings are preserved: deadlock and
+    terminal counts are exact, ``bounds`` are lower bounds and
+    ``dead_transitions`` is not computed (left empty).
+    """
+
+    states: int = 0
+    edges: int = 0
+    complete: bool = True
+    stop_reason: str = STOP_COMPLETE
+    deadlock_count: int = 0
+    terminal_count: int = 0
+    deadlocks: List[Dict[str, int]] = field(default_factory=list)
+    dead_transitions: List[str] = field(default_factory=list)
+    bounds: Dict[str, int] = field(default_factory=dict)
+    reduction: Optional[str] = None
+    wall_time: float = 0.0
+
+    @property
+    def deadlock_free(self) -> bool:
+        return self.complete and self.deadlock_count == 0
+
+    @property
+    def safe(self) -> bool:
+        """Every place holds at most one token in every explored marking."""
+        return all(bound <= 1 for bound in self.bounds.values())
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["deadlock_free"] = self.deadlock_free
+        return data
+
+
+_WORKER_SPACE: Optional[StateSpace] = None
+
+
+def _init_worker(space_bytes: bytes) -> None:
+    global _WORKER_SPACE
+    _WORKER_SPACE = pickle.loads(space_bytes)
+
+
+def _successors_fn(space: StateSpace, reduction: Optional[str]):
+    return space.stubborn_successors if reduction == REDUCTION_STUBBORN else space.successors
+
+
+def _expand(states: List[State], reduction: Optional[str] = None) -> List[Successors]:
+    space = _WORKER_SPACE
+    if space is None:
+        raise RuntimeError("worker not initialised")
+    successors = _successors_fn(space, reduction)
+    return [successors(state) for state in states]
+
+
+class _Explorer:
+    def __init__(
+        self,
+        space: StateSpace,
+        max_states: int,
+        max_memory: Optional[int],
+        exact: bool,
+        max_reports: int,
+        reduction: Optional[str] = None,
+    ) -> None:
+        self.space = space
+        self.reduction = reduction
+        self.successors = _successors_fn(space, reduction)
+        self.max_states = max_states
+        self.max_memory = max_memory
+        self.exact = exact
+        self.max_reports = max_reports
+        self.visited: Set[object] = set()
+        self.fired = [False] * len(space.transition_ids)
+        self.bounds = list(space.initial)
+        self.report = ReachabilityReport(reduction=reduction)
+        # Rough per-entry cost of the visited set and of a queued marking.
+        self._state_bytes = sys.getsizeof(space.initial) + 8 * len(space.initial)
+        self._entry_bytes = self._state_bytes if exact else sys.getsizeof(hash(space.initial))
+
+    def key(self, state: State) -> object:
+        # Hash compaction: keep the 64-bit tuple hash rather than the marking.
+        # Tuple-of-int hashes do not depend on PYTHONHASHSEED.
+        return state if self.exact else hash(state)
+
+    def seed(self) -> State:
+        initial = self.space.initial
+        self.visited.add(self.key(initial))
+        return initial
+
+    def visit(self, state: State, successors: Successors, queue: List[State]) -> bool:
+        """Record state's successors, appending unseen ones to queue; False once a limit is hit."""
+        report = self.report
+        report.edges += len(successors)
+        if not successors:
+            if self.space.is_terminal(state):
+                report.terminal_count += 1
+            else:
+                report.deadlock_count += 1
+                if len(report.deadlocks) < self.max_reports:
+                    report.deadlocks.append(self.space.marking_of(state))
+        visited, fired = self.visited, self.fired
+        for t, nxt in successors:
+            fired[t] = True
+            key = self.key(nxt)
+            if key in visited:
+                continue
+            if len(visited) >= self.max_states:
+                self.stop(STOP_MAX_STATES)
+                return False
+            visited.add(key)
+            self.bounds = list(map(max, self.bounds, nxt))
+            queue.append(nxt)
+        return True
+
+    def over_memory(self, pending: int) -> bool:
+        if self.max_memory is None:
+            return False
+        used = sys.getsizeof(self.visited) + len(self.visited) * self._entry_bytes + pending * self._state_bytes
+        if used > self.max_memory:
+            self.stop(STOP_MAX_MEMORY)
+            return True
+        return False
+
+    def stop(self, reason: str) -> None:
+        self.report.complete = False
+        self.report.stop_reason = reason
+
+    def finish(self, started: float) -> ReachabilityReport:
+        space, report = self.space, self.report
+        report.states = len(self.visited)
+        if self.reduction is None:
+            report.dead_transitions = [tid for t, tid in enumerate(space.transition_ids) if not self.fired[t]]
+        report.bounds = dict(zip(space.place_ids, self.bounds))
+        report.wall_time = time.perf_counter() - started
+        return report
+
+
+def explore(
+    net: PNMLNet,
+    order: str = ORDER_BFS,
+    max_states: int = 1_000_000,
+    max_memory_mb: Optional[float] = None,
+    workers: int = 1,
+    chunk_size: int = 2048,
+    exact: bool = False,
+    max_reports: int = 10,
+    mp_context: Optional[object] = None,
+    reduction: Optional[str] = None,
+) -> ReachabilityReport:
+    """Enumerate the markings reachable from net's initial marking.
+
+    Visited markings are kept as 64-bit hashes (``exact=True`` keeps the
+    markings themselves, ruling out hash collisions at a higher memory cost).
+    With ``workers > 1`` breadth-first levels larger than ``chunk_size`` are
+    expanded across a process pool; deduplication stays in this process.
+    Exploration stops early once ``max_states`` distinct markings were seen or
+    the estimated size of the visited set and frontier exceeds ``max_memory_mb``.
+    ``reduction="stubborn"`` expands only a stubborn subset of the enabled
+    transitions in each marking, which keeps every dead marking while
+    skipping interleavings of independent firings.
+    """
+    if order not in (ORDER_BFS, ORDER_DFS):
+        raise ValueError(f"unknown exploration order: {order}")
+    if reduction not in (None, REDUCTION_STUBBORN):
+        raise ValueError(f"unknown reduction: {reduction}")
+    if max_states < 1:
+        raise ValueError("max_states must be >= 1")
+    started = time.perf_counter()
+    space = StateSpace(net)
+    max_memory = None if max_memory_mb is None else int(max_memory_mb * 1024 * 1024)
+    explorer = _Explorer(space, max_states, max_memory, exact, max_reports, reduction)
+    initial = explorer.seed()
+    if order == ORDER_DFS:
+        _explore_dfs(explorer, initial)
+    elif workers > 1:
+        _explore_parallel(explorer, initial, workers, chunk_size, mp_context)
+    else:
+        _explore_bfs(explorer, initial)
+    return explorer.finish(started)
+
+
+def _explore_dfs(explorer: _Explorer, initial: State) -> None:
+    stack: List[State] = [initial]
+    successors = explorer.successors
+    visited = 0
+    while stack:
+        state = stack.pop()
+        if not explorer.visit(state, successors(state), stack):
+            return
+        visited += 1
+        if not visited & 0xFFF and explorer.over_memory(len(stack)):
+            return
+
+
+def _explore_bfs(explorer: _Explorer, initial: State) -> None:
+    frontier: Deque[State] = deque([initial])
+    successors = explorer.successors
+    visited = 0
+    while frontier:
+        state = frontier.popleft()
+        if not explorer.visit(state, successors(state), frontier):  # type: ignore[arg-type]
+            return
+        visited += 1
+        if not visited & 0xFFF and explorer.over_memory(len(frontier)):
+            return
+
+
+def _explore_parallel(explorer: _Explorer, initial: State, workers: int, chunk_size: int, mp_context: Optional[object]) -> None:
+    space = explorer.space
+    level: List[State] = [initial]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,  # type: ignore[arg-type]
+        initializer=_init_worker,
+        initargs=(pickle.dumps(space),),
+    ) as pool:
+        while level:
+            if explorer.over_memory(len(level)):
+                return
+            if len(level) > chunk_size:
+                chunks = [level[i:i + chunk_size] for i in range(0, len(level), chunk_size)]
+                expand = partial(_expand, reduction=explorer.reduction)
+                expanded: Iterable[Successors] = (succ for batch in pool.map(expand, chunks) for succ in batch)
+            else:
+                expanded = map(explorer.successors, level)
+            nxt: List[State] = []
+            for state, successors in zip(level, expanded):
+                if not explorer.visit(state, successors, nxt):
+                    return
+            level = nxt
+
+
+def _run_cli() -> None:
+    import argparse
+    import json
+
+    from ..pnml_parser import parse_pnml
+
+    parser = argparse.ArgumentParser(description="Explore the reachable markings of a PNML YAML net.")
+    parser.add_argument("path")
+    parser.add_argument("--order", choices=(ORDER_BFS, ORDER_DFS), default=ORDER_BFS)
+    parser.add_argument("--max-states", type=int, default=1_000_000)
+    parser.add_argument("--max-memory-mb", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--exact", action="store_true")
+    parser.add_argument("--reduction", choices=(REDUCTION_STUBBORN,), default=None)
+    args = parser.parse_args()
+    with open(args.path, "r", encoding="utf-8") as handle:
+        net, _ = parse_pnml(handle.read())
+    report = explore(
+        net,
+        order=args.order,
+        max_states=args.max_states,
+        max_memory_mb=args.max_memory_mb,
+        workers=args.workers,
+        exact=args.exact,
+        reduction=args.reduction,
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    _run_cli()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, Set, Tuple
+import asyncio
+import time
+
+from .pnml_engine import PNMLEngine, PendingOp, RunStats
+
+# (op_id, resume_token, result, error) as passed to submit_async.
+Completion = Tuple[Optional[int], Optional[str], Optional[object], Optional[str]]
+
+
+class AsyncPNMLEngine(PNMLEngine):
+    """asyncio-native engine that keeps firing while async ops are in flight.
+
+    A pending op only holds the tokens its transition consumed, so unrelated
+    transitions stay enabled. ``execMode: async`` expressions may return a
+    coroutine/awaitable (run as a task on the engine's loop), an AsyncResult or
+    an AsyncOpRequest. Every completion, including host calls to submit_async
+    from any thread, goes through an asyncio.Queue inbox and is applied on the
+    loop, so the marking is only ever mutated from one place.
+    """
+
+    blocks_on_pending = False
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inbox: Optional["asyncio.Queue[Completion]"] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def inbox(self) -> "asyncio.Queue[Completion]":
+        return self._bind_loop()
+
+    def _bind_loop(self) -> "asyncio.Queue[Completion]":
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._inbox is None:
+            self._loop = loop
+            self._inbox = asyncio.Queue()
+        return self._inbox
+
+    def _loop_alive(self) -> bool:
+        return self._loop is not None and self._inbox is not None and not self._loop.is_closed()
+
+    def submit_async(
+        self,
+        op_id: Optional[int] = None,
+        resume_token: Optional[str] = None,
+        result: Optional[object] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        if not self._loop_alive():
+            super().submit_async(op_id, resume_token, result, error)
+            return
+        completion: Completion = (op_id, resume_token, result, error)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._inbox.put_nowait(completion)  # type: ignore[union-attr]
+        else:
+            self._loop.call_soon_threadsafe(self._inbox.put_nowait, completion)  # type: ignore[union-attr]
+
+    async def wait_completion(self, timeout: Optional[float] = None) -> Optional[Completion]:
+        """Await the next completion from the inbox and apply it; None on timeout."""
+        inbox = self._bind_loop()
+        try:
+            completion = await asyncio.wait_for(inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._apply_completion(completion)
+        return completion
+
+    def _apply_completion(self, completion: Completion) -> None:
+        op_id, resume_token, result, error = completion
+        PNMLEngine.submit_async(self, op_id, resume_token, result, error)
+
+    def _drain_inbox(self) -> None:
+        inbox = self._inbox
+        while inbox is not None and not inbox.empty():
+            self._apply_completion(inbox.get_nowait())
+
+    def _schedule_awaitable(self, pending: PendingOp, awaitable: object) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or loop is not self._loop:
+            super()._schedule_awaitable(pending, awaitable)
+            return
+
+        done = self._completion_target(pending)
+
+        async def _await_op() -> None:
+            try:
+                value = await awaitable  # type: ignore[misc]
+            except Exception as exc:
+                done(None, str(exc))
+                return
+            done(value, None)
+
+        task = loop.create_task(_await_op())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def arun(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[["AsyncPNMLEngine"], bool]] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> RunStats:
+        """Fire transitions and apply completions until nothing is enabled or in flight.
+
+        stop_reason is "quiescent" when no transition is enabled and no op is
+        pending, "pending" when idle_timeout elapsed while ops were still in
+        flight, or "max_steps"/"until" as for PNMLEngine.run(). Ops with a
+        timeout_ms are expired into error tokens when their deadline passes.
+        """
+        self._bind_loop()
+        stats = RunStats()
+        firings = stats.firings
+        started = time.perf_counter()
+        while True:
+            self._drain_inbox()
+            if self.pending_ops_by_id:
+                self.expire_pending()
+            if max_steps is not None and stats.steps >= max_steps:
+                stats.stop_reason = "max_steps"
+                break
+            if until is not None and until(self):
+                stats.stop_reason = "until"
+                break
+            tid = self._select_transition()
+            if tid is not None:
+                self._fire(tid)
+                stats.steps += 1
+                firings[tid] = firings.get(tid, 0) + 1
+                # Let coroutine ops started by this firing make progress.
+                await asyncio.sleep(0)
+                continue
+            if not self.pending_ops_by_id:
+                stats.stop_reason = "quiescent"
+                break
+            timeout = idle_timeout
+            deadline = self.next_deadline()
+            if deadline is not None:
+                until_deadline = max(0.0, deadline - time.monotonic())
+                if timeout is None or until_deadline < timeout:
+                    # Wake up for the deadline rather than reporting idle.
+                    if await self.wait_completion(until_deadline) is None:
+                        self.expire_pending()
+                    continue
+            if await self.wait_completion(timeout) is None:
+                stats.stop_reason = "pending"
+                stats.pending = next(iter(self.pending_ops_by_id.values()), None)
+                break
+        stats.wall_time = time.perf_counter() - started
+        return stats
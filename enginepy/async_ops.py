@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Callable, Optional, Any, List, Dict
 import threading
-import time
+
+from .pending_ops import next_op_id
 
 
 @dataclass
@@ -60,7 +61,7 @@ class AsyncOpRequest:
 
 def run_async(fn: Callable[[], Any]) -> AsyncResult:
     """Run fn in a background thread and return an AsyncResult."""
-    result = AsyncResult(id=int(time.time() * 1000) % 1_000_000_000)
+    result = AsyncResult(id=next_op_id())
 
     def _runner() -> None:
         try:
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+import copy
+import heapq
+import importlib
+import itertools
+import os
+import pickle
+import sys
+import threading
+import time
+
+from .marking import Marking
+from .pending_ops import PendingOpTable
+from .pnml_engine import PNMLEngine, PendingOp
+from .pnml_parser import PNMLNet
+
+CASE_READY = "ready"
+CASE_WAITING = "waiting"
+CASE_DONE = "done"
+
+SCHEDULE_ROUND_ROBIN = "round_robin"
+SCHEDULE_PRIORITY = "priority"
+
+
+@dataclass
+class Case:
+    """Per-case state; everything else (net, topology, resolved inscriptions) is shared."""
+
+    case_id: str
+    marking: Marking
+    run_id: str
+    priority: int = 0
+    status: str = CASE_READY
+    pending_ops: PendingOpTable = field(default_factory=PendingOpTable)
+    result: Optional[object] = None
+    steps: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def pending_ops_by_id(self) -> Dict[int, PendingOp]:
+        return self.pending_ops.by_id
+
+    @property
+    def pending_ops_by_token(self) -> Dict[str, PendingOp]:
+        return self.pending_ops.by_token
+
+    def metrics(self) -> Dict[str, object]:
+        wall_time = None
+        if self.started_at is not None and self.finished_at is not None:
+            wall_time = self.finished_at - self.started_at
+        return {"status": self.status, "steps": self.steps, "wall_time": wall_time, "pending": len(self.pending_ops_by_id)}
+
+
+class _CaseEngine(PNMLEngine):
+    """PNMLEngine whose per-case attributes are rebound before every step."""
+
+    def __init__(self, net: PNMLNet, runner: "CaseRunner") -> None:
+        super().__init__(net)
+        self._runner = runner
+        self._case: Optional[Case] = None
+
+    def bind(self, case: Case) -> None:
+        self._case = case
+        self.marking = case.marking
+        self.pending_ops = case.pending_ops
+        self.pending_ops_by_id = case.pending_ops.by_id
+        self.pending_ops_by_token = case.pending_ops.by_token
+        self.run_id = case.run_id
+
+    def _completion_target(self, pending: PendingOp) -> Callable[[Optional[object], Optional[str]], None]:
+        # Completions may arrive while another case is bound; route them by case id.
+        case_id = self._case.case_id if self._case else None
+        runner = self._runner
+        return lambda result, error: runner.submit_async(case_id, op_id=pending.id, result=result, error=error)
+
+
+class CaseRunner:
+    """Run many independent cases of one net, sharing the parsed net and inscriptions.
+
+    Each case only owns its marking and pending-op tables. Inscriptions are
+    resolved once on the shared net's Inscription objects, and the compiled
+    topology is built once. Cases are stepped one firing at a time, either
+    round-robin or by highest priority (FIFO among equal priorities).
+    """
+
+    def __init__(
+        self,
+        net: PNMLNet,
+        schedule: str = SCHEDULE_ROUND_ROBIN,
+        result_place: Optional[str] = None,
+    ) -> None:
+        if schedule not in (SCHEDULE_ROUND_ROBIN, SCHEDULE_PRIORITY):
+            raise ValueError(f"unknown schedule: {schedule}")
+        self.net = net
+        self.schedule = schedule
+        self.result_place = result_place
+        self.cases: Dict[str, Case] = {}
+        self._engine = _CaseEngine(net, self)
+        self._initial = {pid: list(place.tokens) for pid, place in net.places.items() if place.tokens}
+        self._ready: Deque[str] = deque()
+        self._heap: List[Tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def add_case(
+        self,
+        tokens: Optional[Mapping[str, Iterable[object]]] = None,
+        case_id: Optional[str] = None,
+        priority: int = 0,
+    ) -> str:
+        """Start a case from the net's initial marking plus extra tokens per place."""
+        case_id = case_id or f"case-{next(self._ids)}"
+        if case_id in self.cases:
+            raise ValueError(f"duplicate case id: {case_id}")
+        initial: Dict[str, List[object]] = {pid: list(values) for pid, values in self._initial.items()}
+        for pid, values in (tokens or {}).items():
+            initial.setdefault(pid, []).extend(values)
+        case = Case(
+            case_id=case_id,
+            marking=Marking(initial),
+            run_id=f"run-{int(time.time() * 1000)}-{case_id}",
+            priority=priority,
+        )
+        with self._lock:
+            self.cases[case_id] = case
+            self._enqueue(case)
+        return case_id
+
+    def step(self) -> Optional[Tuple[str, Union[str, PendingOp, None]]]:
+        """Fire one transition of the next ready case; None when no case is ready."""
+        with self._lock:
+            case = self._next_ready()
+            if case is None:
+                return None
+            if case.started_at is None:
+                case.started_at = time.perf_counter()
+            engine = self._engine
+            engine.bind(case)
+            result = engine.step_once()
+            if result is None:
+                self._settle(case)
+            else:
+                case.steps += 1
+                if isinstance(result, PendingOp) and not result.completed:
+                    case.status = CASE_WAITING
+                else:
+                    self._enqueue(case)
+            return case.case_id, result
+
+    def run(self, max_steps: Optional[int] = None) -> Dict[str, Case]:
+        """Step until no case is ready (all done or waiting on async ops) or max_steps."""
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            if self.step() is None:
+                break
+            steps += 1
+        return self.cases
+
+    def submit_async(
+        self,
+        case_id: Optional[str],
+        op_id: Optional[int] = None,
+        resume_token: Optional[str] = None,
+        result: Optional[object] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            case = self.cases.get(case_id) if case_id is not None else None
+            if case is None:
+                return
+            self._engine.bind(case)
+            PNMLEngine.submit_async(self._engine, op_id, resume_token, result, error)
+            if case.status == CASE_WAITING and not case.pending_ops_by_id:
+                self._enqueue(case)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest time.monotonic() deadline of a pending op in any waiting case."""
+        with self._lock:
+            deadlines = [case.pending_ops.next_deadline() for case in self.cases.values() if case.status == CASE_WAITING]
+        return min((d for d in deadlines if d is not None), default=None)
+
+    def expire_pending(self, now: Optional[float] = None) -> List[PendingOp]:
+        """Time out overdue ops in waiting cases and requeue cases left without pending ops."""
+        expired: List[PendingOp] = []
+        with self._lock:
+            for case in self.cases.values():
+                if case.status != CASE_WAITING or not case.pending_ops:
+                    continue
+                self._engine.bind(case)
+                expired.extend(self._engine.expire_pending(now))
+                if not case.pending_ops:
+                    self._enqueue(case)
+        return expired
+
+    def results(self) -> Dict[str, object]:
+        return {case_id: case.result for case_id, case in self.cases.items() if case.status == CASE_DONE}
+
+    def metrics(self) -> Dict[str, Dict[str, object]]:
+        return {case_id: case.metrics() for case_id, case in self.cases.items()}
+
+    def _enqueue(self, case: Case) -> None:
+        case.status = CASE_READY
+        if self.schedule == SCHEDULE_PRIORITY:
+            heapq.heappush(self._heap, (-case.priority, next(self._seq), case.case_id))
+        else:
+            self._ready.append(case.case_id)
+
+    def _next_ready(self) -> Optional[Case]:
+        while True:
+            if self.schedule == SCHEDULE_PRIORITY:
+                if not self._heap:
+                    return None
+                case_id = heapq.heappop(self._heap)[2]
+            else:
+                if not self._ready:
+                    return None
+                case_id = self._ready.popleft()
+            case = self.cases.get(case_id)
+            if case is not None and case.status == CASE_READY:
+                return case
+
+    def _settle(self, case: Case) -> None:
+        if case.pending_ops_by_id:
+            case.status = CASE_WAITING
+            return
+        case.status = CASE_DONE
+        case.finished_at = time.perf_counter()
+        if self.result_place is not None:
+            case.result = list(case.marking.get(self.result_place) or [])
+        else:
+            case.result = case.marking.snapshot()
+
+
+# (case_id, tokens) as shipped to worker processes.
+CaseInput = Tuple[str, Mapping[str, Iterable[object]]]
+
+
+@dataclass
+class CaseOutcome:
+    """Final state of a case run in a worker process."""
+
+    case_id: str
+    status: str
+    result: Optional[object]
+    steps: int
+    trace: List[str] = field(default_factory=list)
+    wall_time: Optional[float] = None
+    pending: int = 0
+
+
+def _strip_net(net: PNMLNet) -> PNMLNet:
+    """Copy net without resolved callables or their adapters so it pickles; workers re-resolve them."""
+    # Seeding the deepcopy memo maps each callable and adapter to None, so
+    # they are never copied (they may hold unpicklable state).
+    memo: Dict[int, object] = {}
+    owners = list(net.transitions.values()) + list(net.arcs)
+    for owner in owners:
+        for ins in owner.inscriptions:
+            for attached in (ins.func, ins.adapter):
+                if attached is not None:
+                    memo[id(attached)] = None
+    return copy.deepcopy(net, memo)
+
+
+_WORKER_NET: Optional[PNMLNet] = None
+_WORKER_RESULT_PLACE: Optional[str] = None
+
+
+def _init_worker(net_bytes: bytes, result_place: Optional[str], modules: Sequence[str], paths: Sequence[str]) -> None:
+    global _WORKER_NET, _WORKER_RESULT_PLACE
+    for path in paths:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    # Importing e.g. a generated inscriptions.py registers its functions under
+    # the same build_registry_key names the parser assigned to the net.
+    for name in modules:
+        importlib.import_module(name)
+    _WORKER_NET = pickle.loads(net_bytes)
+    _WORKER_RESULT_PLACE = result_place
+
+
+def _run_chunk(chunk: List[CaseInput], max_steps: Optional[int]) -> List[CaseOutcome]:
+    if _WORKER_NET is None:
+        raise RuntimeError("worker not initialized")
+    runner = CaseRunner(_WORKER_NET, result_place=_WORKER_RESULT_PLACE)
+    traces: Dict[str, List[str]] = {}
+    for case_id, tokens in chunk:
+        runner.add_case(tokens, case_id=case_id)
+        traces[case_id] = []
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        stepped = runner.step()
+        if stepped is None:
+            break
+        steps += 1
+        case_id, result = stepped
+        if isinstance(result, PendingOp):
+            traces[case_id].append(result.transition_id)
+        elif result is not None:
+            traces[case_id].append(result)
+    outcomes = []
+    for case_id, case in runner.cases.items():
+        metrics = case.metrics()
+        outcomes.append(CaseOutcome(
+            case_id=case_id,
+            status=case.status,
+            result=case.result if case.status == CASE_DONE else case.marking.snapshot(),
+            steps=case.steps,
+            trace=traces[case_id],
+            wall_time=metrics["wall_time"],  # type: ignore[arg-type]
+            pending=len(case.pending_ops_by_id),
+        ))
+    return outcomes
+
+
+class ProcessPoolCaseRunner:
+    """Run cases of one net across worker processes, side-stepping the GIL.
+
+    The net is pickled once (without resolved callables) and handed to each
+    worker by its initializer; workers then import ``modules`` (for example a
+    generated project's ``inscriptions`` module) so registry-backed
+    inscriptions resolve through build_registry_key as in-process. Inputs are
+    sent in chunks of ``chunksize`` cases, with at most ``max_in_flight``
+    chunks outstanding so a large or lazy input stream is not materialized.
+    Cases waiting on an async op cannot be resumed across processes; they are
+    returned with status "waiting" and their current marking.
+    """
+
+    def __init__(
+        self,
+        net: PNMLNet,
+        max_workers: Optional[int] = None,
+        chunksize: int = 64,
+        max_in_flight: Optional[int] = None,
+        result_place: Optional[str] = None,
+        modules: Sequence[str] = (),
+        paths: Sequence[str] = (),
+        max_steps_per_chunk: Optional[int] = None,
+        mp_context: Optional[object] = None,
+    ) -> None:
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+        self.net = net
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.max_steps_per_chunk = max_steps_per_chunk
+        self._initargs = (pickle.dumps(_strip_net(net)), result_place, tuple(modules), tuple(paths))
+        self._mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._ids = itertools.count(1)
+
+    def __enter__(self) -> "ProcessPoolCaseRunner":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._mp_context,  # type: ignore[arg-type]
+                initializer=_init_worker,
+                initargs=self._initargs,
+            )
+        return self._executor
+
+    def _chunks(self, inputs: Iterable[object]) -> Iterator[List[CaseInput]]:
+        chunk: List[CaseInput] = []
+        for item in inputs:
+            if isinstance(item, tuple):
+                case_id, tokens = item
+            else:
+                case_id, tokens = f"case-{next(self._ids)}", item
+            chunk.append((case_id, {pid: list(values) for pid, values in (tokens or {}).items()}))  # type: ignore[union-attr]
+            if len(chunk) >= self.chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def imap(self, inputs: Iterable[object]) -> Iterator[CaseOutcome]:
+        """Stream outcomes in completion order.
+
+        Each input is a token mapping (place id -> tokens) or a
+        ``(case_id, tokens)`` tuple.
+        """
+        pool = self._pool()
+        in_flight: Set[Future] = set()
+        for chunk in self._chunks(inputs):
+            while len(in_flight) >= self.max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            in_flight.add(pool.submit(_run_chunk, chunk, self.max_steps_per_chunk))
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+    def run(self, inputs: Iterable[object]) -> Dict[str, CaseOutcome]:
+        return {outcome.case_id: outcome for outcome in self.imap(inputs)}
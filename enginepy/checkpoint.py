@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+import io
+import pickle
+import struct
+import time
+
+from .pending_ops import reserve_op_ids
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pnml_engine import PNMLEngine
+
+MAGIC = b"EVCK"
+FORMAT_VERSION = 1
+KIND_FULL = "full"
+KIND_DELTA = "delta"
+
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+class CheckpointError(ValueError):
+    """Raised when checkpoint bytes are malformed or do not fit the engine."""
+
+
+def encode_frames(header: Dict[str, Any], payload: object) -> bytes:
+    """Frame a header and a payload pickled with protocol 5.
+
+    Layout: MAGIC, u32 header length, pickled header, u32 buffer count, each
+    out-of-band buffer as u64 length + bytes, then u64 payload length + pickled
+    payload. Large bytearray/NumPy tokens travel as raw buffers instead of
+    being copied into the pickle stream.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    try:
+        body = pickle.dumps(payload, protocol=5, buffer_callback=buffers.append)
+        head = pickle.dumps(header, protocol=5)
+    except (pickle.PicklingError, TypeError, AttributeError) as exc:
+        raise CheckpointError(f"engine state is not picklable: {exc}") from exc
+    out = io.BytesIO()
+    out.write(MAGIC)
+    out.write(_U32.pack(len(head)))
+    out.write(head)
+    out.write(_U32.pack(len(buffers)))
+    for buf in buffers:
+        raw = buf.raw()
+        out.write(_U64.pack(raw.nbytes))
+        out.write(raw)
+    out.write(_U64.pack(len(body)))
+    out.write(body)
+    return out.getvalue()
+
+
+def decode_frames(data: bytes) -> Tuple[Dict[str, Any], Any]:
+    view = memoryview(data)
+    if bytes(view[:4]) != MAGIC:
+        raise CheckpointError("not an engine checkpoint")
+    pos = 4
+
+    def take(size: int) -> memoryview:
+        nonlocal pos
+        if pos + size > len(view):
+            raise CheckpointError("truncated checkpoint")
+        chunk = view[pos:pos + size]
+        pos += size
+        return chunk
+
+    (head_len,) = _U32.unpack(take(4))
+    header = _loads(take(head_len))
+    if header.get("format") != FORMAT_VERSION:
+        raise CheckpointError(f"unsupported checkpoint format: {header.get('format')}")
+    (count,) = _U32.unpack(take(4))
+    buffers = []
+    for _ in range(count):
+        (size,) = _U64.unpack(take(8))
+        buffers.append(take(size))
+    (body_len,) = _U64.unpack(take(8))
+    payload = _loads(take(body_len), buffers)
+    return header, payload
+
+
+def _loads(data: memoryview, buffers: Sequence[memoryview] = ()) -> Any:
+    try:
+        return pickle.loads(data, buffers=buffers)
+    except Exception as exc:
+        raise CheckpointError(f"corrupt checkpoint: {exc}") from exc
+
+
+def dump_checkpoint(engine: "PNMLEngine", incremental: bool = False) -> bytes:
+    """Serialize engine state; with incremental, only places changed since the last checkpoint.
+
+    The marking and pending ops are copied under the engine's pending-op lock
+    (shallow list copies); pickling happens after the lock is released.
+    """
+    with engine._pending_lock:
+        dirty = engine._take_checkpoint_dirty(incremental)
+        base = engine._checkpoint_seq
+        kind = KIND_DELTA if incremental and base is not None and dirty is not None else KIND_FULL
+        marking = engine.marking
+        if kind == KIND_FULL:
+            places = {pid: list(tokens) for pid, tokens in marking.items()}
+        else:
+            places = {pid: list(marking.get(pid) or ()) for pid in dirty}  # type: ignore[union-attr]
+        now = time.monotonic()
+        pending = []
+        for op in engine.pending_ops_by_id.values():
+            # Monotonic deadlines do not survive a restart; store the time left instead.
+            remaining = None if op.deadline is None else max(0.0, op.deadline - now)
+            pending.append((replace(op, deadline=None), remaining))
+        seq = (base or 0) + 1
+        engine._checkpoint_seq = seq
+        header = {
+            "format": FORMAT_VERSION,
+            "kind": kind,
+            "seq": seq,
+            "base": base if kind == KIND_DELTA else None,
+            "net_id": engine.net.id,
+            "run_id": engine.run_id,
+            "created": time.time(),
+        }
+    return encode_frames(header, {"places": places, "pending": pending})
+
+
+def apply_checkpoint(engine: "PNMLEngine", data: bytes, expected_base: Optional[int] = None) -> Dict[str, Any]:
+    header, payload = decode_frames(data)
+    if header["net_id"] != engine.net.id:
+        raise CheckpointError(f"checkpoint is for net {header['net_id']!r}, not {engine.net.id!r}")
+    if header["kind"] == KIND_DELTA and expected_base is None:
+        raise CheckpointError("restore must start from a full checkpoint")
+    if header["kind"] == KIND_DELTA and header["base"] != expected_base:
+        raise CheckpointError(f"delta {header['seq']} expects base {header['base']}, have {expected_base}")
+    with engine._pending_lock:
+        marking = engine.marking
+        places: Dict[str, List[object]] = payload["places"]
+        if header["kind"] == KIND_FULL:
+            for pid in list(marking.keys()):
+                if pid not in places:
+                    marking[pid] = []
+        for pid, tokens in places.items():
+            marking[pid] = tokens
+        table = engine.pending_ops
+        table.clear()
+        now = time.monotonic()
+        for op, remaining in payload["pending"]:
+            if remaining is not None:
+                op.deadline = now + remaining
+            table.add(op, now=now)
+        if table:
+            reserve_op_ids(max(table.by_id))
+        engine.run_id = header["run_id"]
+        engine._checkpoint_seq = header["seq"]
+        with engine._checkpoint_lock:
+            engine._stop_checkpoint_tracking()
+    engine.refresh_enabled()
+    return header
+
+
+def restore_into(engine: "PNMLEngine", checkpoints: Union[bytes, Sequence[bytes]]) -> "PNMLEngine":
+    """Apply a full checkpoint followed by any deltas taken after it, in order."""
+    chain = [checkpoints] if isinstance(checkpoints, (bytes, bytearray, memoryview)) else list(checkpoints)
+    if not chain:
+        raise CheckpointError("no checkpoint given")
+    base: Optional[int] = None
+    for data in chain:
+        base = apply_checkpoint(engine, bytes(data), base)["seq"]
+    return engine
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Optional
+import hashlib
+import importlib.util
+import marshal
+import os
+import threading
+from types import CodeType
+
+# Directory for the on-disk bytecode cache; the DAP server points it at the
+# project's .vscode/evolve_py. Unset means memory-only caching.
+CACHE_DIR_ENV = "EVOLVE_INSCRIPTION_CACHE_DIR"
+
+# Bump when build_source changes so stale disk entries are not reused.
+_FORMAT = "1"
+_HEADER = importlib.util.MAGIC_NUMBER
+
+
+def cache_key(kind: Optional[str], code: str, language: Optional[str] = None) -> str:
+    digest = hashlib.sha256()
+    for part in (_FORMAT, kind or "", (language or "python").lower(), code):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_source(kind: Optional[str], code: str) -> str:
+    """Wrap inline inscription code in a ``_fn(token=None)`` definition."""
+    code_lines = code.splitlines()
+    func_src = "def _fn(token=None):\n"
+    if kind == "guard" and not any("return" in line for line in code_lines):
+        # Treat guard code as an expression if no explicit return is provided.
+        func_src += "    return " + code.strip() + "\n"
+    else:
+        for line in code_lines:
+            func_src += "    " + line + "\n"
+    return func_src
+
+
+class CompileCache:
+    """LRU of compiled inline inscriptions, optionally backed by marshal files.
+
+    Code objects are shared between every inscription with the same (kind,
+    code, language); each lookup still executes the definition in fresh
+    globals, so inscriptions never share module state.
+    """
+
+    def __init__(self, maxsize: int = 1024, cache_dir: Optional[str] = None) -> None:
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._codes: "OrderedDict[str, CodeType]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_function(self, kind: Optional[str], code: str, language: Optional[str] = None) -> Optional[Callable[..., object]]:
+        exec_globals: dict = {}
+        exec(self.get_code(kind, code, language), exec_globals)
+        return exec_globals.get("_fn")
+
+    def get_code(self, kind: Optional[str], code: str, language: Optional[str] = None) -> CodeType:
+        key = cache_key(kind, code, language)
+        with self._lock:
+            code_obj = self._codes.get(key)
+            if code_obj is not None:
+                self._codes.move_to_end(key)
+                self.hits += 1
+                return code_obj
+        code_obj = self._load(key)
+        if code_obj is not None:
+            self.disk_hits += 1
+        else:
+            code_obj = compile(build_source(kind, code), f"<inscription:{kind or 'inscription'}>", "exec")
+            self.misses += 1
+            self._store(key, code_obj)
+        with self._lock:
+            self._codes[key] = code_obj
+            if len(self._codes) > self.maxsize:
+                self._codes.popitem(last=False)
+        return code_obj
+
+    def clear(self) -> None:
+        with self._lock:
+            self._codes.clear()
+
+    def _path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _load(self, key: str) -> Optional[CodeType]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(_HEADER):
+            return None
+        try:
+            code_obj = marshal.loads(data[len(_HEADER):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return code_obj if isinstance(code_obj, CodeType) else None
+
+    def _store(self, key: str, code_obj: CodeType) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER + marshal.dumps(code_obj))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk cache is best effort; a read-only workspace just skips it.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_DEFAULT: Optional[CompileCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_cache() -> CompileCache:
+    """Process-wide cache; its disk directory follows EVOLVE_INSCRIPTION_CACHE_DIR."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = CompileCache()
+        _DEFAULT.cache_dir = os.environ.get(CACHE_DIR_ENV) or None
+        return _DEFAULT
+
+
+def compile_inscription(kind: Optional[str], code: str, language: Optional[str] = None) -> Optional[Callable[..., object]]:
+    return default_cache().get_function(kind, code, language)
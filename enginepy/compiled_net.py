@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple
+import itertools
+
+from .pnml_parser import PNMLNet
+
+_VERSIONS = itertools.count(1)
+
+
+@dataclass
+class CompiledNet:
+    """Immutable topology of a PNMLNet with interned integer ids.
+
+    Places and transitions are numbered in declaration order. Adjacency is kept
+    both as integer tuples (for index-based engines and analysis) and as
+    id-keyed lists (for the dict-marking engine), so neither has to walk the
+    arc list again.
+    """
+
+    version: int
+    place_ids: List[str]
+    transition_ids: List[str]
+    place_index: Dict[str, int]
+    transition_index: Dict[str, int]
+    inputs: List[Tuple[int, ...]]
+    outputs: List[Tuple[int, ...]]
+    consumers: List[Tuple[int, ...]]
+    producers: List[Tuple[int, ...]]
+    enable_order: List[int]
+    initial_places: FrozenSet[int]
+    touches_initial: List[bool]
+    enable_rank: Dict[str, int] = field(default_factory=dict)
+    input_ids: Dict[str, List[str]] = field(default_factory=dict)
+    output_ids: Dict[str, List[str]] = field(default_factory=dict)
+    consumer_ids: Dict[str, List[str]] = field(default_factory=dict)
+
+    def inputs_of(self, transition_id: str) -> List[str]:
+        return self.input_ids.get(transition_id, [])
+
+    def outputs_of(self, transition_id: str) -> List[str]:
+        return self.output_ids.get(transition_id, [])
+
+    def consumers_of(self, place_id: str) -> List[str]:
+        return self.consumer_ids.get(place_id, [])
+
+
+def build_compiled_net(net: PNMLNet) -> CompiledNet:
+    place_ids = list(net.places.keys())
+    transition_ids = list(net.transitions.keys())
+    place_index = {pid: i for i, pid in enumerate(place_ids)}
+    transition_index = {tid: i for i, tid in enumerate(transition_ids)}
+
+    inputs: List[List[int]] = [[] for _ in transition_ids]
+    outputs: List[List[int]] = [[] for _ in transition_ids]
+    consumers: List[List[int]] = [[] for _ in place_ids]
+    producers: List[List[int]] = [[] for _ in place_ids]
+    # Transitions only take part in enabling once they have an input arc; keep
+    # the order of their first input arc so enabled lists stay stable.
+    enable_order: List[int] = []
+    seen_inputs: set = set()
+    for arc in net.arcs:
+        if not arc.source or not arc.target:
+            continue
+        if arc.source in place_index and arc.target in transition_index:
+            p = place_index[arc.source]
+            t = transition_index[arc.target]
+            inputs[t].append(p)
+            if t not in consumers[p]:
+                consumers[p].append(t)
+            if t not in seen_inputs:
+                seen_inputs.add(t)
+                enable_order.append(t)
+        elif arc.source in transition_index and arc.target in place_index:
+            t = transition_index[arc.source]
+            p = place_index[arc.target]
+            outputs[t].append(p)
+            if t not in producers[p]:
+                producers[p].append(t)
+
+    initial_places = frozenset(
+        place_index[pid] for pid, place in net.places.items() if getattr(place, "tokens", None)
+    )
+    touches_initial = [any(p in initial_places for p in ins) for ins in inputs]
+
+    rank = {t: i for i, t in enumerate(enable_order)}
+    for p, cons in enumerate(consumers):
+        cons.sort(key=lambda t: rank.get(t, len(rank)))
+
+    compiled = CompiledNet(
+        version=next(_VERSIONS),
+        place_ids=place_ids,
+        transition_ids=transition_ids,
+        place_index=place_index,
+        transition_index=transition_index,
+        inputs=[tuple(ins) for ins in inputs],
+        outputs=[tuple(outs) for outs in outputs],
+        consumers=[tuple(cons) for cons in consumers],
+        producers=[tuple(prods) for prods in producers],
+        enable_order=enable_order,
+        initial_places=initial_places,
+        touches_initial=touches_initial,
+    )
+    compiled.enable_rank = {transition_ids[t]: i for i, t in enumerate(enable_order)}
+    compiled.input_ids = {
+        transition_ids[t]: [place_ids[p] for p in inputs[t]] for t in enable_order
+    }
+    compiled.output_ids = {
+        transition_ids[t]: [place_ids[p] for p in outputs[t]]
+        for t in range(len(transition_ids))
+        if outputs[t]
+    }
+    compiled.consumer_ids = {
+        place_ids[p]: [transition_ids[t] for t in consumers[p]]
+        for p in range(len(place_ids))
+        if consumers[p]
+    }
+    return compiled
+
+
+def compile_net(net: PNMLNet) -> CompiledNet:
+    """Return the cached CompiledNet for net, building it on first use."""
+    compiled = net.compiled
+    if compiled is None:
+        compiled = build_compiled_net(net)
+        net.compiled = compiled
+    return compiled
+
+
+def invalidate_compiled_net(net: PNMLNet) -> None:
+    """Drop the cached topology; call after mutating places, transitions or arcs."""
+    net.compiled = None
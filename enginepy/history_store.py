@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import IO, Dict, Iterator, List, Optional
+import json
+import os
+
+_NONE = -1
+
+
+@dataclass
+class HistoryEntry:
+    step: int
+    transition_id: Optional[str]
+    line: Optional[int]
+    produced_places: List[str]
+
+
+class HistoryStore:
+    """Append-only, columnar store of HistoryEntry records.
+
+    Entries are kept as parallel arrays (step, interned transition id, line,
+    offset into a flat array of interned produced places) instead of one
+    dataclass and list per step. ``retention`` bounds how many entries stay in
+    memory; older ones are dropped in batches, or appended as JSON lines to
+    ``spill_path`` when it is set, so they can still be paged back in. An
+    existing spill file is only replaced when ``overwrite`` is set; without
+    it, entries appended after ``clear()`` go after the old lines.
+
+    Indexes are absolute: entry i is the i-th entry ever appended, and
+    ``len(store)`` counts every appended entry. ``first_available`` is the
+    oldest index that can still be read.
+    """
+
+    def __init__(self, retention: Optional[int] = None, spill_path: Optional[str] = None, overwrite: bool = False) -> None:
+        if retention is not None and retention < 1:
+            raise ValueError("retention must be >= 1")
+        if spill_path and not overwrite and os.path.exists(spill_path):
+            raise FileExistsError(f"history spill file already exists: {spill_path}")
+        self.retention = retention
+        self.spill_path = spill_path
+        self.overwrite = overwrite
+        self._spill: Optional[IO[bytes]] = None
+        # Set once this store has created (or replaced) the spill file.
+        self._spill_opened = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._steps = array("q")
+        self._transitions = array("i")
+        self._lines = array("i")
+        # Start of each entry's places in _produced, relative to _produced_base.
+        self._offsets = array("q")
+        self._produced = array("i")
+        self._produced_base = 0
+        self._base = 0
+        self._spill_offsets = array("q")
+
+    def __len__(self) -> int:
+        return self._base + len(self._steps)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def first_available(self) -> int:
+        return self._base - len(self._spill_offsets)
+
+    @property
+    def available(self) -> int:
+        return len(self) - self.first_available
+
+    def append(self, entry: HistoryEntry) -> None:
+        self._steps.append(entry.step)
+        self._transitions.append(self._intern(entry.transition_id))
+        self._lines.append(_NONE if entry.line is None else entry.line)
+        self._offsets.append(self._produced_base + len(self._produced))
+        for pid in entry.produced_places:
+            self._produced.append(self._intern(pid))
+        if self.retention is not None and len(self._steps) > self.retention + max(1, self.retention // 4):
+            self._evict(len(self._steps) - self.retention)
+
+    def clear(self) -> None:
+        if self._spill is not None and self.overwrite:
+            # The caller allowed replacing the file, and its lines are unreachable after clear().
+            self._spill.seek(0)
+            self._spill.truncate()
+        self._reset()
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def __getitem__(self, index: int) -> HistoryEntry:
+        total = len(self)
+        if index < 0:
+            index += total
+        if index < self.first_available or index >= total:
+            raise IndexError("history entry not available")
+        if index < self._base:
+            return self._read_spilled(index - self.first_available)
+        return self._entry(index - self._base)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        for index in range(self.first_available, len(self)):
+            yield self[index]
+
+    def page(self, start: int = 0, count: Optional[int] = None) -> List[HistoryEntry]:
+        """Entries [start, start + count) counted from first_available."""
+        first = self.first_available + max(start, 0)
+        last = len(self) if count is None else min(len(self), first + max(count, 0))
+        return [self[index] for index in range(first, last)]
+
+    def _intern(self, name: Optional[str]) -> int:
+        if name is None:
+            return _NONE
+        idx = self._name_ids.get(name)
+        if idx is None:
+            idx = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        return idx
+
+    def _name(self, idx: int) -> Optional[str]:
+        return None if idx == _NONE else self._names[idx]
+
+    def _entry(self, i: int) -> HistoryEntry:
+        start = self._offsets[i] - self._produced_base
+        end = (self._offsets[i + 1] - self._produced_base) if i + 1 < len(self._offsets) else len(self._produced)
+        line = self._lines[i]
+        return HistoryEntry(
+            step=self._steps[i],
+            transition_id=self._name(self._transitions[i]),
+            line=None if line == _NONE else line,
+            produced_places=[self._names[p] for p in self._produced[start:end]],
+        )
+
+    def _evict(self, count: int) -> None:
+        if self.spill_path:
+            self._write_spill([self._entry(i) for i in range(count)])
+        cut = (self._offsets[count] - self._produced_base) if count < len(self._offsets) else len(self._produced)
+        del self._steps[:count]
+        del self._transitions[:count]
+        del self._lines[:count]
+        del self._offsets[:count]
+        del self._produced[:cut]
+        self._produced_base += cut
+        self._base += count
+
+    def _write_spill(self, entries: List[HistoryEntry]) -> None:
+        if self._spill is None:
+            directory = os.path.dirname(self.spill_path or "")
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Reopen our own file in place; anything else is only replaced with overwrite.
+            mode = "r+b" if self._spill_opened else "w+b" if self.overwrite else "x+b"
+            self._spill = open(self.spill_path, mode)  # type: ignore[arg-type]
+            self._spill_opened = True
+        spill = self._spill
+        spill.seek(0, 2)
+        for entry in entries:
+            self._spill_offsets.append(spill.tell())
+            record = {
+                "step": entry.step,
+                "transition_id": entry.transition_id,
+                "line": entry.line,
+                "produced_places": entry.produced_places,
+            }
+            spill.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+        spill.flush()
+
+    def _read_spilled(self, i: int) -> HistoryEntry:
+        spill = self._spill
+        if spill is None:
+            raise IndexError("history entry not available")
+        spill.seek(self._spill_offsets[i])
+        record = json.loads(spill.readline())
+        return HistoryEntry(**record)
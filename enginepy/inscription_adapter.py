@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+import inspect
+import threading
+import time
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+class InscriptionAdapter:
+    """Calls a resolved inscription with the token convention decided once up front.
+
+    The signature is inspected when the adapter is built: callables that take a
+    positional parameter get ``func(token)``, zero-argument callables get
+    ``func()``, and a missing token always means ``func()``. Only callables
+    whose signature cannot be inspected (some builtins and C extensions) fall
+    back to retrying ``func()`` on TypeError. Each call is counted and timed
+    in a per-thread slot (concurrent steps call expressions from a thread
+    pool), so the hot path takes no lock and the totals stay exact.
+    """
+
+    __slots__ = ("func", "accepts_token", "signature_known", "_counts")
+
+    def __init__(self, func: Callable[..., object]) -> None:
+        self.func = func
+        self.signature_known = True
+        self.accepts_token = True
+        # thread ident -> [calls, total_ns]
+        self._counts: Dict[int, List[int]] = {}
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            self.signature_known = False
+            return
+        params = signature.parameters.values()
+        self.accepts_token = any(p.kind in _POSITIONAL or p.kind == inspect.Parameter.VAR_POSITIONAL for p in params)
+
+    def __call__(self, token: Optional[object] = None) -> object:
+        started = time.perf_counter_ns()
+        try:
+            if token is None or not self.accepts_token:
+                return self.func()
+            if self.signature_known:
+                return self.func(token)
+            try:
+                return self.func(token)
+            except TypeError:
+                return self.func()
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            ident = threading.get_ident()
+            counts = self._counts.get(ident)
+            if counts is None:
+                counts = self._counts[ident] = [0, 0]
+            counts[0] += 1
+            counts[1] += elapsed
+
+    @property
+    def calls(self) -> int:
+        return sum(counts[0] for counts in list(self._counts.values()))
+
+    @property
+    def total_ns(self) -> int:
+        return sum(counts[1] for counts in list(self._counts.values()))
+
+    def stats(self) -> Dict[str, object]:
+        calls, total_ns = self.calls, self.total_ns
+        return {
+            "calls": calls,
+            "total_time": total_ns / 1e9,
+            "mean_time": (total_ns / calls / 1e9) if calls else 0.0,
+            "accepts_token": self.accepts_token,
+        }
+
+
+def adapt_inscription(func: Callable[..., object]) -> InscriptionAdapter:
+    if isinstance(func, InscriptionAdapter):
+        return func
+    return InscriptionAdapter(func)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+import itertools
+import json
+
+from .marking import Marking
+
+_MISSING = object()
+
+
+def join_key_of(token: object, key: str) -> object:
+    """Correlation value of token under key, or a sentinel when it has none.
+
+    Dict tokens are looked up directly, JSON object strings are decoded, and
+    any other object is read by attribute.
+    """
+    if isinstance(token, dict):
+        value = token.get(key, _MISSING)
+    elif isinstance(token, str):
+        value = _MISSING
+        if token.startswith("{"):
+            try:
+                decoded = json.loads(token)
+            except ValueError:
+                decoded = None
+            if isinstance(decoded, dict):
+                value = decoded.get(key, _MISSING)
+    else:
+        value = getattr(token, key, _MISSING)
+    if value is _MISSING:
+        return _MISSING
+    try:
+        hash(value)
+    except TypeError:
+        return _MISSING
+    return value
+
+
+class JoinIndex:
+    """Hash index of a join transition's input places by correlation key.
+
+    Each input place keeps key -> FIFO bucket of its tokens, and ``ready`` lists
+    the keys that currently have enough tokens in every input place, in the
+    order they became matchable. Looking up a matching token tuple is O(1) per
+    candidate key instead of scanning the queues.
+
+    The marking stays the source of truth. ``sync`` catches up with it before
+    each lookup: appends behind an unchanged head (the engine's produce path)
+    are indexed incrementally, removals made through ``discard`` are applied
+    directly, and any other edit rebuilds that place's buckets.
+
+    Tokens are numbered in arrival order per place. Removals behind the head
+    are kept as sorted tombstones until the head passes them, so ``locate``
+    turns a bucket entry into its queue position without comparing tokens.
+    """
+
+    def __init__(self, key: str, in_places: Sequence[str]) -> None:
+        self.key = key
+        self.in_places: List[str] = list(in_places)
+        # Places are indexed once; a place feeding the join through several arcs
+        # needs that many tokens with the same key.
+        self.need: Dict[str, int] = {}
+        for pid in self.in_places:
+            self.need[pid] = self.need.get(pid, 0) + 1
+        # pid -> key -> (sequence number, token) in arrival order
+        self.buckets: Dict[str, Dict[Hashable, Deque[Tuple[int, object]]]] = {pid: {} for pid in self.need}
+        self.ready: "OrderedDict[Hashable, None]" = OrderedDict()
+        # pid -> (head version, length) of the queue as last indexed
+        self._seen: Dict[str, Tuple[int, int]] = {pid: (-1, 0) for pid in self.need}
+        # pid -> sequence number of the queue head, of the next append, and
+        # the sorted tombstones of tokens removed behind the head.
+        self._head: Dict[str, int] = {pid: 0 for pid in self.need}
+        self._next: Dict[str, int] = {pid: 0 for pid in self.need}
+        self._gaps: Dict[str, List[int]] = {pid: [] for pid in self.need}
+        self.version = 0
+
+    def sync(self, marking: Marking) -> None:
+        for pid, (head_version, length) in self._seen.items():
+            queue = marking.get(pid)
+            size = len(queue) if queue else 0
+            current = marking.head_version(pid)
+            if current == head_version and size >= length:
+                if size > length:
+                    fresh = list(itertools.islice(reversed(queue), size - length))  # type: ignore[arg-type]
+                    for token in reversed(fresh):
+                        self._add(pid, token)
+                    self.version += 1
+            else:
+                self._rebuild(pid, queue or ())
+            self._seen[pid] = (current, size)
+
+    def match(self, accept: Optional[Callable[[List[object]], bool]] = None) -> Optional[List[object]]:
+        """Return one token per input arc (arc order) for the oldest acceptable key."""
+        found = self.find(accept)
+        return found[1] if found is not None else None
+
+    def find(self, accept: Optional[Callable[[List[object]], bool]] = None) -> Optional[Tuple[Hashable, List[object]]]:
+        """Like match(), but also return the key so the tokens can be located for consumption."""
+        for value in self.ready:
+            tokens = self._tokens_for(value)
+            if accept is None or accept(tokens):
+                return value, tokens
+        return None
+
+    def locate(self, pid: str, value: Hashable) -> Tuple[int, object]:
+        """Queue position and token of the oldest pid token under value."""
+        seq, token = self.buckets[pid][value][0]
+        return seq - self._head[pid] - bisect_left(self._gaps[pid], seq), token
+
+    def discard(self, marking: Marking, pid: str, position: int, token: object) -> None:
+        """Record that the engine removed token from position in pid's queue."""
+        if pid not in self.buckets:
+            return
+        head_version, length = self._seen[pid]
+        if length == 0:
+            return
+        seq = self._seq_at(pid, position)
+        if seq >= self._next[pid]:
+            # Appended after the last sync and never indexed: rebuild next time.
+            self._seen[pid] = (-1, 0)
+            return
+        head, gaps = self._head[pid], self._gaps[pid]
+        if seq == head:
+            head += 1
+            while gaps and gaps[0] == head:
+                del gaps[0]
+                head += 1
+            self._head[pid] = head
+        else:
+            insort(gaps, seq)
+        value = join_key_of(token, self.key)
+        bucket = self.buckets[pid].get(value) if value is not _MISSING else None
+        if bucket is not None:
+            if bucket[0][0] == seq:
+                bucket.popleft()
+            else:
+                for i, (entry, _token) in enumerate(bucket):
+                    if entry == seq:
+                        del bucket[i]
+                        break
+            if len(bucket) < self.need[pid]:
+                self.ready.pop(value, None)
+            if not bucket:
+                del self.buckets[pid][value]
+        self._seen[pid] = (marking.head_version(pid), length - 1)
+        self.version += 1
+
+    def _seq_at(self, pid: str, position: int) -> int:
+        # Smallest live sequence number with position live ones before it.
+        base = self._head[pid] + position
+        gaps = self._gaps[pid]
+        seq = base + bisect_right(gaps, base)
+        while True:
+            nxt = base + bisect_right(gaps, seq)
+            if nxt == seq:
+                return seq
+            seq = nxt
+
+    def _tokens_for(self, value: Hashable) -> List[object]:
+        taken: Dict[str, int] = {}
+        tokens: List[object] = []
+        for pid in self.in_places:
+            i = taken.get(pid, 0)
+            tokens.append(self.buckets[pid][value][i][1])
+            taken[pid] = i + 1
+        return tokens
+
+    def _add(self, pid: str, token: object) -> None:
+        seq = self._next[pid]
+        self._next[pid] = seq + 1
+        value = join_key_of(token, self.key)
+        if value is _MISSING:
+            return
+        bucket = self.buckets[pid].get(value)
+        if bucket is None:
+            bucket = self.buckets[pid][value] = deque()
+        bucket.append((seq, token))
+        if value not in self.ready and self._complete(value):
+            self.ready[value] = None
+
+    def _complete(self, value: Hashable) -> bool:
+        for pid, need in self.need.items():
+            bucket = self.buckets[pid].get(value)
+            if bucket is None or len(bucket) < need:
+                return False
+        return True
+
+    def _rebuild(self, pid: str, queue: object) -> None:
+        self.buckets[pid] = {}
+        self._gaps[pid] = []
+        self._head[pid] = 0
+        self.ready.clear()
+        for seq, token in enumerate(queue):  # type: ignore[arg-type]
+            value = join_key_of(token, self.key)
+            if value is _MISSING:
+                continue
+            bucket = self.buckets[pid].get(value)
+            if bucket is None:
+                bucket = self.buckets[pid][value] = deque()
+            bucket.append((seq, token))
+        self._next[pid] = len(queue)  # type: ignore[arg-type]
+        # Readiness order restarts from the oldest tokens of the first input place.
+        first = self.buckets[self.in_places[0]] if self.in_places else {}
+        for value in first:
+            if self._complete(value):
+                self.ready[value] = None
+        self.version += 1
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import pickle
+import struct
+import threading
+import time
+
+from .checkpoint import restore_into
+from .pending_ops import reserve_op_ids
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pnml_engine import PendingOp, PNMLEngine
+
+MAGIC = b"EVJL"
+FORMAT_VERSION = 1
+
+# Marking edits inside a record, applied in order on replay.
+OP_CONSUME = "c"  # ("c", place_id, index in the queue when removed)
+OP_PRODUCE = "p"  # ("p", place_id, tokens appended)
+
+_U32 = struct.Struct("<I")
+
+
+class JournalError(ValueError):
+    """Raised when a journal file is not readable as a firing journal."""
+
+
+@dataclass
+class JournalRecord:
+    """Effect of one engine step: a firing, a concurrent batch or an async completion.
+
+    Only the effects are kept (which tokens left which queue position and which
+    tokens were appended), so replay never runs guards or expressions.
+    """
+
+    transitions: List[str] = field(default_factory=list)
+    ops: List[Tuple[Any, ...]] = field(default_factory=list)
+    registered: List["PendingOp"] = field(default_factory=list)
+    completed: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.ops or self.registered or self.completed)
+
+
+class FiringJournal:
+    """Append-only redo journal of engine firings.
+
+    The file starts with MAGIC, then u32-length-prefixed pickles: a header
+    holding a full checkpoint of the engine when the journal was opened, then
+    one JournalRecord per step. Records are buffered and flushed with fsync
+    every ``sync_every`` records, and a background thread syncs records left
+    waiting for ``sync_interval`` seconds, so a crash loses at most the last
+    unsynced batch; replay stops at a torn final record.
+
+    A record is appended once its step has run, since the produced tokens are
+    only known then. A step interrupted by a crash is therefore missing from
+    the journal even if its inscriptions already had external side effects;
+    replay restores the state before that step.
+
+    Records are collected per thread between begin() and end(); nested steps
+    (an AsyncResult completing inline while its transition fires) fold into
+    the enclosing record.
+    """
+
+    def __init__(
+        self,
+        engine: "PNMLEngine",
+        path: str,
+        sync_every: int = 64,
+        sync_interval: float = 0.05,
+    ) -> None:
+        if sync_every < 1:
+            raise ValueError("sync_every must be >= 1")
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.records = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = {
+            "format": FORMAT_VERSION,
+            "net_id": engine.net.id,
+            "run_id": engine.run_id,
+            "created": time.time(),
+            "checkpoint": engine.checkpoint(),
+        }
+        self._file: Optional[IO[bytes]] = open(path, "wb")
+        self._file.write(MAGIC)
+        self._write_frame(pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL))
+        self.sync()
+        self._stopping = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if sync_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="pnml-journal", daemon=True)
+            self._flusher.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def begin(self, transitions: Iterable[str] = ()) -> bool:
+        """Open a record for this thread; False when one is already open (nested step)."""
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            record.transitions.extend(transitions)
+            return False
+        self._local.record = JournalRecord(list(transitions))
+        return True
+
+    def end(self, opened: bool) -> None:
+        if not opened:
+            return
+        record = self._local.record
+        self._local.record = None
+        if record:
+            self.append(record)
+
+    def consumed(self, place_id: str, index: int) -> None:
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            record.ops.append((OP_CONSUME, place_id, index))
+
+    def produced(self, place_id: str, tokens: List[object]) -> None:
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            record.ops.append((OP_PRODUCE, place_id, list(tokens)))
+
+    def registered(self, pending: "PendingOp") -> None:
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            # Monotonic deadlines are meaningless after a restart; replay re-derives them.
+            record.registered.append(replace(pending, deadline=None))
+
+    def completed(self, op_id: int) -> None:
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            record.completed.append(op_id)
+
+    def append(self, record: JournalRecord) -> None:
+        # Stored as a plain tuple so each record does not pickle a class reference.
+        fields = (record.transitions, record.ops, record.registered, record.completed)
+        frame = pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_frame(frame)
+            self.records += 1
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync_locked()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync_locked()
+            self._file.close()
+            self._file = None
+
+    def _flush_loop(self) -> None:
+        while not self._stopping.wait(self.sync_interval):
+            with self._lock:
+                if self._unsynced and time.monotonic() - self._last_sync >= self.sync_interval:
+                    self._sync_locked()
+
+    def _write_frame(self, frame: bytes) -> None:
+        assert self._file is not None
+        self._file.write(_U32.pack(len(frame)))
+        self._file.write(frame)
+
+    def _sync_locked(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+
+def read_journal(path: str) -> Tuple[Dict[str, Any], Iterator[JournalRecord]]:
+    """Return the journal header and a lazy iterator over its complete records."""
+    handle = open(path, "rb")
+    if handle.read(4) != MAGIC:
+        handle.close()
+        raise JournalError(f"{path} is not a firing journal")
+    raw = _read_frame(handle)
+    if raw is None:
+        handle.close()
+        raise JournalError(f"{path} has no journal header")
+    header = pickle.loads(raw)
+    if header.get("format") != FORMAT_VERSION:
+        handle.close()
+        raise JournalError(f"unsupported journal format: {header.get('format')}")
+
+    def records() -> Iterator[JournalRecord]:
+        with handle:
+            while True:
+                frame = _read_frame(handle)
+                if frame is None:
+                    return
+                yield JournalRecord(*pickle.loads(frame))
+
+    return header, records()
+
+
+def _read_frame(handle: IO[bytes]) -> Optional[bytes]:
+    prefix = handle.read(4)
+    if len(prefix) < 4:
+        return None
+    (size,) = _U32.unpack(prefix)
+    frame = handle.read(size)
+    # A short read is a record torn by a crash mid-write; everything before it is intact.
+    return frame if len(frame) == size else None
+
+
+def apply_record(engine: "PNMLEngine", record: JournalRecord) -> None:
+    """Re-apply one record's marking edits and pending-op changes, without running inscriptions."""
+    marking = engine.marking
+    join_places = engine._join_places
+    for op in record.ops:
+        kind, pid = op[0], op[1]
+        if kind == OP_CONSUME:
+            index = op[2]
+            if index == 0:
+                token = marking.consume(pid)
+            else:
+                queue = marking[pid]
+                token = queue[index]
+                del queue[index]
+            for join in join_places.get(pid, ()):
+                join.discard(marking, pid, index, token)
+        else:
+            marking.produce(pid, op[2])
+    table = engine.pending_ops
+    for pending in record.registered:
+        table.add(pending)
+    for op_id in record.completed:
+        pending = table.get(op_id)
+        if pending is not None:
+            table.remove(pending)
+
+
+def replay_into(
+    engine: "PNMLEngine",
+    path: str,
+    on_record: Optional[Callable[[JournalRecord], None]] = None,
+) -> int:
+    """Restore engine from the journal's opening checkpoint and apply every record.
+
+    Returns the number of records applied. on_record is called after each one,
+    e.g. to rebuild debugger history.
+    """
+    header, records = read_journal(path)
+    if header["net_id"] != engine.net.id:
+        raise JournalError(f"journal is for net {header['net_id']!r}, not {engine.net.id!r}")
+    restore_into(engine, header["checkpoint"])
+    count = 0
+    with engine._pending_lock:
+        for record in records:
+            apply_record(engine, record)
+            count += 1
+            if on_record is not None:
+                on_record(record)
+        if engine.pending_ops:
+            reserve_op_ids(max(engine.pending_ops.by_id))
+    engine.refresh_enabled()
+    return count
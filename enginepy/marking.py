@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+import itertools
+
+MarkingListener = Callable[[str], None]
+
+# Shared across markings so a head version never repeats, even between cases.
+_HEAD_CLOCK = itertools.count(1)
+
+
+class TokenQueue(deque):
+    """FIFO token queue for a single place.
+
+    Backed by a deque so consuming the head token is O(1). It compares equal to
+    lists and prints like one, so code written against the old dict-of-lists
+    marking (``marking[pid] == [...]``, ``marking[pid].pop(0)``) keeps working.
+    Every mutation notifies the owning Marking.
+    """
+
+    __slots__ = ("_owner", "_place_id")
+
+    def __init__(self, tokens: Iterable[object] = (), owner: Optional["Marking"] = None, place_id: str = "") -> None:
+        super().__init__(tokens)
+        self._owner = owner
+        self._place_id = place_id
+
+    def _changed(self, head: bool = True) -> None:
+        owner = self._owner
+        if owner is None:
+            return
+        if head:
+            owner._head_versions[self._place_id] = next(_HEAD_CLOCK)
+        if owner._listeners:
+            owner._notify(self._place_id)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, deque)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        return (TokenQueue, (list(self),))
+
+    def append(self, token: object) -> None:
+        head = not self
+        super().append(token)
+        self._changed(head)
+
+    def appendleft(self, token: object) -> None:
+        super().appendleft(token)
+        self._changed()
+
+    def extend(self, tokens: Iterable[object]) -> None:
+        head = not self
+        super().extend(tokens)
+        self._changed(head)
+
+    def extendleft(self, tokens: Iterable[object]) -> None:
+        super().extendleft(tokens)
+        self._changed()
+
+    def insert(self, index: int, token: object) -> None:
+        super().insert(index, token)
+        self._changed()
+
+    def pop(self, index: int = -1) -> object:  # type: ignore[override]
+        if index == 0:
+            token = super().popleft()
+        elif index == -1:
+            token = super().pop()
+        else:
+            token = self[index]
+            super().__delitem__(index)
+        self._changed()
+        return token
+
+    def popleft(self) -> object:
+        token = super().popleft()
+        self._changed()
+        return token
+
+    def remove(self, token: object) -> None:
+        super().remove(token)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def rotate(self, n: int = 1) -> None:
+        super().rotate(n)
+        self._changed()
+
+    def __setitem__(self, index: int, token: object) -> None:
+        super().__setitem__(index, token)
+        self._changed()
+
+    def __delitem__(self, index: int) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, tokens: Iterable[object]) -> "TokenQueue":
+        self.extend(tokens)
+        return self
+
+
+class Marking(Dict[str, TokenQueue]):
+    """Place id -> TokenQueue mapping with O(1) consume/produce and counts.
+
+    Plain lists assigned into the marking are converted to TokenQueues. Listeners
+    registered with add_listener are called with the place id whenever that
+    place's tokens change, whichever API made the change. head_version(pid)
+    changes whenever the head token of pid may have changed (appending behind
+    an existing head does not count).
+    """
+
+    def __init__(self, initial: Optional[Mapping[str, Iterable[object]]] = None) -> None:
+        super().__init__()
+        self._listeners: List[MarkingListener] = []
+        self._head_versions: Dict[str, int] = {}
+        if initial:
+            for pid, tokens in initial.items():
+                dict.__setitem__(self, pid, TokenQueue(tokens, self, pid))
+                self._head_versions[pid] = next(_HEAD_CLOCK)
+
+    def add_listener(self, listener: MarkingListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: MarkingListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, place_id: str) -> None:
+        for listener in self._listeners:
+            listener(place_id)
+
+    def _queue(self, place_id: str, tokens: Iterable[object] = ()) -> TokenQueue:
+        if isinstance(tokens, TokenQueue) and tokens._owner is self and tokens._place_id == place_id:
+            return tokens
+        return TokenQueue(tokens, self, place_id)
+
+    def __reduce__(self):
+        # Listeners are engine callbacks; a copied marking starts without them.
+        return (Marking, (self.snapshot(),))
+
+    def head_version(self, place_id: str) -> int:
+        return self._head_versions.get(place_id, 0)
+
+    def __setitem__(self, place_id: str, tokens: Iterable[object]) -> None:
+        dict.__setitem__(self, place_id, self._queue(place_id, tokens))
+        self._head_versions[place_id] = next(_HEAD_CLOCK)
+        if self._listeners:
+            self._notify(place_id)
+
+    def __delitem__(self, place_id: str) -> None:
+        dict.__delitem__(self, place_id)
+        self._head_versions[place_id] = next(_HEAD_CLOCK)
+        if self._listeners:
+            self._notify(place_id)
+
+    def setdefault(self, place_id: str, default: Optional[Iterable[object]] = None) -> TokenQueue:  # type: ignore[override]
+        queue = dict.get(self, place_id)
+        if queue is None:
+            queue = self._queue(place_id, default or ())
+            dict.__setitem__(self, place_id, queue)
+            self._head_versions[place_id] = next(_HEAD_CLOCK)
+            if self._listeners and queue:
+                self._notify(place_id)
+        return queue
+
+    def update(self, *args: object, **kwargs: Iterable[object]) -> None:  # type: ignore[override]
+        for place_id, tokens in dict(*args, **kwargs).items():
+            self[place_id] = tokens
+
+    def consume(self, place_id: str) -> object:
+        """Remove and return the head token of place_id (O(1))."""
+        queue = dict.__getitem__(self, place_id)
+        token = deque.popleft(queue)
+        self._head_versions[place_id] = next(_HEAD_CLOCK)
+        if self._listeners:
+            self._notify(place_id)
+        return token
+
+    def produce(self, place_id: str, tokens: Iterable[object]) -> None:
+        """Append tokens to place_id, creating the place if needed."""
+        queue = dict.get(self, place_id)
+        if queue is None:
+            queue = TokenQueue((), self, place_id)
+            dict.__setitem__(self, place_id, queue)
+        if not queue:
+            self._head_versions[place_id] = next(_HEAD_CLOCK)
+        deque.extend(queue, tokens)
+        if self._listeners:
+            self._notify(place_id)
+
+    def count(self, place_id: str) -> int:
+        queue = dict.get(self, place_id)
+        return len(queue) if queue is not None else 0
+
+    def head(self, place_id: str) -> Optional[object]:
+        queue = dict.get(self, place_id)
+        return queue[0] if queue else None
+
+    def view(self) -> "MarkingView":
+        return MarkingView(self)
+
+    def snapshot(self) -> Dict[str, List[object]]:
+        """Return a detached dict-of-lists copy of the marking."""
+        return {pid: list(tokens) for pid, tokens in self.items()}
+
+
+class MarkingView(Mapping[str, List[object]]):
+    """Read-only dict-of-lists view over a Marking.
+
+    Values are materialized as fresh lists on access, so callers that format or
+    iterate the marking (DAP variables, generated main.py output) see the same
+    shapes as before without being able to mutate engine state.
+    """
+
+    __slots__ = ("_marking",)
+
+    def __init__(self, marking: Marking) -> None:
+        self._marking = marking
+
+    def __getitem__(self, place_id: str) -> List[object]:
+        return list(self._marking[place_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._marking)
+
+    def __len__(self) -> int:
+        return len(self._marking)
+
+    def __repr__(self) -> str:
+        return repr(self._marking)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import heapq
+import itertools
+import threading
+import time
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pnml_engine import PendingOp
+
+# Process-wide so ids stay unique across engines, cases and async_ops.run_async.
+_OP_IDS = itertools.count(1)
+_OP_IDS_LOCK = threading.Lock()
+
+
+def next_op_id() -> int:
+    return next(_OP_IDS)
+
+
+def reserve_op_ids(floor: int) -> None:
+    """Make next_op_id() return ids above floor, e.g. after restoring ops from another process."""
+    global _OP_IDS
+    with _OP_IDS_LOCK:
+        current = next(_OP_IDS)
+        _OP_IDS = itertools.count(max(current, floor + 1))
+
+
+def op_timeout_ms(pending: "PendingOp") -> Optional[int]:
+    """timeout_ms from an op's metadata (as set from AsyncOpRequest), if positive."""
+    metadata = pending.metadata or {}
+    raw = metadata.get("timeout_ms") or metadata.get("timeout")
+    try:
+        timeout = int(raw) if raw is not None else None  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return timeout if timeout and timeout > 0 else None
+
+
+class PendingOpTable:
+    """Registry of in-flight async ops, indexed by id and resume token, with deadlines.
+
+    Deadlines are time.monotonic() values kept in a heap. Entries for ops that
+    completed first are dropped lazily, so next_deadline() is O(1) apart from
+    discarding those stale heads.
+    """
+
+    def __init__(self) -> None:
+        self.by_id: Dict[int, "PendingOp"] = {}
+        self.by_token: Dict[str, "PendingOp"] = {}
+        self._deadlines: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __bool__(self) -> bool:
+        return bool(self.by_id)
+
+    def __contains__(self, op_id: object) -> bool:
+        return op_id in self.by_id
+
+    def clear(self) -> None:
+        self.by_id.clear()
+        self.by_token.clear()
+        self._deadlines.clear()
+
+    def add(self, pending: "PendingOp", now: Optional[float] = None) -> None:
+        self.by_id[pending.id] = pending
+        if pending.resume_token:
+            self.by_token[pending.resume_token] = pending
+        timeout = op_timeout_ms(pending)
+        if timeout is not None and pending.deadline is None:
+            pending.deadline = (time.monotonic() if now is None else now) + timeout / 1000.0
+        if pending.deadline is not None:
+            heapq.heappush(self._deadlines, (pending.deadline, pending.id))
+
+    def remove(self, pending: "PendingOp") -> None:
+        if self.by_id.get(pending.id) is pending:
+            del self.by_id[pending.id]
+        if pending.resume_token and self.by_token.get(pending.resume_token) is pending:
+            del self.by_token[pending.resume_token]
+
+    def get(self, op_id: Optional[int] = None, resume_token: Optional[str] = None) -> Optional["PendingOp"]:
+        if op_id is not None:
+            return self.by_id.get(op_id)
+        if resume_token is not None:
+            return self.by_token.get(resume_token)
+        return None
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest monotonic deadline among live ops, or None."""
+        heap = self._deadlines
+        while heap:
+            deadline, op_id = heap[0]
+            pending = self.by_id.get(op_id)
+            if pending is not None and pending.deadline == deadline:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_expired(self, now: Optional[float] = None) -> List["PendingOp"]:
+        """Remove and return live ops whose deadline is at or before now."""
+        now = time.monotonic() if now is None else now
+        expired: List["PendingOp"] = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return expired
+            _deadline, op_id = heapq.heappop(self._deadlines)
+            pending = self.by_id[op_id]
+            self.remove(pending)
+            expired.append(pending)
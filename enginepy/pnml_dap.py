@@ -13,18 +13,22 @@ import queue
 
 try:
     from enginepy.pnml_engine import DebugEngine, HistoryEntry, PendingOp
+    from enginepy.history_store import HistoryStore
     from enginepy.pnml_parser import extract_place_index
     from enginepy.project_gen import generate_python_project
     from enginepy.inscription_registry import clear_registry
+    from enginepy.compile_cache import CACHE_DIR_ENV
     from enginepy import vscode_bridge
 except ImportError:
     repo_root = os.path.dirname(os.path.dirname(__file__))
     if repo_root not in sys.path:
         sys.path.insert(0, repo_root)
     from enginepy.pnml_engine import DebugEngine, HistoryEntry, PendingOp
+    from enginepy.history_store import HistoryStore
     from enginepy.pnml_parser import extract_place_index
     from enginepy.project_gen import generate_python_project
     from enginepy.inscription_registry import clear_registry
+    from enginepy.compile_cache import CACHE_DIR_ENV
     from enginepy import vscode_bridge
 
 
@@ -62,6 +66,10 @@ class DAPProtocol:
         self.send(payload)
 
 
+# Steps kept in memory when history spills to historySpillPath, unless launch sets historyRetention.
+DEFAULT_HISTORY_RETENTION = 10_000
+
+
 class PNMLDAPServer:
     def __init__(self, start_reader: bool = True) -> None:
         self.protocol = DAPProtocol()
@@ -129,6 +137,7 @@ class PNMLDAPServer:
         args = request.get("arguments", {})
         self.program = args.get("program")
         self.no_debug = bool(args.get("noDebug"))
+        self._configure_history(args)
         
         # Initialize VSCode bridge for debug sessions
         if not self.no_debug:
@@ -144,25 +153,29 @@ class PNMLDAPServer:
                 preserve_base = os.path.join(workspace_root, ".vscode", "pnmlGen")
                 # Only set if not already present to allow user overrides
                 os.environ.setdefault("EVOLVE_PRESERVE_BASE", preserve_base)
+                # Compiled inline inscriptions are cached next to the generated project.
+                os.environ.setdefault(
+                    CACHE_DIR_ENV,
+                    os.path.join(workspace_root, ".vscode", "evolve_py", "__inscription_cache__"),
+                )
             except Exception:
                 pass
             with open(self.program, "r", encoding="utf-8") as f:
                 text = f.read()
             self._ensure_inscriptions_registered(self.program, text)
             self.engine.load(text)
+            journal_path = args.get("replayJournal")
+            if journal_path:
+                # Resume a recorded run: state is rebuilt from the journal, inscriptions are not re-run.
+                self.engine.replay_journal(journal_path)
+            if args.get("profile") and self.engine.engine:
+                self.engine.engine.start_profiling()
         self.protocol.send_response(request)
         if self.no_debug:
             if self.engine.engine:
                 buf = io.StringIO()
                 with redirect_stdout(buf):
-                    while True:
-                        result = self.engine.engine.step_once()
-                        if result is None:
-                            break
-                        if isinstance(result, PendingOp) and not result.completed:
-                            break
-                        if not self.engine.engine.enabled_transitions():
-                            break
+                    self.engine.engine.run()
                 self._emit_output(buf.getvalue())
                 self._emit_marking()
                 self._emit_pending_ops()
@@ -288,7 +301,12 @@ class PNMLDAPServer:
     def handle_scopes(self, request: Dict[str, Any]) -> None:
         scopes = [
             {"name": "Marking", "variablesReference": 1, "presentationHint": "data"},
-            {"name": "History", "variablesReference": 2, "presentationHint": "data"},
+            {
+                "name": "History",
+                "variablesReference": 2,
+                "presentationHint": "data",
+                "indexedVariables": self.engine.history.available,
+            },
         ]
         self.protocol.send_response(request, {"scopes": scopes})
 
@@ -298,9 +316,10 @@ class PNMLDAPServer:
         if ref == 1 and self.engine.engine:
             vars_list = [
                 {"name": pid, "value": str(tokens), "type": "list", "variablesReference": 0}
-                for pid, tokens in self.engine.engine.marking.items()
+                for pid, tokens in self.engine.engine.marking.view().items()
             ]
         elif ref == 2:
+            # Clients page indexed variables with start/count; entries are read on demand.
             vars_list = [
                 {
                     "name": f"step {entry.step}",
@@ -308,7 +327,7 @@ class PNMLDAPServer:
                     "type": "HistoryEntry",
                     "variablesReference": 0,
                 }
-                for entry in self.engine.history
+                for entry in self.engine.history.page(int(args.get("start") or 0), args.get("count") or None)
             ]
         else:
             vars_list = []
@@ -462,6 +481,19 @@ class PNMLDAPServer:
                 result = repr(self.engine.engine.marking.get(key))
         self.protocol.send_response(request, {"result": result, "variablesReference": 0})
 
+    def handle_metrics(self, request: Dict[str, Any]) -> None:
+        """Custom request: engine metrics (see PNMLEngine.metrics), optionally written to arguments.path."""
+        args = request.get("arguments") or {}
+        engine = self.engine.engine
+        if engine is None:
+            self.protocol.send_response(request, {"metrics": None})
+            return
+        if args.get("start") and engine.profiler is None:
+            engine.start_profiling()
+        path = args.get("path")
+        metrics = engine.export_metrics(path) if path else engine.metrics()
+        self.protocol.send_response(request, {"metrics": metrics})
+
     def handle_disconnect(self, request: Dict[str, Any]) -> None:
         self.protocol.send_response(request)
         # Clean up bridge
@@ -586,11 +618,11 @@ class PNMLDAPServer:
                 self.protocol.send_event("stopped", {"reason": "breakpoint", "threadId": 1})
                 return
         if self.engine.engine and self.engine.breakpoints:
-            inputs, _outputs = self.engine.engine._build_io_maps()
+            compiled = self.engine.engine.compiled
             enabled = set(self.engine.engine.enabled_transitions())
             for place_id in self.engine.breakpoints:
                 tokens = self.engine.engine.marking.get(place_id) or []
-                is_input = any(place_id in inputs.get(tid, []) for tid in enabled)
+                is_input = any(tid in enabled for tid in compiled.consumers_of(place_id))
                 if tokens and is_input:
                     self.last_stop_place = place_id
                     self.stopped = True
@@ -660,6 +692,20 @@ class PNMLDAPServer:
             return
         self.protocol.send_event("output", {"category": "stdout", "output": text})
 
+    def _configure_history(self, args: Dict[str, Any]) -> None:
+        # Spilling is opt-in; without it history stays in memory unless
+        # historyRetention bounds it (older steps are then dropped).
+        spill_path = args.get("historySpillPath") or None
+        default_retention = DEFAULT_HISTORY_RETENTION if spill_path else None
+        retention = args.get("historyRetention", default_retention)
+        retention = int(retention) if retention else None
+        self.engine.history.close()
+        try:
+            self.engine.history = HistoryStore(retention, spill_path, overwrite=bool(args.get("historySpillOverwrite")))
+        except FileExistsError as exc:
+            self._emit_output(f"{exc}; set historySpillOverwrite to replace it. History is kept in memory.\n")
+            self.engine.history = HistoryStore(None)
+
     def _emit_marking(self, final: bool = False) -> None:
         if not self.engine.engine:
             return
@@ -1,23 +1,30 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Callable, Union
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Set, Callable, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import inspect
 import threading
 import time
 
 from .pnml_parser import PNMLNet, PlaceIndex, parse_pnml, Inscription
+from .compiled_net import CompiledNet, compile_net, invalidate_compiled_net
+from .marking import Marking
+from .compile_cache import compile_inscription
+from .inscription_adapter import InscriptionAdapter, adapt_inscription
+from .join_index import JoinIndex
+from .pending_ops import PendingOpTable, next_op_id, op_timeout_ms
+from .history_store import HistoryEntry, HistoryStore
+from .checkpoint import dump_checkpoint, restore_into
+from .journal import FiringJournal, replay_into
+from .scheduler import TransitionScheduler, make_scheduler
+from .profiling import EngineProfiler, write_json
+from .trace.spans import Span, SpanExporter, SpanTracer, trace_id_for
 from .inscription_registry import get_inscription
 from .async_ops import AsyncResult, AsyncOpRequest
 
 
-@dataclass
-class HistoryEntry:
-    step: int
-    transition_id: Optional[str]
-    line: Optional[int]
-    produced_places: List[str]
-
-
 @dataclass
 class PendingOp:
     id: int
@@ -36,19 +43,224 @@ class PendingOp:
     result: Optional[object] = None
     error: Optional[str] = None
     completed: bool = False
+    # time.monotonic() deadline derived from metadata["timeout_ms"], if any.
+    deadline: Optional[float] = None
+
+
+@dataclass
+class RunStats:
+    """Outcome of PNMLEngine.run().
+
+    stop_reason is one of "quiescent", "max_steps", "pending" or "until".
+    """
+
+    steps: int = 0
+    wall_time: float = 0.0
+    firings: Dict[str, int] = field(default_factory=dict)
+    stop_reason: str = "quiescent"
+    pending: Optional[PendingOp] = None
+
+
+# Scheduler modes: "scan" re-checks every transition on each call, "incremental"
+# keeps an enabled set and re-checks only consumers of places whose tokens changed.
+SCHEDULER_SCAN = "scan"
+SCHEDULER_INCREMENTAL = "incremental"
+
+# Step semantics for run(): "interleaving" fires one transition per step,
+# "concurrent" fires a maximal conflict-free set per step on a thread pool.
+STEP_INTERLEAVING = "interleaving"
+STEP_CONCURRENT = "concurrent"
 
 
 class PNMLEngine:
-    def __init__(self, net: PNMLNet) -> None:
+    # While any async op is pending the whole net pauses; AsyncPNMLEngine lifts this.
+    blocks_on_pending = True
+
+    def __init__(
+        self,
+        net: PNMLNet,
+        scheduler_mode: str = SCHEDULER_SCAN,
+        step_semantics: str = STEP_INTERLEAVING,
+        max_workers: Optional[int] = None,
+        memoize_guards: bool = False,
+        scheduler: Union[str, TransitionScheduler] = "default",
+        seed: Optional[int] = None,
+    ) -> None:
+        if scheduler_mode not in (SCHEDULER_SCAN, SCHEDULER_INCREMENTAL):
+            raise ValueError(f"unknown scheduler mode: {scheduler_mode}")
+        if step_semantics not in (STEP_INTERLEAVING, STEP_CONCURRENT):
+            raise ValueError(f"unknown step semantics: {step_semantics}")
         self.net = net
-        self.marking: Dict[str, List[object]] = {
-            pid: list(place.tokens) for pid, place in net.places.items()
-        }
+        self.scheduler_mode = scheduler_mode
+        self.step_semantics = step_semantics
+        self.max_workers = max_workers
+        self.memoize_guards = memoize_guards
+        # Picks among enabled transitions; seed only applies to the "random" policy.
+        self.scheduler = make_scheduler(scheduler, seed)
+        self.scheduler.bind(net)
+        # tid -> (head version of its first input place, guard result)
+        self._guard_cache: Dict[str, Tuple[int, bool]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.marking: Marking = Marking({pid: place.tokens for pid, place in net.places.items()})
         self.history: List[HistoryEntry] = []
-        self.pending_ops_by_id: Dict[int, PendingOp] = {}
-        self.pending_ops_by_token: Dict[str, PendingOp] = {}
+        self.pending_ops = PendingOpTable()
+        self.pending_ops_by_id: Dict[int, PendingOp] = self.pending_ops.by_id
+        self.pending_ops_by_token: Dict[str, PendingOp] = self.pending_ops.by_token
         self.run_id: str = f"run-{int(time.time() * 1000)}"
-        self._pending_lock = threading.Lock()
+        # Re-entrant: committing an AsyncResult that is already done submits it inline.
+        self._pending_lock = threading.RLock()
+        self._enabled_set: Set[str] = set()
+        self._enabled_version: Optional[int] = None
+        self._dirty_places: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._joins: Dict[str, JoinIndex] = {}
+        self._join_places: Dict[str, List[JoinIndex]] = {}
+        # tid -> (join index version, last match) so firing reuses the guard-checked match
+        self._join_cache: Dict[str, Tuple[int, Optional[Tuple[Hashable, List[object]]]]] = {}
+        self._build_joins()
+        # Checkpoint bookkeeping; places are only tracked between incremental checkpoints.
+        self._checkpoint_seq: Optional[int] = None
+        self._checkpoint_dirty: Optional[Set[str]] = None
+        self._checkpoint_lock = threading.Lock()
+        # Opt-in redo journal, see start_journal().
+        self.journal: Optional[FiringJournal] = None
+        # Opt-in instrumentation, see start_profiling().
+        self.profiler: Optional[EngineProfiler] = None
+        # Opt-in span export, see start_tracing().
+        self.tracer: Optional[SpanTracer] = None
+        if scheduler_mode == SCHEDULER_INCREMENTAL:
+            self.marking.add_listener(self._on_marking_change)
+
+    def checkpoint(self, incremental: bool = False) -> bytes:
+        """Snapshot marking, pending ops, resume tokens and run_id as framed binary.
+
+        With incremental=True, places unchanged since the previous checkpoint
+        are left out; restore() takes the full checkpoint followed by its deltas.
+        Call it between steps; only list copies are made while holding the
+        pending-op lock, pickling happens afterwards.
+        """
+        return dump_checkpoint(self, incremental)
+
+    @classmethod
+    def restore(cls, net: PNMLNet, checkpoints: Union[bytes, List[bytes]], **kwargs: object) -> "PNMLEngine":
+        """Build an engine for net and apply a full checkpoint plus optional deltas.
+
+        Pending ops come back with their ids and resume tokens, so hosts can
+        keep calling submit_async; awaitables and AsyncResult callbacks from the
+        old process are gone and such ops finish only by submit or timeout.
+        """
+        return restore_into(cls(net, **kwargs), checkpoints)  # type: ignore[arg-type]
+
+    def start_journal(self, path: str, sync_every: int = 64, sync_interval: float = 0.05) -> FiringJournal:
+        """Record every firing and async completion to an append-only journal at path.
+
+        The journal opens with a full checkpoint, then stores each step's
+        effects (consumed queue positions, produced tokens, pending ops
+        registered and completed) once the step has run. Writes are fsynced in
+        batches of sync_every records, and records waiting longer than
+        sync_interval seconds are synced by a background thread. Marking edits
+        made outside the engine's firing paths are not journaled.
+        """
+        self.stop_journal()
+        self.journal = FiringJournal(self, path, sync_every=sync_every, sync_interval=sync_interval)
+        return self.journal
+
+    def stop_journal(self) -> None:
+        journal, self.journal = self.journal, None
+        if journal is not None:
+            journal.close()
+
+    @classmethod
+    def replay(cls, net: PNMLNet, path: str, **kwargs: object) -> "PNMLEngine":
+        """Rebuild the state recorded in a journal without executing any inscription.
+
+        Like restore(), pending ops come back by id and resume token only.
+        """
+        engine = cls(net, **kwargs)  # type: ignore[arg-type]
+        replay_into(engine, path)
+        return engine
+
+    def _take_checkpoint_dirty(self, incremental: bool) -> Optional[Set[str]]:
+        """Places changed since the previous checkpoint, or None when changes were not tracked.
+
+        Only incremental checkpoints track changes: the first one attaches a
+        marking listener and a full checkpoint (or a restore) detaches it, so
+        engines that never ask for deltas pay nothing per token move.
+        """
+        with self._checkpoint_lock:
+            dirty = self._checkpoint_dirty
+            if not incremental:
+                self._stop_checkpoint_tracking()
+            else:
+                if dirty is None:
+                    self.marking.add_listener(self._on_checkpoint_change)
+                self._checkpoint_dirty = set()
+        return dirty
+
+    def _stop_checkpoint_tracking(self) -> None:
+        if self._checkpoint_dirty is not None:
+            self.marking.remove_listener(self._on_checkpoint_change)
+            self._checkpoint_dirty = None
+
+    def _on_checkpoint_change(self, place_id: str) -> None:
+        with self._checkpoint_lock:
+            if self._checkpoint_dirty is not None:
+                self._checkpoint_dirty.add(place_id)
+
+    @property
+    def compiled(self) -> CompiledNet:
+        return compile_net(self.net)
+
+    def invalidate_topology(self) -> None:
+        """Rebuild the cached topology after places, transitions or arcs were edited."""
+        invalidate_compiled_net(self.net)
+        for pid in self.net.places:
+            self.marking.setdefault(pid, [])
+        self._enabled_version = None
+        self._guard_cache.clear()
+        self.scheduler.bind(self.net)
+        self._build_joins()
+
+    def _build_joins(self) -> None:
+        self._joins = {}
+        self._join_places = {}
+        self._join_cache = {}
+        compiled = self.compiled
+        for tid, transition in self.net.transitions.items():
+            in_places = compiled.inputs_of(tid)
+            if not transition.join_key or not in_places:
+                continue
+            join = JoinIndex(transition.join_key, in_places)
+            self._joins[tid] = join
+            for pid in join.need:
+                self._join_places.setdefault(pid, []).append(join)
+
+    def refresh_enabled(self, place_ids: Optional[List[str]] = None) -> None:
+        """Tell the incremental scheduler that state outside the marking changed.
+
+        Marking edits are tracked automatically; use this when guards depend on
+        other state. With place_ids only the consumers of those places are
+        re-checked; without them the whole enabled set is rebuilt on the next query.
+        """
+        if place_ids is None:
+            self._enabled_version = None
+            self._guard_cache.clear()
+        else:
+            consumers = self.compiled.consumers_of
+            for pid in place_ids:
+                for tid in consumers(pid):
+                    self._guard_cache.pop(tid, None)
+            self._touch(place_ids)
+
+    def _touch(self, place_ids: List[str]) -> None:
+        if self.scheduler_mode != SCHEDULER_INCREMENTAL:
+            return
+        with self._dirty_lock:
+            self._dirty_places.update(place_ids)
+
+    def _on_marking_change(self, place_id: str) -> None:
+        with self._dirty_lock:
+            self._dirty_places.add(place_id)
 
     def enabled_transitions(self) -> List[str]:
         """Return list of transitions that are *enabled* considering token availability and guard evaluation.
@@ -56,73 +268,399 @@ class PNMLEngine:
         Guards are evaluated using the first token from the transition's input places (if present).
         This ensures XOR-split style behavior when guards are mutually exclusive.
         """
-        if self.pending_ops_by_id:
+        if self.blocks_on_pending and self.pending_ops_by_id:
             return []
-        inputs, _outputs = self._build_io_maps()
-        enabled: List[str] = []
-        for tid, in_places in inputs.items():
-            # All input places must have at least one token
-            if not all(self.marking.get(pid) and len(self.marking[pid]) > 0 for pid in in_places):
-                continue
-            # Build peek tokens to evaluate guards
-            peek_tokens: List[object] = []
-            for pid in in_places:
-                if self.marking.get(pid):
-                    peek_tokens.append(self.marking[pid][0])
-            transition = self.net.transitions.get(tid)
-            if transition and transition.inscriptions:
-                try:
-                    if not self._evaluate_guards(transition.inscriptions, peek_tokens):
+        if self.scheduler_mode == SCHEDULER_INCREMENTAL:
+            return self._incremental_enabled()
+        inputs = self.compiled.input_ids
+        return [tid for tid, in_places in inputs.items() if self._is_enabled(tid, in_places)]
+
+    def _is_enabled(self, tid: str, in_places: List[str]) -> bool:
+        join = self._joins.get(tid) if self._joins else None
+        if join is not None:
+            return self._join_match(tid, join) is not None
+        # All input places must have at least one token
+        if not all(self.marking.get(pid) and len(self.marking[pid]) > 0 for pid in in_places):
+            return False
+        # Build peek tokens to evaluate guards
+        peek_tokens: List[object] = []
+        for pid in in_places:
+            if self.marking.get(pid):
+                peek_tokens.append(self.marking[pid][0])
+        transition = self.net.transitions.get(tid)
+        if transition and transition.inscriptions:
+            try:
+                if not self._check_guards(tid, transition.inscriptions, in_places, peek_tokens):
+                    return False
+            except Exception:
+                # On any error evaluating a guard, treat it as not enabled to avoid unsafe firings
+                return False
+        return True
+
+    def _incremental_enabled(self) -> List[str]:
+        return sorted(self._update_enabled(), key=self.compiled.enable_rank.__getitem__)
+
+    def _update_enabled(self) -> Set[str]:
+        """Bring the incremental enabled set, and the scheduler with it, up to date."""
+        compiled = self.compiled
+        inputs = compiled.input_ids
+        scheduler = self.scheduler
+        with self._dirty_lock:
+            dirty, self._dirty_places = self._dirty_places, set()
+        if self._enabled_version != compiled.version:
+            self._enabled_set = {tid for tid, in_places in inputs.items() if self._is_enabled(tid, in_places)}
+            self._enabled_version = compiled.version
+            scheduler.sync(self._enabled_set)
+        else:
+            enabled = self._enabled_set
+            checked: Set[str] = set()
+            # Sorted so that policies keyed on arrival order stay reproducible across processes.
+            for pid in sorted(dirty):
+                for tid in compiled.consumers_of(pid):
+                    if tid in checked:
                         continue
-                except Exception:
-                    # On any error evaluating a guard, treat it as not enabled to avoid unsafe firings
-                    continue
-            enabled.append(tid)
-        return enabled
+                    checked.add(tid)
+                    if self._is_enabled(tid, inputs[tid]):
+                        if tid not in enabled:
+                            enabled.add(tid)
+                            scheduler.add(tid)
+                    elif tid in enabled:
+                        enabled.discard(tid)
+                        scheduler.discard(tid)
+        return self._enabled_set
 
     def step_once(self) -> Optional[Union[str, PendingOp]]:
         if self.pending_ops_by_id:
+            self.expire_pending()
+        if self.blocks_on_pending and self.pending_ops_by_id:
             return next(iter(self.pending_ops_by_id.values()))
-        enabled = self.enabled_transitions()
-        if not enabled:
+        tid = self._select_transition()
+        if tid is None:
             return None
-        inputs, _outputs = self._build_io_maps()
-        # Prefer transitions that do not consume tokens from places that had initial tokens,
-        # so we don't get preempted by default 'start' or control tokens.
-        initial_places = [pid for pid, place in self.net.places.items() if getattr(place, 'tokens', None)]
-        candidates = [e for e in enabled if not any(pid in initial_places for pid in inputs.get(e, []))]
-        tid = candidates[0] if candidates else enabled[0]
         transition = self.net.transitions.get(tid)
 
+        if tid in self._joins:
+            # The correlated match was guard-checked while computing the enabled set.
+            return self._fire(tid)
+
         # Build peek tokens for guard evaluation (do not pop yet)
-        inputs, outputs = self._build_io_maps()
         peek_tokens: List[object] = []
-        for pid in inputs.get(tid, []):
+        for pid in self.compiled.inputs_of(tid):
             if self.marking.get(pid):
                 peek_tokens.append(self.marking[pid][0])
 
         if transition and transition.inscriptions:
-            if not self._evaluate_guards(transition.inscriptions, peek_tokens):
+            if not self._check_guards(tid, transition.inscriptions, self.compiled.inputs_of(tid), peek_tokens):
                 return None
+        return self._fire(tid)
 
-        # Now actually pop tokens to move
+    def run(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[["PNMLEngine"], bool]] = None,
+    ) -> RunStats:
+        """Fire transitions until quiescence, a pending op, max_steps or until(engine) is true.
+
+        Unlike a step_once() loop, the chosen transition's guards are not
+        re-evaluated before firing: they were just checked on the same head
+        tokens while computing the enabled set.
+        """
+        stats = RunStats()
+        firings = stats.firings
+        started = time.perf_counter()
+        while True:
+            if self.pending_ops_by_id:
+                self.expire_pending()
+            if self.blocks_on_pending and self.pending_ops_by_id:
+                stats.stop_reason = "pending"
+                stats.pending = next(iter(self.pending_ops_by_id.values()), None)
+                break
+            if max_steps is not None and stats.steps >= max_steps:
+                stats.stop_reason = "max_steps"
+                break
+            if until is not None and until(self):
+                stats.stop_reason = "until"
+                break
+            if self.step_semantics == STEP_CONCURRENT:
+                limit = None if max_steps is None else max_steps - stats.steps
+                results = self.step_concurrent(limit=limit)
+            else:
+                tid = self._select_transition()
+                results = [] if tid is None else [self._fire(tid)]
+            if not results:
+                stats.stop_reason = "quiescent"
+                break
+            for result in results:
+                tid = result.transition_id if isinstance(result, PendingOp) else result
+                stats.steps += 1
+                firings[tid] = firings.get(tid, 0) + 1
+                if isinstance(result, PendingOp) and not result.completed:
+                    stats.stop_reason = "pending"
+                    stats.pending = result
+            if stats.pending is not None:
+                break
+        stats.wall_time = time.perf_counter() - started
+        return stats
+
+    def _select_transition(self) -> Optional[str]:
+        if self.blocks_on_pending and self.pending_ops_by_id:
+            return None
+        # The incremental mode feeds the scheduler as transitions change state;
+        # scan mode hands it the freshly scanned enabled set.
+        if self.scheduler_mode == SCHEDULER_INCREMENTAL:
+            self._update_enabled()
+        else:
+            self.scheduler.sync(self.enabled_transitions())
+        return self.scheduler.choose()
+
+    def step_concurrent(self, limit: Optional[int] = None) -> List[Union[str, PendingOp]]:
+        """Fire a maximal set of enabled transitions whose input places are pairwise disjoint.
+
+        Tokens are consumed up front, expressions run concurrently on a bounded
+        thread pool, and outputs (or pending ops) are committed in selection
+        order under the pending-op lock once every expression has returned.
+        """
+        if self.blocks_on_pending and self.pending_ops_by_id:
+            return [next(iter(self.pending_ops_by_id.values()))]
+        selected = self._select_conflict_free(limit)
+        if not selected:
+            return []
+        journal = self.journal
+        if journal is None:
+            return self._fire_batch(selected)
+        opened = journal.begin(selected)
+        try:
+            return self._fire_batch(selected)
+        finally:
+            journal.end(opened)
+
+    def _fire_batch(self, selected: List[str]) -> List[Union[str, PendingOp]]:
+        compiled = self.compiled
+        for tid in selected:
+            self.scheduler.fired(tid)
+            if self.profiler is not None:
+                self.profiler.fired(tid)
+        tracer = self.tracer
+        if tracer is None:
+            batch = [(tid, self._consume_inputs(tid), compiled.outputs_of(tid)) for tid in selected]
+        else:
+            spans = []
+            batch = []
+            for tid in selected:
+                span = tracer.start_firing(tid)
+                batch.append((tid, self._consume_inputs(tid), compiled.outputs_of(tid)))
+                tracer.suspend(span)
+                spans.append(span)
+
+        def evaluate(item: Tuple[str, List[object], List[str]]) -> Tuple[Optional[PendingOp], Optional[AsyncResult]]:
+            tid, moved_tokens, output_places = item
+            transition = self.net.transitions.get(tid)
+            if transition and transition.inscriptions:
+                return self._evaluate_expressions(transition.inscriptions, moved_tokens, tid, output_places)
+            return None, None
+
+        if len(batch) > 1:
+            outcomes = list(self._pool().map(evaluate, batch))
+        else:
+            outcomes = [evaluate(batch[0])]
+
+        results: List[Union[str, PendingOp]] = []
+        with self._pending_lock:
+            for i, ((tid, moved_tokens, output_places), (pending, source)) in enumerate(zip(batch, outcomes)):
+                if tracer is not None:
+                    tracer.resume(spans[i])
+                committed = self._commit_pending(pending, source)
+                if committed is None:
+                    for pid in output_places:
+                        self._produce(pid, moved_tokens or [{"from": tid}])
+                results.append(tid if committed is None else committed)
+                if tracer is not None:
+                    self._finish_firing_span(spans[i], results[-1])
+        return results
+
+    def close(self) -> None:
+        """Shut down the worker pool used by concurrent steps."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pnml-fire")
+        return self._executor
+
+    def _select_conflict_free(self, limit: Optional[int] = None) -> List[str]:
+        enabled = self.enabled_transitions()
+        compiled = self.compiled
+        touches_initial, index = compiled.touches_initial, compiled.transition_index
+        # Same preference as _select_transition decides who wins a shared input place.
+        ordered = [tid for tid in enabled if not touches_initial[index[tid]]]
+        ordered += [tid for tid in enabled if touches_initial[index[tid]]]
+        taken: Set[str] = set()
+        selected: List[str] = []
+        for tid in ordered:
+            if limit is not None and len(selected) >= limit:
+                break
+            in_places = compiled.inputs_of(tid)
+            if taken.isdisjoint(in_places):
+                selected.append(tid)
+                taken.update(in_places)
+        return selected
+
+    def _consume_inputs(self, tid: str) -> List[object]:
+        join_places = self._join_places
+        join = self._joins.get(tid) if self._joins else None
+        if join is not None:
+            found = self._join_match(tid, join, reuse=True)
+            if found is None:
+                return []
+            value, matched = found
+            for pid in self.compiled.inputs_of(tid):
+                queue = self.marking[pid]
+                position, token = join.locate(pid, value)
+                if self.profiler is not None:
+                    self.profiler.consumed(pid, position, len(queue))
+                if self.tracer is not None:
+                    self.tracer.consumed(pid, position, len(queue))
+                del queue[position]
+                if self.journal is not None:
+                    self.journal.consumed(pid, position)
+                for index in join_places.get(pid, ()):
+                    index.discard(self.marking, pid, position, token)
+            return matched
         moved_tokens: List[object] = []
-        for pid in inputs.get(tid, []):
+        for pid in self.compiled.inputs_of(tid):
             if self.marking.get(pid):
-                moved_tokens.append(self.marking[pid].pop(0))
-        output_places = outputs.get(tid, [])
+                if self.profiler is not None:
+                    self.profiler.consumed(pid, 0, len(self.marking[pid]))
+                if self.tracer is not None:
+                    self.tracer.consumed(pid, 0, len(self.marking[pid]))
+                token = self.marking.consume(pid)
+                if self.journal is not None:
+                    self.journal.consumed(pid, 0)
+                moved_tokens.append(token)
+                for index in join_places.get(pid, ()):
+                    index.discard(self.marking, pid, 0, token)
+        return moved_tokens
+
+    def _join_match(
+        self, tid: str, join: JoinIndex, reuse: bool = False
+    ) -> Optional[Tuple[Hashable, List[object]]]:
+        """Oldest token tuple sharing one join-key value across tid's inputs whose guards pass.
+
+        Returns the key with the tokens. While the index is unchanged, reuse
+        (or memoize_guards) returns the last match without running guards again,
+        so firing consumes the match found while computing the enabled set.
+        """
+        join.sync(self.marking)
+        cached = self._join_cache.get(tid)
+        if cached is not None and cached[0] == join.version and (reuse or self.memoize_guards):
+            return cached[1]
+        if self.tracer is not None:
+            self.tracer.guarding(tid, None)
+        transition = self.net.transitions.get(tid)
+        inscriptions = transition.inscriptions if transition else []
+        if not any(ins.kind == "guard" for ins in inscriptions):
+            found = join.find()
+        else:
+            def accept(tokens: List[object]) -> bool:
+                try:
+                    return self._evaluate_guards(inscriptions, tokens)
+                except Exception:
+                    return False
+
+            found = join.find(accept)
+        self._join_cache[tid] = (join.version, found)
+        return found
+
+    def _produce(self, pid: str, tokens: List[object]) -> None:
+        self.marking.produce(pid, tokens)
+        if self.journal is not None:
+            self.journal.produced(pid, tokens)
+        if self.profiler is not None:
+            self.profiler.produced(pid, len(tokens), len(self.marking[pid]))
+        if self.tracer is not None:
+            self.tracer.produced(pid, len(tokens), len(self.marking[pid]))
+
+    def _fire(self, tid: str) -> Union[str, PendingOp]:
+        self.scheduler.fired(tid)
+        if self.profiler is not None:
+            self.profiler.fired(tid)
+        tracer = self.tracer
+        if tracer is None:
+            return self._fire_journaled(tid)
+        span = tracer.start_firing(tid)
+        result: Union[str, PendingOp, None] = None
+        try:
+            result = self._fire_journaled(tid)
+            return result
+        finally:
+            self._finish_firing_span(span, result)
+
+    def _fire_journaled(self, tid: str) -> Union[str, PendingOp]:
+        journal = self.journal
+        if journal is None:
+            return self._fire_transition(tid)
+        opened = journal.begin((tid,))
+        try:
+            return self._fire_transition(tid)
+        finally:
+            journal.end(opened)
+
+    def _finish_firing_span(self, span: Span, result: Union[str, PendingOp, None]) -> None:
+        if result is None:
+            span.error = "firing raised"
+        elif isinstance(result, PendingOp):
+            span.attributes["pnml.op.id"] = result.id
+            span.attributes["pnml.op.type"] = result.operation_type
+            if result.error:
+                span.error = result.error.strip().splitlines()[-1]
+        self.tracer.finish(span)  # type: ignore[union-attr]
+
+    def _fire_transition(self, tid: str) -> Union[str, PendingOp]:
+        transition = self.net.transitions.get(tid)
+
+        # Now actually pop tokens to move
+        moved_tokens = self._consume_inputs(tid)
+        output_places = self.compiled.outputs_of(tid)
 
         if transition and transition.inscriptions:
             pending = self._execute_expressions(transition.inscriptions, moved_tokens, tid, output_places)
             if pending is not None:
-                if not pending.completed:
-                    self._register_pending_op(pending)
                 return pending
 
         for pid in output_places:
-            self.marking.setdefault(pid, []).extend(moved_tokens or [{"from": tid}])
+            self._produce(pid, moved_tokens or [{"from": tid}])
         return tid
 
+    def _check_guards(
+        self,
+        tid: str,
+        inscriptions: List[Inscription],
+        in_places: List[str],
+        tokens: List[object],
+    ) -> bool:
+        """Evaluate tid's guards, reusing the last result while the guard token is unchanged.
+
+        Guards only see the head token of the first input place, so with
+        memoize_guards the result is cached against that place's head version.
+        Guards that read other state need refresh_enabled() when it changes;
+        tokens mutated in place are not detected.
+        """
+        if self.tracer is not None and in_places:
+            # Guard spans hang off the span that produced the token the guard sees.
+            queued = len(self.marking.get(in_places[0]) or ())
+            self.tracer.guarding(tid, self.tracer.head_producer(in_places[0], queued))
+        if not self.memoize_guards or not in_places:
+            return self._evaluate_guards(inscriptions, tokens)
+        version = self.marking.head_version(in_places[0])
+        cached = self._guard_cache.get(tid)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = self._evaluate_guards(inscriptions, tokens)
+        self._guard_cache[tid] = (version, result)
+        return result
+
     def _evaluate_guards(self, inscriptions: List[Inscription], tokens: List[object]) -> bool:
         token = tokens[0] if tokens else None
         for ins in inscriptions:
@@ -131,13 +669,34 @@ class PNMLEngine:
             func = self._resolve_inscription(ins)
             if not func:
                 continue
-            result = self._call_inscription(func, token)
+            if self.profiler is None and self.tracer is None:
+                result = self._adapter(ins, func)(token)
+            else:
+                result = self._observed_guard(ins, func, token)
             if result is None:
                 result = True
             if not bool(result):
                 return False
         return True
 
+    def _observed_guard(self, ins: Inscription, func: Callable[..., object], token: Optional[object]) -> object:
+        """Run a guard while profiling or tracing, recording its time (and span)."""
+        key = ins.registry_key or ins.id or ""
+        started = time.perf_counter_ns()
+        try:
+            result = self._adapter(ins, func)(token)
+        except Exception as exc:
+            self._record_guard(key, time.perf_counter_ns() - started, None, repr(exc))
+            raise
+        self._record_guard(key, time.perf_counter_ns() - started, result is None or bool(result), None)
+        return result
+
+    def _record_guard(self, key: str, elapsed_ns: int, passed: Optional[bool], error: Optional[str]) -> None:
+        if self.profiler is not None:
+            self.profiler.guard(key, elapsed_ns)
+        if self.tracer is not None:
+            self.tracer.guard(key, elapsed_ns, passed, error)
+
     def _execute_expressions(
         self,
         inscriptions: List[Inscription],
@@ -145,6 +704,21 @@ class PNMLEngine:
         transition_id: str,
         output_places: List[str],
     ) -> Optional[PendingOp]:
+        pending, source = self._evaluate_expressions(inscriptions, tokens, transition_id, output_places)
+        return self._commit_pending(pending, source)
+
+    def _evaluate_expressions(
+        self,
+        inscriptions: List[Inscription],
+        tokens: List[object],
+        transition_id: str,
+        output_places: List[str],
+    ) -> Tuple[Optional[PendingOp], Optional[object]]:
+        """Run expression inscriptions without touching the marking or the pending-op table.
+
+        Returns the PendingOp describing the outcome (if any) and, for AsyncResult
+        or awaitable results, the object to subscribe to once the op is committed.
+        """
         for ins in inscriptions:
             if ins.kind != "expression":
                 continue
@@ -153,13 +727,17 @@ class PNMLEngine:
                 continue
             arg = tokens[0] if tokens else None
             exec_mode = (ins.exec_mode or "sync").lower()
+            profiler = self.profiler
+            started = time.perf_counter_ns() if profiler is not None else 0
             try:
-                result = self._call_inscription(func, arg)
+                result = self._adapter(ins, func)(arg)
             except Exception as e:
+                if profiler is not None:
+                    profiler.expression(ins.registry_key or ins.id or "", time.perf_counter_ns() - started)
                 import traceback as _tb
                 tb = _tb.format_exc()
                 pending = PendingOp(
-                    id=int(time.time() * 1000) % 1_000_000_000,
+                    id=self._next_op_id(),
                     transition_id=transition_id,
                     inscription_id=ins.id,
                     transition_name=transition_id,
@@ -174,13 +752,25 @@ class PNMLEngine:
                     completed=True,
                     error=tb,
                 )
-                # Finalize by placing an error token in outputs and continue
-                self._finalize_async(pending)
-                return pending
+                # Committing places an error token in outputs and continues
+                return pending, None
+            if profiler is not None:
+                profiler.expression(ins.registry_key or ins.id or "", time.perf_counter_ns() - started)
             if exec_mode == "async":
+                if inspect.isawaitable(result):
+                    pending = self._build_pending_op(
+                        op_id=self._next_op_id(),
+                        transition_id=transition_id,
+                        inscription_id=ins.id,
+                        operation_type="coroutine",
+                        resume_token=None,
+                        output_places=output_places,
+                        moved_tokens=tokens,
+                    )
+                    return pending, result
                 if isinstance(result, AsyncResult):
                     pending = self._build_pending_op(
-                        op_id=result.id,
+                        op_id=self._next_op_id(result.id),
                         transition_id=transition_id,
                         inscription_id=ins.id,
                         operation_type="async_result",
@@ -188,13 +778,11 @@ class PNMLEngine:
                         output_places=output_places,
                         moved_tokens=tokens,
                     )
-                    self._register_pending_op(pending)
-                    result.add_done_callback(lambda res: self.submit_async(pending.id, None, res.result(), res.error()))
-                    return pending
+                    return pending, result
                 if isinstance(result, AsyncOpRequest):
                     resume_token = result.resume_token or self._generate_resume_token()
                     pending = self._build_pending_op(
-                        op_id=int(time.time() * 1000) % 1_000_000_000,
+                        op_id=self._next_op_id(),
                         transition_id=transition_id,
                         inscription_id=ins.id,
                         operation_type=result.operation_type,
@@ -207,10 +795,9 @@ class PNMLEngine:
                         },
                         ui_state=result.ui_state,
                     )
-                    self._register_pending_op(pending)
-                    return pending
+                    return pending, None
                 pending = PendingOp(
-                    id=int(time.time() * 1000) % 1_000_000_000,
+                    id=self._next_op_id(),
                     transition_id=transition_id,
                     inscription_id=ins.id,
                     transition_name=transition_id,
@@ -224,9 +811,44 @@ class PNMLEngine:
                     result=result,
                     completed=True,
                 )
-                self._finalize_async(pending)
-                return pending
-        return None
+                return pending, None
+        return None, None
+
+    def _commit_pending(self, pending: Optional[PendingOp], source: Optional[object]) -> Optional[PendingOp]:
+        if pending is None:
+            return None
+        if pending.completed:
+            self._finalize_async(pending)
+            return pending
+        self._register_pending_op(pending)
+        if isinstance(source, AsyncResult):
+            done = self._completion_target(pending)
+            source.add_done_callback(lambda res: done(res.result(), res.error()))
+        elif source is not None:
+            self._schedule_awaitable(pending, source)
+        return pending
+
+    def _completion_target(self, pending: PendingOp) -> Callable[[Optional[object], Optional[str]], None]:
+        """Return the callback that delivers (result, error) for pending once it finishes."""
+        return lambda result, error: self.submit_async(pending.id, None, result, error)
+
+    def _schedule_awaitable(self, pending: PendingOp, awaitable: object) -> None:
+        # Without an event loop of our own, drive the awaitable on a worker thread
+        # the same way async_ops.run_async does for plain callables.
+        done = self._completion_target(pending)
+
+        async def _await() -> object:
+            return await awaitable  # type: ignore[misc]
+
+        def _runner() -> None:
+            try:
+                value = asyncio.run(_await())
+            except Exception as exc:
+                done(None, str(exc))
+                return
+            done(value, None)
+
+        threading.Thread(target=_runner, daemon=True).start()
 
     def submit_async(
         self,
@@ -243,11 +865,50 @@ class PNMLEngine:
                 pending = self.pending_ops_by_token.get(resume_token)
             if pending is None:
                 return
-            pending.result = result
-            pending.error = error
-            pending.completed = True
+            self._complete_pending(pending, result, error)
+
+    def _complete_pending(self, pending: PendingOp, result: Optional[object], error: Optional[str]) -> None:
+        journal = self.journal
+        if journal is None:
+            self._deliver_pending(pending, result, error)
+            return
+        opened = journal.begin()
+        try:
+            self._deliver_pending(pending, result, error)
+            journal.completed(pending.id)
+        finally:
+            journal.end(opened)
+
+    def _deliver_pending(self, pending: PendingOp, result: Optional[object], error: Optional[str]) -> None:
+        if self.profiler is not None:
+            self.profiler.op_finished(pending.id, pending.transition_id)
+        span = self.tracer.op_delivering(pending.id, error) if self.tracer is not None else None
+        pending.result = result
+        pending.error = error
+        pending.completed = True
+        try:
             self._finalize_async(pending)
-            self._unregister_pending_op(pending)
+        finally:
+            if span is not None:
+                self.tracer.finish(span)  # type: ignore[union-attr]
+        self._unregister_pending_op(pending)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest time.monotonic() deadline of a pending op with timeout_ms, or None.
+
+        Hosts waiting for completions can sleep until this instead of polling,
+        then call expire_pending().
+        """
+        with self._pending_lock:
+            return self.pending_ops.next_deadline()
+
+    def expire_pending(self, now: Optional[float] = None) -> List[PendingOp]:
+        """Complete ops past their deadline with an error token; late results are then ignored."""
+        with self._pending_lock:
+            expired = self.pending_ops.pop_expired(now)
+            for pending in expired:
+                self._complete_pending(pending, None, f"timeout: no result within {op_timeout_ms(pending)} ms")
+        return expired
 
     def _finalize_async(self, pending: PendingOp) -> None:
         # When an async completes, include both the result (or error) and
@@ -266,7 +927,7 @@ class PNMLEngine:
         if not tokens:
             tokens = [{"from": pending.transition_id}]
         for pid in pending.output_places:
-            self.marking.setdefault(pid, []).extend(tokens)
+            self._produce(pid, tokens)
 
     def _build_pending_op(
         self,
@@ -297,9 +958,13 @@ class PNMLEngine:
         )
 
     def _register_pending_op(self, pending: PendingOp) -> None:
-        self.pending_ops_by_id[pending.id] = pending
-        if pending.resume_token:
-            self.pending_ops_by_token[pending.resume_token] = pending
+        self.pending_ops.add(pending)
+        if self.journal is not None:
+            self.journal.registered(pending)
+        if self.profiler is not None:
+            self.profiler.op_started(pending.id)
+        if self.tracer is not None:
+            self.tracer.op_registered(pending.id, pending.transition_id, pending.operation_type, pending.resume_token)
         try:
             from . import vscode_bridge
             vscode_bridge.emit_async_operation_started(pending)
@@ -307,12 +972,17 @@ class PNMLEngine:
             pass
 
     def _unregister_pending_op(self, pending: PendingOp) -> None:
-        self.pending_ops_by_id.pop(pending.id, None)
-        if pending.resume_token:
-            self.pending_ops_by_token.pop(pending.resume_token, None)
+        self.pending_ops.remove(pending)
+
+    def _next_op_id(self, preferred: Optional[int] = None) -> int:
+        op_id = next_op_id() if preferred is None else preferred
+        # AsyncResult ids are chosen by callers and may already be in use.
+        while op_id in self.pending_ops_by_id:
+            op_id = next_op_id()
+        return op_id
 
     def _generate_resume_token(self) -> str:
-        return f"evo_async_{int(time.time() * 1000)}"
+        return f"evo_async_{int(time.time() * 1000)}_{next_op_id()}"
 
     def _resolve_inscription(self, ins: Inscription) -> Optional[Callable[..., object]]:
         # If a function was already attached, use it
@@ -327,62 +997,106 @@ class PNMLEngine:
         # If inline python code is provided, compile it into a callable
         if getattr(ins, "code", None) and getattr(ins, "source", None) == "inline" and (ins.language is None or ins.language.lower() == "python"):
             try:
-                code_lines = ins.code.splitlines()
-                func_src = "def _fn(token=None):\n"
-                if ins.kind == "guard" and not any("return" in line for line in code_lines):
-                    # Treat guard code as an expression if no explicit return is provided.
-                    func_src += "    return " + ins.code.strip() + "\n"
-                else:
-                    for line in code_lines:
-                        func_src += "    " + line + "\n"
-                exec_globals: dict = {}
-                exec(func_src, exec_globals)
-                ins.func = exec_globals.get("_fn")
+                ins.func = compile_inscription(ins.kind, ins.code, ins.language)
                 return ins.func
             except Exception:
                 # Fall through to unresolved if compilation fails
                 pass
         return ins.func
 
-    def _call_inscription(self, func: Callable[..., object], token: Optional[object]) -> object:
-        try:
-            return func() if token is None else func(token)
-        except TypeError:
-            return func()
+    def _adapter(self, ins: Inscription, func: Callable[..., object]) -> InscriptionAdapter:
+        adapter = ins.adapter
+        if adapter is None or adapter.func is not func:  # type: ignore[attr-defined]
+            adapter = ins.adapter = adapt_inscription(func)
+        return adapter  # type: ignore[return-value]
+
+    def start_profiling(self) -> EngineProfiler:
+        """Start recording guard/expression times, token waits, firings and pending-op latency.
+
+        Timings go into log-bucket histograms read through metrics(). Restarting
+        discards what was recorded so far.
+        """
+        self.profiler = EngineProfiler()
+        return self.profiler
+
+    def start_tracing(self, path: str, batch_size: int = 512, flush_interval: float = 0.2) -> SpanTracer:
+        """Export a span per firing, guard evaluation and async op to path as OTLP-JSON lines.
+
+        The trace id is derived from run_id (kept as the pnml.run.id resource
+        attribute); a firing's parent is the span that produced the token it
+        consumed. Spans are written in batches by a background thread.
+        """
+        self.stop_tracing()
+        exporter = SpanExporter(
+            path,
+            trace_id_for(self.run_id),
+            {"service.name": "evolve-pnml", "pnml.net.id": self.net.id or "", "pnml.run.id": self.run_id},
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+        self.tracer = SpanTracer(self.run_id, exporter)
+        return self.tracer
+
+    def stop_tracing(self, timeout: Optional[float] = None) -> None:
+        """Flush queued spans and stop the exporter thread; open async ops are closed as spans."""
+        tracer, self.tracer = self.tracer, None
+        if tracer is not None:
+            tracer.close(timeout)
+
+    def stop_profiling(self) -> Optional[EngineProfiler]:
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def metrics(self) -> Dict[str, object]:
+        """JSON-serializable profile of this engine; histogram values are in seconds.
+
+        Always includes inscription_metrics() under "inscriptions"; the
+        histogram sections are only present while profiling.
+        """
+        data: Dict[str, object] = {"run_id": self.run_id, "profiling": self.profiler is not None}
+        if self.profiler is not None:
+            data.update(self.profiler.to_dict())
+        data["inscriptions"] = self.inscription_metrics()
+        return data
+
+    def export_metrics(self, path: str) -> Dict[str, object]:
+        """Write metrics() to path as JSON and return it."""
+        data = self.metrics()
+        write_json(data, path)
+        return data
+
+    def inscription_metrics(self) -> Dict[str, Dict[str, object]]:
+        """Per-inscription call counts and timings, keyed by registry key (or inscription id)."""
+        metrics: Dict[str, Dict[str, object]] = {}
+        owners = list(self.net.transitions.values()) + list(self.net.arcs)
+        for owner in owners:
+            for ins in owner.inscriptions:
+                if isinstance(ins.adapter, InscriptionAdapter):
+                    metrics[ins.registry_key or ins.id or ""] = ins.adapter.stats()
+        return metrics
 
     def _build_io_maps(self) -> tuple[Dict[str, List[str]], Dict[str, List[str]]]:
-        inputs: Dict[str, List[str]] = {}
-        outputs: Dict[str, List[str]] = {}
-        place_ids = set(self.net.places.keys())
-        transition_ids = set(self.net.transitions.keys())
-        for arc in self.net.arcs:
-            if not arc.source or not arc.target:
-                continue
-            if arc.source in place_ids and arc.target in transition_ids:
-                inputs.setdefault(arc.target, []).append(arc.source)
-            elif arc.source in transition_ids and arc.target in place_ids:
-                outputs.setdefault(arc.source, []).append(arc.target)
+        # Kept for callers of the old API. Copies, since the compiled net's maps
+        # are shared by every engine and scheduler on the net.
+        compiled = self.compiled
+        inputs = {tid: list(pids) for tid, pids in compiled.input_ids.items()}
+        outputs = {tid: list(pids) for tid, pids in compiled.output_ids.items()}
         return inputs, outputs
 
 
 def _run_cli() -> None:
     import sys
+    from .vector_engine import create_engine
     path = sys.argv[1] if len(sys.argv) > 1 else None
     if not path:
         print("Missing PNML YAML path.")
         return
     text = open(path, "r", encoding="utf-8").read()
     net, _ = parse_pnml(text)
-    engine = PNMLEngine(net)
-    while True:
-        result = engine.step_once()
-        if result is None:
-            break
-        if isinstance(result, PendingOp) and not result.completed:
-            print(f"Paused for async operation: {result.id}")
-            break
-        if not engine.enabled_transitions():
-            break
+    engine = create_engine(net)
+    stats = engine.run()
+    if stats.pending is not None:
+        print(f"Paused for async operation: {stats.pending.id}")
     print("Final marking:", engine.marking)
 
 
@@ -391,13 +1105,13 @@ if __name__ == "__main__":
 
 
 class DebugEngine:
-    def __init__(self) -> None:
+    def __init__(self, history_retention: Optional[int] = None, history_spill_path: Optional[str] = None) -> None:
         self.net: Optional[PNMLNet] = None
         self.place_index: List[PlaceIndex] = []
         self.place_line_map: Dict[str, int] = {}
         self.engine: Optional[PNMLEngine] = None
         self.breakpoints: Set[str] = set()
-        self.history: List[HistoryEntry] = []
+        self.history = HistoryStore(history_retention, history_spill_path)
         self.step_counter: int = 0
 
     def load(self, text: str) -> None:
@@ -408,9 +1122,29 @@ class DebugEngine:
         else:
             self.engine = None
         self.breakpoints = set()
-        self.history = []
+        self.history.clear()
         self.step_counter = 0
 
+    def replay_journal(self, path: str) -> int:
+        """Rebuild a recorded run from a firing journal; each firing becomes a history entry."""
+        if self.net is None:
+            return 0
+        engine = PNMLEngine(self.net)
+
+        def record_history(record: object) -> None:
+            for tid in record.transitions:  # type: ignore[attr-defined]
+                self.step_counter += 1
+                self.history.append(HistoryEntry(
+                    step=self.step_counter,
+                    transition_id=tid,
+                    line=None,
+                    produced_places=self._produced_places(tid),
+                ))
+
+        count = replay_into(engine, path, record_history)
+        self.engine = engine
+        return count
+
     def set_breakpoints_by_lines(self, lines: List[int]) -> List[int]:
         self.breakpoints = set()
         for line in lines:
@@ -513,10 +1247,4 @@ class DebugEngine:
     def _produced_places(self, transition_id: str) -> List[str]:
         if not self.net:
             return []
-        outputs: List[str] = []
-        place_ids = set(self.net.places.keys())
-        transition_ids = set(self.net.transitions.keys())
-        for arc in self.net.arcs:
-            if arc.source in transition_ids and arc.target in place_ids and arc.source == transition_id:
-                outputs.append(arc.target)
-        return outputs
+        return list(compile_net(self.net).outputs_of(transition_id))
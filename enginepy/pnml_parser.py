@@ -32,12 +32,18 @@ class Inscription:
     owner_id: Optional[str] = None
     registry_key: Optional[str] = None
     func: Optional[Callable[..., object]] = None
+    # InscriptionAdapter for func, built by the engine on first call.
+    adapter: Optional[object] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
 class Transition:
     id: str
     inscriptions: List[Inscription] = field(default_factory=list)
+    # evolve.joinKey: input tokens are matched on this correlation field.
+    join_key: Optional[str] = None
+    # evolve.priority: higher fires first under the "priority" scheduler.
+    priority: int = 0
 
 
 @dataclass
@@ -54,6 +60,8 @@ class PNMLNet:
     places: Dict[str, Place] = field(default_factory=dict)
     transitions: Dict[str, Transition] = field(default_factory=dict)
     arcs: List[Arc] = field(default_factory=list)
+    # Cached topology built by compiled_net.compile_net; reset when the net changes.
+    compiled: Optional[object] = field(default=None, init=False, repr=False, compare=False)
 
 
 _KEY_RE = re.compile(r"^([A-Za-z0-9_]+)\s*:\s*(.*)$")
@@ -191,6 +199,19 @@ def parse_pnml(text: str) -> Tuple[PNMLNet, List[PlaceIndex]]:
                             current_inscription.code = _parse_scalar(value)
                         _sync_inscription_owner(net, current_inscription, current_net_id, current_transition_id, current_arc, current_inscription_owner)
                 
+                if key == "joinKey" and _active_section(stack) == "transition" and current_transition_id and stack and stack[-1][0] == "evolve":
+                    current_transition = net.transitions.get(current_transition_id)
+                    if current_transition is not None:
+                        current_transition.join_key = str(_parse_scalar(value))
+
+                if key == "priority" and _active_section(stack) == "transition" and current_transition_id and stack and stack[-1][0] == "evolve":
+                    current_transition = net.transitions.get(current_transition_id)
+                    if current_transition is not None:
+                        try:
+                            current_transition.priority = int(_parse_scalar(value))  # type: ignore[arg-type]
+                        except (TypeError, ValueError):
+                            current_transition.priority = 0
+
                 if _active_section(stack) == "arc" and current_arc:
                     if key == "source":
                         current_arc.source = value.strip()
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import List, Tuple
 
-from .pnml_parser import parse_pnml
+from .analysis import invariants
+from .pnml_parser import PNMLNet, parse_pnml
+
+
+# Bounds for the siphon analysis run by validate(): the incidence matrix is
+# places x transitions, so larger nets only get the O(arcs) precheck.
+_ANALYZE_MAX_CELLS = 250_000
+_ANALYZE_MAX_ROWS = 200
+_ANALYZE_MAX_SETS = 2_000
 
 
 class PNMLValidationError(ValueError):
@@ -93,4 +101,40 @@ def validate(text: str) -> Tuple[bool, str]:
         return False, "no places found"
     if not net.transitions:
         return False, "no transitions found"
+    return _structural_check(net)
+
+
+def _structural_check(net: PNMLNet) -> Tuple[bool, str]:
+    # Cheap pre-check on the incidence structure, then a bounded siphon
+    # analysis for nets small enough to build the incidence matrix. Nets
+    # without arcs are skeletons still being filled in.
+    if not net.arcs:
+        return True, "ok"
+    can_fire, hints = invariants.precheck(net)
+    if not can_fire:
+        return False, "no transition can ever fire: " + "; ".join(hints)
+    hints.extend(_siphon_hints(net))
+    if hints:
+        return True, "ok (" + "; ".join(hints) + ")"
     return True, "ok"
+
+
+def _siphon_hints(net: PNMLNet) -> List[str]:
+    # Without initial tokens every siphon is unmarked; precheck already says so.
+    if invariants.np is None or not any(place.tokens for place in net.places.values()):
+        return []
+    if len(net.places) * len(net.transitions) > _ANALYZE_MAX_CELLS:
+        return []
+    report = invariants.analyze(net, max_rows=_ANALYZE_MAX_ROWS, max_sets=_ANALYZE_MAX_SETS)
+    # A lone place nothing produces into is a source place, which precheck reports.
+    produced = {arc.target for arc in net.arcs}
+    empty = [s for s in report.unmarked_siphons if len(s) > 1 or s[0] in produced]
+    if not empty:
+        return []
+    places = {pid for siphon in empty for pid in siphon}
+    dead = sorted({arc.target for arc in net.arcs if arc.source in places and arc.target in net.transitions})
+    return [
+        "initially unmarked siphons never gain tokens: "
+        + "; ".join("{" + ", ".join(siphon) + "}" for siphon in empty)
+        + f" (never fire: {', '.join(dead)})"
+    ]
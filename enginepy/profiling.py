@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import json
+import threading
+import time
+
+# Values below 2**(SUB_BITS + 1) get a bucket each; above that every power of
+# two is split into 2**SUB_BITS buckets, so a bucket is at most 1/16 (6.25%) wide.
+SUB_BITS = 4
+_SUB = 1 << SUB_BITS
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def bucket_index(value: int) -> int:
+    if value < 2 * _SUB:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BITS - 1
+    return shift * _SUB + (value >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Inclusive [lower, upper] of the values that land in bucket index."""
+    shift = max(0, index // _SUB - 1)
+    mantissa = index - shift * _SUB
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LogHistogram:
+    """HDR-style log-linear histogram of non-negative integer values (nanoseconds here).
+
+    Recording is O(1) into a sparse bucket dict; count, sum, min and max are
+    exact and percentiles are exact to the bucket width.
+    """
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: int) -> None:
+        value = max(int(value), 0)
+        index = bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LogHistogram") -> None:
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th percentile, clamped to the observed max."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max or 0)
+        return self.max or 0
+
+    def to_dict(self) -> Dict[str, object]:
+        """Summary in seconds plus the non-empty buckets as [lower_s, upper_s, count]."""
+        data: Dict[str, object] = {
+            "count": self.count,
+            "total": self.total / 1e9,
+            "mean": self.total / self.count / 1e9 if self.count else 0.0,
+            "min": (self.min or 0) / 1e9,
+            "max": (self.max or 0) / 1e9,
+        }
+        for q in PERCENTILES:
+            data[f"p{q:g}"] = self.percentile(q) / 1e9
+        data["buckets"] = [
+            [lower / 1e9, upper / 1e9, self.buckets[index]]
+            for index in sorted(self.buckets)
+            for lower, upper in (bucket_bounds(index),)
+        ]
+        return data
+
+
+class EngineProfiler:
+    """Opt-in engine instrumentation, see PNMLEngine.start_profiling().
+
+    Guard and expression times are keyed like inscription_metrics() (registry
+    key, else inscription id), token waits by place, pending-op latency by
+    transition. Token waits assume FIFO places: arrival times are kept per
+    place in token order and re-seeded to "now" when the marking was edited
+    behind the engine's back.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.guards: Dict[str, LogHistogram] = {}
+        self.expressions: Dict[str, LogHistogram] = {}
+        self.token_wait: Dict[str, LogHistogram] = {}
+        self.pending_ops: Dict[str, LogHistogram] = {}
+        self.firings: Dict[str, int] = {}
+        self._arrivals: Dict[str, Deque[int]] = {}
+        self._op_started: Dict[int, int] = {}
+        # Expressions of a concurrent step are timed on worker threads.
+        self._lock = threading.Lock()
+
+    def _record(self, table: Dict[str, LogHistogram], key: str, value: int) -> None:
+        with self._lock:
+            hist = table.get(key)
+            if hist is None:
+                hist = table[key] = LogHistogram()
+            hist.record(value)
+
+    def guard(self, key: str, elapsed_ns: int) -> None:
+        self._record(self.guards, key, elapsed_ns)
+
+    def expression(self, key: str, elapsed_ns: int) -> None:
+        self._record(self.expressions, key, elapsed_ns)
+
+    def fired(self, tid: str) -> None:
+        with self._lock:
+            self.firings[tid] = self.firings.get(tid, 0) + 1
+
+    def produced(self, pid: str, count: int, queued: int) -> None:
+        """count tokens were appended to pid, which now holds queued tokens."""
+        now = time.perf_counter_ns()
+        arrivals = self._arrivals_for(pid, queued - count, now)
+        arrivals.extend([now] * count)
+
+    def consumed(self, pid: str, position: int, queued: int) -> None:
+        """The token at position was taken from pid, which held queued tokens before."""
+        now = time.perf_counter_ns()
+        arrivals = self._arrivals_for(pid, queued, now)
+        arrived = arrivals[position]
+        del arrivals[position]
+        self._record(self.token_wait, pid, now - arrived)
+
+    def _arrivals_for(self, pid: str, expected: int, now: int) -> Deque[int]:
+        arrivals = self._arrivals.get(pid)
+        if arrivals is None or len(arrivals) != expected:
+            arrivals = self._arrivals[pid] = deque([now] * max(expected, 0))
+        return arrivals
+
+    def op_started(self, op_id: int) -> None:
+        self._op_started[op_id] = time.perf_counter_ns()
+
+    def op_finished(self, op_id: int, tid: str) -> None:
+        started = self._op_started.pop(op_id, None)
+        if started is not None:
+            self._record(self.pending_ops, tid, time.perf_counter_ns() - started)
+
+    def to_dict(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "started": self.started,
+                "firings": dict(self.firings),
+                "guards": _tables(self.guards),
+                "expressions": _tables(self.expressions),
+                "token_wait": _tables(self.token_wait),
+                "pending_ops": _tables(self.pending_ops),
+            }
+
+
+def _tables(table: Dict[str, LogHistogram]) -> Dict[str, Dict[str, object]]:
+    return {key: table[key].to_dict() for key in sorted(table)}
+
+
+def slowest(metrics: Dict[str, object], section: str = "expressions", limit: int = 10) -> List[tuple[str, float]]:
+    """(key, total seconds) of the costliest entries of a metrics() section."""
+    table = metrics.get(section) or {}
+    totals = [(key, float(hist["total"])) for key, hist in table.items()]  # type: ignore[union-attr,index]
+    return sorted(totals, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def write_json(metrics: Dict[str, object], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(metrics, handle, indent=2, sort_keys=True, default=str)
@@ -31,9 +31,21 @@ def generate_python_project(yaml_text: str, out_dir: str, source_name: str = "pn
     for name in (
         "pnml_engine.py",
         "pnml_parser.py",
+        "compiled_net.py",
+        "marking.py",
+        "join_index.py",
+        "compile_cache.py",
+        "vector_engine.py",
         "inscription_registry.py",
+        "inscription_adapter.py",
         "vscode_bridge.py",
         "async_ops.py",
+        "pending_ops.py",
+        "history_store.py",
+        "checkpoint.py",
+        "journal.py",
+        "scheduler.py",
+        "profiling.py",
         "pnml_generator.py",
         "pnml_validator.py",
         "ideation_spec.py",
@@ -53,6 +65,10 @@ def generate_python_project(yaml_text: str, out_dir: str, source_name: str = "pn
         "templates/registry.py",
         "trace/__init__.py",
         "trace/collector.py",
+        "trace/spans.py",
+        "analysis/__init__.py",
+        "analysis/reachability.py",
+        "analysis/invariants.py",
     ):
         src_path = os.path.join(engine_src_dir, name)
         dst_path = os.path.join(local_engine_dir, name)
@@ -111,31 +127,28 @@ def generate_python_project(yaml_text: str, out_dir: str, source_name: str = "pn
         f.write("if MODULE_DIR not in sys.path:\n")
         f.write("    sys.path.insert(0, MODULE_DIR)\n\n")
         f.write("import inscriptions  # noqa: F401\n")
-        f.write("from enginepy.pnml_engine import PNMLEngine, PendingOp\n")
+        f.write("from enginepy.vector_engine import create_engine\n")
         f.write("from enginepy import vscode_bridge\n")
         f.write("from enginepy.pnml_parser import parse_pnml\n\n")
         f.write("def run(path: str) -> None:\n")
         f.write("    text = open(path, 'r', encoding='utf-8').read()\n")
         f.write("    net, _ = parse_pnml(text)\n")
-        f.write("    engine = PNMLEngine(net)\n")
+        f.write("    engine = create_engine(net)\n")
         f.write("    while True:\n")
-        f.write("        result = engine.step_once()\n")
+        f.write("        result = engine.run().pending\n")
         f.write("        if result is None:\n")
         f.write("            break\n")
-        f.write("        if isinstance(result, PendingOp) and not result.completed:\n")
-        f.write("            token = result.resume_token or 'n/a'\n")
-        f.write("            print(f'Paused for async operation: {result.id} type={result.operation_type} token={token}')\n")
-        f.write("            if vscode_bridge.is_available():\n")
-        f.write("                timeout_ms = None\n")
-        f.write("                if result.metadata and isinstance(result.metadata, dict):\n")
-        f.write("                    timeout_ms = result.metadata.get('timeout_ms') or result.metadata.get('timeout')\n")
-        f.write("                payload = vscode_bridge.wait_for_async_submit(result.resume_token, timeout_ms)\n")
-        f.write("                if payload:\n")
-        f.write("                    engine.submit_async(resume_token=payload.get('resumeToken') or result.resume_token, result=payload.get('result'), error=payload.get('error'))\n")
-        f.write("                    continue\n")
-        f.write("            break\n")
-        f.write("        if not engine.enabled_transitions():\n")
-        f.write("            break\n")
+        f.write("        token = result.resume_token or 'n/a'\n")
+        f.write("        print(f'Paused for async operation: {result.id} type={result.operation_type} token={token}')\n")
+        f.write("        if vscode_bridge.is_available():\n")
+        f.write("            timeout_ms = None\n")
+        f.write("            if result.metadata and isinstance(result.metadata, dict):\n")
+        f.write("                timeout_ms = result.metadata.get('timeout_ms') or result.metadata.get('timeout')\n")
+        f.write("            payload = vscode_bridge.wait_for_async_submit(result.resume_token, timeout_ms)\n")
+        f.write("            if payload:\n")
+        f.write("                engine.submit_async(resume_token=payload.get('resumeToken') or result.resume_token, result=payload.get('result'), error=payload.get('error'))\n")
+        f.write("                continue\n")
+        f.write("        break\n")
         f.write("    print('Final marking:', engine.marking)\n\n")
         f.write("if __name__ == '__main__':\n")
         f.write("    if len(sys.argv) < 2:\n")
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Collection, Dict, KeysView, List, Optional, Tuple, Union
+import heapq
+import itertools
+import random
+
+from .compiled_net import CompiledNet, compile_net
+from .pnml_parser import PNMLNet
+
+POLICY_DEFAULT = "default"
+POLICY_FIFO = "fifo"
+POLICY_PRIORITY = "priority"
+POLICY_RANDOM = "random"
+POLICY_ROUND_ROBIN = "round_robin"
+
+
+class TransitionScheduler(ABC):
+    """Chooses which enabled transition fires next.
+
+    The engine keeps the scheduler's members equal to its enabled set through
+    add()/discard() (or sync() after a full re-scan), asks choose() for the
+    next transition and reports fired() once it fired. Implementations keep
+    choose() at O(log n) or better in the number of enabled transitions.
+    """
+
+    name = ""
+
+    def bind(self, net: PNMLNet) -> None:
+        """(Re)read topology-derived data; called on construction and after topology edits."""
+        self.clear()
+
+    @abstractmethod
+    def add(self, tid: str) -> None:
+        """Make tid a member; adding a member again is a no-op."""
+
+    @abstractmethod
+    def discard(self, tid: str) -> None:
+        """Remove tid if it is a member."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every member."""
+
+    @abstractmethod
+    def choose(self) -> Optional[str]:
+        """The member that fires next, or None when there is none."""
+
+    @abstractmethod
+    def members(self) -> KeysView[str]:
+        """Live view of the current members."""
+
+    def fired(self, tid: str) -> None:
+        pass
+
+    def sync(self, enabled: Collection[str]) -> bool:
+        """Make the members equal to enabled (distinct ids); return whether they changed.
+
+        The unchanged case, the common one for scan mode, allocates nothing.
+        """
+        members = self.members()
+        if len(enabled) == len(members) and all(tid in members for tid in enabled):
+            return False
+        wanted = enabled if isinstance(enabled, (set, frozenset)) else set(enabled)
+        for tid in [tid for tid in members if tid not in wanted]:
+            self.discard(tid)
+        for tid in sorted(tid for tid in wanted if tid not in members):
+            self.add(tid)
+        return True
+
+
+class HeapScheduler(TransitionScheduler):
+    """Min-heap of (key, tid) with lazy deletion; subclasses define key()."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[Tuple[object, ...], str]] = []
+        self._live: Dict[str, Tuple[object, ...]] = {}
+
+    @abstractmethod
+    def key(self, tid: str) -> Tuple[object, ...]:
+        """Heap key for tid as it is (re)queued; smaller keys fire first."""
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, tid: object) -> bool:
+        return tid in self._live
+
+    def members(self) -> KeysView[str]:
+        return self._live.keys()
+
+    def clear(self) -> None:
+        self._heap = []
+        self._live = {}
+
+    def add(self, tid: str) -> None:
+        if tid not in self._live:
+            self._push(tid)
+
+    def discard(self, tid: str) -> None:
+        if self._live.pop(tid, None) is not None and len(self._heap) > 2 * len(self._live) + 32:
+            live = self._live
+            self._heap = [entry for entry in self._heap if live.get(entry[1]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def choose(self) -> Optional[str]:
+        heap, live = self._heap, self._live
+        while heap:
+            key, tid = heap[0]
+            if live.get(tid) == key:
+                return tid
+            heapq.heappop(heap)
+        return None
+
+    def _push(self, tid: str) -> None:
+        key = self.key(tid)
+        self._live[tid] = key
+        heapq.heappush(self._heap, (key, tid))
+
+    def _requeue(self, tid: str) -> None:
+        if tid in self._live:
+            self._push(tid)
+
+
+class StaticPriorityScheduler(HeapScheduler):
+    """Highest evolve ``priority`` first, then the engine's historical preference.
+
+    Ties go to transitions that do not consume from initially marked places,
+    then to the earliest input arc in the net. With every priority at 0 this
+    is the engine's original choice (POLICY_DEFAULT).
+    """
+
+    def __init__(self, use_priority: bool = True) -> None:
+        super().__init__()
+        self.use_priority = use_priority
+        self.name = POLICY_PRIORITY if use_priority else POLICY_DEFAULT
+        self._keys: Dict[str, Tuple[int, bool, int]] = {}
+
+    def bind(self, net: PNMLNet) -> None:
+        super().bind(net)
+        compiled: CompiledNet = compile_net(net)
+        touches, index = compiled.touches_initial, compiled.transition_index
+        self._keys = {
+            tid: (
+                -(net.transitions[tid].priority if self.use_priority else 0),
+                touches[index[tid]],
+                rank,
+            )
+            for tid, rank in compiled.enable_rank.items()
+        }
+
+    def key(self, tid: str) -> Tuple[object, ...]:
+        return self._keys[tid]
+
+
+class FifoScheduler(HeapScheduler):
+    """Longest-enabled first; a transition that fires and stays enabled goes to the back."""
+
+    name = POLICY_FIFO
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._seq = itertools.count()
+
+    def key(self, tid: str) -> Tuple[object, ...]:
+        return (next(self._seq),)
+
+    def fired(self, tid: str) -> None:
+        self._requeue(tid)
+
+
+class RoundRobinScheduler(HeapScheduler):
+    """Serve enabled transitions in net order, each at most once per round.
+
+    Keys are (round, rank): firing moves a transition to the next round, and
+    a transition that becomes enabled joins the current round, so none of
+    them is passed over for more than one round.
+    """
+
+    name = POLICY_ROUND_ROBIN
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._round = 0
+        self._rounds: Dict[str, int] = {}
+        self._ranks: Dict[str, int] = {}
+
+    def bind(self, net: PNMLNet) -> None:
+        super().bind(net)
+        self._ranks = dict(compile_net(net).enable_rank)
+        self._round = 0
+        self._rounds = {}
+
+    def key(self, tid: str) -> Tuple[object, ...]:
+        round_ = max(self._rounds.get(tid, 0), self._round)
+        self._rounds[tid] = round_
+        return (round_, self._ranks[tid])
+
+    def fired(self, tid: str) -> None:
+        key = self._live.get(tid)
+        if key is None:
+            return
+        self._round = key[0]  # type: ignore[assignment]
+        self._rounds[tid] = self._round + 1
+        self._push(tid)
+
+
+class RandomScheduler(TransitionScheduler):
+    """Uniform choice among enabled transitions from a seeded random.Random.
+
+    Members live in an indexed list (swap-remove), so add(), discard() and
+    choose() are O(1). sync() puts the list in sorted order when the members
+    changed, so a seed gives the same run whatever the add order was.
+    """
+
+    name = POLICY_RANDOM
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._items: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, tid: object) -> bool:
+        return tid in self._positions
+
+    def members(self) -> KeysView[str]:
+        return self._positions.keys()
+
+    def clear(self) -> None:
+        self._items = []
+        self._positions = {}
+
+    def add(self, tid: str) -> None:
+        if tid not in self._positions:
+            self._positions[tid] = len(self._items)
+            self._items.append(tid)
+
+    def discard(self, tid: str) -> None:
+        pos = self._positions.pop(tid, None)
+        if pos is None:
+            return
+        last = self._items.pop()
+        if pos < len(self._items):
+            self._items[pos] = last
+            self._positions[last] = pos
+
+    def sync(self, enabled: Collection[str]) -> bool:
+        if not super().sync(enabled):
+            return False
+        self._items.sort()
+        self._positions = {tid: i for i, tid in enumerate(self._items)}
+        return True
+
+    def choose(self) -> Optional[str]:
+        items = self._items
+        if not items:
+            return None
+        return items[self._random.randrange(len(items))]
+
+
+def make_scheduler(scheduler: Union[str, TransitionScheduler, None], seed: Optional[int] = None) -> TransitionScheduler:
+    """Scheduler instance for a policy name; instances are returned unchanged."""
+    if isinstance(scheduler, TransitionScheduler):
+        return scheduler
+    if scheduler in (None, POLICY_DEFAULT):
+        return StaticPriorityScheduler(use_priority=False)
+    if scheduler == POLICY_PRIORITY:
+        return StaticPriorityScheduler()
+    if scheduler == POLICY_FIFO:
+        return FifoScheduler()
+    if scheduler == POLICY_ROUND_ROBIN:
+        return RoundRobinScheduler()
+    if scheduler == POLICY_RANDOM:
+        return RandomScheduler(seed)
+    raise ValueError(f"unknown scheduler: {scheduler}")
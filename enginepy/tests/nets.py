@@ -0,0 +1,89 @@
+from enginepy.pnml_parser import Arc, PNMLNet, Place, Transition
+
+FORMS = """
+pnml:
+  net:
+    - id: forms
+      page:
+        - id: page1
+          place:
+            - id: p1
+              evolve:
+                initialTokens:
+                  - value: first
+            - id: p2
+            - id: p3
+          transition:
+            - id: t_form
+              evolve:
+                inscriptions:
+                  - id: in_form
+                    language: python
+                    kind: expression
+                    execMode: async
+                    source: inline
+                    code: |
+                      return None
+            - id: t_next
+          arc:
+            - id: a1
+              source: p1
+              target: t_form
+            - id: a2
+              source: t_form
+              target: p2
+            - id: a3
+              source: p2
+              target: t_next
+            - id: a4
+              source: t_next
+              target: p3
+"""
+
+JOIN = """
+pnml:
+  net:
+    - id: joiner
+      page:
+        - id: page1
+          place:
+            - id: p_req
+            - id: p_resp
+            - id: p_done
+          transition:
+            - id: t_join
+              evolve:
+                joinKey: rid
+          arc:
+            - id: a1
+              source: p_req
+              target: t_join
+            - id: a2
+              source: p_resp
+              target: t_join
+            - id: a3
+              source: t_join
+              target: p_done
+"""
+
+
+def build_net(arcs, initial=None, places=(), transitions=()):
+    """Net from (source, target) pairs; ids starting with "t" are transitions."""
+    net = PNMLNet(id="net")
+    nodes = [node for pair in arcs for node in pair] + list(places) + list(transitions)
+    for node in nodes:
+        if node.startswith("t"):
+            net.transitions.setdefault(node, Transition(id=node))
+        else:
+            net.places.setdefault(node, Place(id=node))
+    for pid, count in (initial or {}).items():
+        net.places[pid].tokens = ["token"] * count
+    net.arcs = [Arc(id=f"a{i}", source=src, target=dst) for i, (src, dst) in enumerate(arcs)]
+    return net
+
+
+def fork_join(width):
+    arcs = [("start", "t_fork"), ("t_join", "end")]
+    for i in range(width):
+        arcs += [("t_fork", f"b{i}"), (f"b{i}", f"t_{i}"), (f"t_{i}", f"c{i}"), (f"c{i}", "t_join")]
+    return build_net(arcs, {"start": 1})
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import unittest
+
+from enginepy.async_engine import AsyncPNMLEngine
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pnml_parser import parse_pnml
+
+TWO_BRANCHES = """
+pnml:
+  net:
+    - id: branches
+      page:
+        - id: page1
+          place:
+            - id: p_slow
+              evolve:
+                initialTokens:
+                  - value: slow
+            - id: p_fast
+              evolve:
+                initialTokens:
+                  - value: fast
+            - id: p_slow_done
+            - id: p_fast_mid
+            - id: p_fast_done
+          transition:
+            - id: t_slow
+              evolve:
+                inscriptions:
+                  - id: in_slow
+                    language: python
+                    kind: expression
+                    execMode: async
+                    source: inline
+                    code: |
+                      return None
+            - id: t_fast1
+            - id: t_fast2
+          arc:
+            - id: a1
+              source: p_slow
+              target: t_slow
+            - id: a2
+              source: t_slow
+              target: p_slow_done
+            - id: a3
+              source: p_fast
+              target: t_fast1
+            - id: a4
+              source: t_fast1
+              target: p_fast_mid
+            - id: a5
+              source: p_fast_mid
+              target: t_fast2
+            - id: a6
+              source: t_fast2
+              target: p_fast_done
+"""
+
+SLOW_KEY = build_registry_key("branches", "t_slow", "expression")
+
+
+class AsyncEngineTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_coroutine_op_does_not_block_other_branches(self) -> None:
+        clear_registry()
+        order = []
+
+        async def slow(token=None):
+            await asyncio.sleep(0.05)
+            order.append("slow")
+            return {"done": token}
+
+        register_inscription(SLOW_KEY, slow)
+        net, _ = parse_pnml(TWO_BRANCHES)
+        engine = AsyncPNMLEngine(net)
+
+        def until(eng: AsyncPNMLEngine) -> bool:
+            if eng.marking["p_fast_done"] and not order:
+                order.append("fast")
+            return False
+
+        stats = asyncio.run(engine.arun(until=until))
+        self.assertEqual(stats.stop_reason, "quiescent")
+        self.assertEqual(order, ["fast", "slow"])
+        self.assertEqual(engine.marking["p_slow_done"], [{"done": "slow"}, "slow"])
+        self.assertEqual(engine.marking["p_fast_done"], ["fast"])
+        self.assertEqual(engine.pending_ops_by_id, {})
+
+    def test_host_submission_from_another_thread(self) -> None:
+        clear_registry()
+        register_inscription(SLOW_KEY, lambda _token=None: AsyncOpRequest(operation_type="form", resume_token="tok-1"))
+        net, _ = parse_pnml(TWO_BRANCHES)
+        engine = AsyncPNMLEngine(net)
+
+        async def scenario():
+            timer = threading.Timer(0.05, lambda: engine.submit_async(resume_token="tok-1", result="approved"))
+            timer.start()
+            return await engine.arun(idle_timeout=2.0)
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats.stop_reason, "quiescent")
+        self.assertEqual(stats.firings, {"t_fast1": 1, "t_fast2": 1, "t_slow": 1})
+        self.assertIn("approved", engine.marking["p_slow_done"])
+
+    def test_idle_timeout_reports_pending(self) -> None:
+        clear_registry()
+        register_inscription(SLOW_KEY, lambda _token=None: AsyncOpRequest(operation_type="form"))
+        net, _ = parse_pnml(TWO_BRANCHES)
+        engine = AsyncPNMLEngine(net)
+        stats = asyncio.run(engine.arun(idle_timeout=0.01))
+        self.assertEqual(stats.stop_reason, "pending")
+        self.assertEqual(stats.pending.transition_id, "t_slow")
+        self.assertEqual(engine.marking["p_fast_done"], ["fast"])
+        engine.submit_async(op_id=stats.pending.id, result="late")
+        self.assertIn("late", engine.marking["p_slow_done"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from benchmarks import compare, memory, throughput
+from benchmarks.netgen import deep_queue, dense_conflict, inscription_heavy
+from enginepy.pnml_engine import PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+
+
+class NetgenTests(unittest.TestCase):
+    def test_generated_nets_parse_and_run(self) -> None:
+        net, _ = parse_pnml(inscription_heavy(4, guards=2, tokens=3))
+        self.assertEqual([ins.kind for ins in net.transitions["t0"].inscriptions], ["guard", "guard", "expression"])
+        engine = PNMLEngine(net)
+        self.assertEqual(engine.run().firings["t3"], 3)
+        self.assertEqual(len(engine.marking["p4"]), 3)
+
+        net, _ = parse_pnml(dense_conflict(6, 12, fan_in=2, tokens=4, seed=1))
+        self.assertEqual(sum(len(net.places[pid].tokens) for pid in net.places), 24)
+        self.assertGreater(PNMLEngine(net).run(max_steps=50).steps, 0)
+        self.assertEqual(dense_conflict(6, 12, seed=1), dense_conflict(6, 12, seed=1))
+
+        net, _ = parse_pnml(deep_queue(50, stages=2))
+        self.assertEqual(PNMLEngine(net).run().steps, 100)
+
+
+class CompareTests(unittest.TestCase):
+    def test_directions_and_thresholds(self) -> None:
+        base = {"results": {"chain": {"engine_steps_per_s": 1000.0, "parse_s": 0.010, "peak_kb": 100.0, "steps": 10}}}
+        head = {"results": {"chain": {"engine_steps_per_s": 800.0, "parse_s": 0.009, "peak_kb": 130.0, "steps": 20}}}
+        deltas = {delta.metric: delta for delta in compare.compare(base, head, threshold=0.25)}
+        self.assertNotIn("steps", deltas)
+        self.assertAlmostEqual(deltas["engine_steps_per_s"].regression, 0.2)
+        self.assertLess(deltas["parse_s"].regression, 0)
+        self.assertEqual([m for m, d in sorted(deltas.items()) if d.failed], ["peak_kb"])
+        deltas = compare.compare(base, head, threshold=0.25, overrides={"chain.peak_kb": 0.5, "engine_*": 0.1})
+        self.assertEqual([d.metric for d in deltas if d.failed], ["engine_steps_per_s"])
+
+    def test_throughput_report_shape(self) -> None:
+        report = throughput.run(["deep_queue"], steps=20, dap_steps=5, repeats=1)
+        row = report["results"]["deep_queue"]
+        self.assertEqual(report["meta"]["suite"], "throughput")
+        self.assertEqual(row["steps"], 20)
+        for metric in ("parse_s", "engine_steps_per_s", "debug_steps_per_s", "dap_steps_per_s", "project_gen_s", "peak_kb"):
+            self.assertGreater(row[metric], 0, metric)
+        self.assertEqual([d for d in compare.compare(report, report) if d.failed], [])
+
+    def test_memory_report_shape(self) -> None:
+        report = memory.run(list(memory.SCENARIOS), size=200, hotspots=3)
+        results, hotspots = report["results"], report["hotspots"]
+        self.assertEqual(results["pending_ops"]["ops"], 200)
+        self.assertLess(results["pending_ops"]["leftover_bytes_per_op"], results["pending_ops"]["retained_bytes_per_op"])
+        self.assertGreater(results["debug_history"]["retained_bytes_per_entry"], 0)
+        self.assertGreater(results["parse"]["retained_bytes_per_element"], 0)
+        self.assertGreater(results["dap_marking"]["peak_bytes_per_token"], 0)
+        self.assertTrue(any("pnml_parser.py:" in spot["where"] for spot in hotspots["parse"]))
+        self.assertTrue(all(len(spots) <= 3 for spots in hotspots.values()))
+        self.assertIn("retained_bytes_per_token", {d.metric for d in compare.compare(report, report)})
+
+
+if __name__ == "__main__":
+    unittest.main()
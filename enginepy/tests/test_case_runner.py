@@ -0,0 +1,184 @@
+import os
+import tempfile
+import unittest
+
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.case_runner import CASE_DONE, CASE_WAITING, SCHEDULE_PRIORITY, CaseRunner, ProcessPoolCaseRunner
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pnml_engine import PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+
+PIPELINE = """
+pnml:
+  net:
+    - id: pipeline
+      page:
+        - id: page1
+          place:
+            - id: p_in
+            - id: p_mid
+            - id: p_out
+          transition:
+            - id: t_double
+              evolve:
+                inscriptions:
+                  - id: in_double
+                    language: python
+                    kind: expression
+                    source: inline
+                    code: |
+                      return token * 2
+            - id: t_finish
+          arc:
+            - id: a1
+              source: p_in
+              target: t_double
+            - id: a2
+              source: t_double
+              target: p_mid
+            - id: a3
+              source: p_mid
+              target: t_finish
+            - id: a4
+              source: t_finish
+              target: p_out
+"""
+
+APPROVAL = """
+pnml:
+  net:
+    - id: approval
+      page:
+        - id: page1
+          place:
+            - id: p_in
+            - id: p_out
+          transition:
+            - id: t_approve
+              evolve:
+                inscriptions:
+                  - id: in_approve
+                    language: python
+                    kind: expression
+                    execMode: async
+                    source: inline
+                    code: |
+                      return None
+          arc:
+            - id: a1
+              source: p_in
+              target: t_approve
+            - id: a2
+              source: t_approve
+              target: p_out
+"""
+
+
+class CaseRunnerTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_cases_share_net_and_keep_separate_markings(self) -> None:
+        net, _ = parse_pnml(PIPELINE)
+        runner = CaseRunner(net, result_place="p_out")
+        first = runner.add_case({"p_in": [1]})
+        second = runner.add_case({"p_in": [5]})
+        runner.run()
+        results = runner.results()
+        self.assertEqual(results[first], [1])
+        self.assertEqual(results[second], [5])
+        inscription = net.transitions["t_double"].inscriptions[0]
+        self.assertIsNotNone(inscription.func)
+        self.assertEqual(runner.metrics()[first]["steps"], 2)
+        self.assertEqual(runner.metrics()[first]["status"], CASE_DONE)
+
+    def test_round_robin_interleaves_cases(self) -> None:
+        net, _ = parse_pnml(PIPELINE)
+        runner = CaseRunner(net)
+        runner.add_case({"p_in": [1]}, case_id="a")
+        runner.add_case({"p_in": [2]}, case_id="b")
+        order = [runner.step()[0] for _ in range(4)]
+        self.assertEqual(order, ["a", "b", "a", "b"])
+
+    def test_priority_schedule_runs_highest_first(self) -> None:
+        net, _ = parse_pnml(PIPELINE)
+        runner = CaseRunner(net, schedule=SCHEDULE_PRIORITY)
+        runner.add_case({"p_in": [1]}, case_id="low", priority=1)
+        runner.add_case({"p_in": [2]}, case_id="high", priority=5)
+        order = [runner.step()[0] for _ in range(4)]
+        self.assertEqual(order, ["high", "high", "high", "low"])
+
+    def test_async_op_parks_only_its_case(self) -> None:
+        key = build_registry_key("approval", "t_approve", "expression")
+        register_inscription(key, lambda token=None: AsyncOpRequest(operation_type="form", resume_token=f"tok-{token}"))
+        net, _ = parse_pnml(APPROVAL)
+        runner = CaseRunner(net, result_place="p_out")
+        runner.add_case({"p_in": ["x"]}, case_id="x")
+        runner.add_case({"p_in": ["y"]}, case_id="y")
+        runner.run()
+        self.assertEqual(runner.cases["x"].status, CASE_WAITING)
+        self.assertEqual(runner.cases["y"].status, CASE_WAITING)
+        self.assertEqual(runner.results(), {})
+
+        runner.submit_async("y", resume_token="tok-y", result="approved")
+        runner.run()
+        self.assertEqual(runner.cases["x"].status, CASE_WAITING)
+        self.assertIn("approved", runner.results()["y"])
+
+    def test_duplicate_case_id_rejected(self) -> None:
+        net, _ = parse_pnml(PIPELINE)
+        runner = CaseRunner(net)
+        runner.add_case(case_id="a")
+        with self.assertRaises(ValueError):
+            runner.add_case(case_id="a")
+
+
+class ProcessPoolCaseRunnerTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_runs_cases_in_workers_with_chunking(self) -> None:
+        # Resolved callables are stripped before pickling and recompiled in workers.
+        net, _ = parse_pnml(PIPELINE)
+        with ProcessPoolCaseRunner(net, max_workers=2, chunksize=3, max_in_flight=1, result_place="p_out") as runner:
+            outcomes = runner.run([{"p_in": [i]} for i in range(10)])
+        self.assertEqual(len(outcomes), 10)
+        self.assertEqual(outcomes["case-4"].result, [3])
+        self.assertEqual(outcomes["case-4"].trace, ["t_double", "t_finish"])
+        self.assertTrue(all(o.status == CASE_DONE for o in outcomes.values()))
+
+    def test_net_already_run_in_process(self) -> None:
+        net, _ = parse_pnml(PIPELINE)
+        engine = PNMLEngine(net)
+        engine.marking["p_in"].append(5)
+        engine.run()
+        adapters = [ins.adapter for t in net.transitions.values() for ins in t.inscriptions]
+        self.assertTrue(adapters and all(adapters))
+        with ProcessPoolCaseRunner(net, max_workers=1, result_place="p_out") as runner:
+            outcomes = runner.run([("a", {"p_in": [2]})])
+        self.assertEqual(outcomes["a"].status, CASE_DONE)
+        self.assertEqual([ins.adapter for t in net.transitions.values() for ins in t.inscriptions], adapters)
+
+    def test_workers_import_registry_modules(self) -> None:
+        key = build_registry_key("approval", "t_approve", "expression")
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "case_pool_inscriptions.py"), "w", encoding="utf-8") as f:
+                f.write(
+                    "from enginepy.inscription_registry import register_inscription\n"
+                    f"register_inscription({key!r}, lambda token=None: token.upper())\n"
+                )
+            net, _ = parse_pnml(APPROVAL)
+            with ProcessPoolCaseRunner(
+                net,
+                max_workers=1,
+                result_place="p_out",
+                modules=["case_pool_inscriptions"],
+                paths=[tmp],
+            ) as runner:
+                outcomes = runner.run([("a", {"p_in": ["x"]})])
+        self.assertEqual(outcomes["a"].status, CASE_DONE)
+        self.assertIn("X", outcomes["a"].result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import multiprocessing
+import unittest
+
+from enginepy.async_ops import AsyncOpRequest, AsyncResult
+from enginepy.checkpoint import CheckpointError, decode_frames
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pending_ops import next_op_id
+from enginepy.pnml_engine import PNMLEngine, PendingOp
+from enginepy.pnml_parser import parse_pnml
+from enginepy.tests.nets import FORMS
+
+
+def _register_form() -> None:
+    register_inscription(
+        build_registry_key("forms", "t_form", "expression"),
+        lambda token=None: AsyncOpRequest(operation_type="form", resume_token=f"tok-{token}", timeout_ms=60_000),
+    )
+
+
+def _restore_and_start_another(data: bytes):
+    _register_form()
+    restored = PNMLEngine.restore(parse_pnml(FORMS)[0], data)
+    fresh = PNMLEngine(parse_pnml(FORMS)[0])
+    pending = fresh.step_once()
+    return list(restored.pending_ops_by_id), pending.id
+
+
+class CheckpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_registry()
+        _register_form()
+
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_restore_resumes_pending_form(self) -> None:
+        net, _ = parse_pnml(FORMS)
+        engine = PNMLEngine(net)
+        engine.marking["p3"].append(bytearray(b"x" * 1024))
+        pending = engine.step_once()
+        self.assertIsInstance(pending, PendingOp)
+        data = engine.checkpoint()
+
+        net2, _ = parse_pnml(FORMS)
+        restored = PNMLEngine.restore(net2, data)
+        self.assertEqual(restored.run_id, engine.run_id)
+        self.assertEqual(restored.marking, engine.marking)
+        self.assertEqual(list(restored.pending_ops_by_id), [pending.id])
+        self.assertIsNotNone(restored.next_deadline())
+        restored.submit_async(resume_token="tok-first", result="approved")
+        self.assertEqual(restored.run().firings, {"t_next": 2})
+        self.assertIn("approved", restored.marking["p3"])
+
+    def test_restore_in_fresh_process_does_not_reuse_op_ids(self) -> None:
+        for _ in range(100):
+            next_op_id()
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        pending = engine.step_once()
+        data = engine.checkpoint()
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            restored_ids, new_id = pool.apply(_restore_and_start_another, (data,))
+        self.assertEqual(restored_ids, [pending.id])
+        self.assertGreater(new_id, pending.id)
+
+    def test_async_result_id_already_pending_gets_a_fresh_id(self) -> None:
+        clear_registry()
+        results = []
+        register_inscription(
+            build_registry_key("forms", "t_form", "expression"),
+            lambda token=None: results.pop(0),
+        )
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        engine.blocks_on_pending = False
+        results.append(AsyncOpRequest(operation_type="form", resume_token="tok"))
+        first = engine.step_once()
+        results.append(AsyncResult(id=first.id))
+        engine.marking["p1"].append("second")
+        second = engine.step_once()
+        self.assertNotEqual(second.id, first.id)
+        self.assertEqual(set(engine.pending_ops_by_id), {first.id, second.id})
+        self.assertIs(engine.pending_ops_by_id[first.id], first)
+
+    def test_incremental_checkpoints_carry_only_changed_places(self) -> None:
+        net, _ = parse_pnml(FORMS)
+        engine = PNMLEngine(net)
+        engine.marking["p3"].extend(range(1000))
+        full = engine.checkpoint(incremental=True)
+        engine.marking["p2"].append("manual")
+        delta = engine.checkpoint(incremental=True)
+        header, payload = decode_frames(delta)
+        self.assertEqual((header["kind"], header["base"]), ("delta", 1))
+        self.assertEqual(set(payload["places"]), {"p2"})
+        self.assertLess(len(delta), len(full))
+
+        restored = PNMLEngine.restore(parse_pnml(FORMS)[0], [full, delta])
+        self.assertEqual(restored.marking, engine.marking)
+        with self.assertRaises(CheckpointError):
+            PNMLEngine.restore(parse_pnml(FORMS)[0], [delta])
+
+    def test_only_incremental_checkpoints_track_changes(self) -> None:
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        listeners = list(engine.marking._listeners)
+        engine.checkpoint()
+        self.assertEqual(engine.marking._listeners, listeners)
+        engine.checkpoint(incremental=True)
+        self.assertEqual(len(engine.marking._listeners), len(listeners) + 1)
+        engine.checkpoint()
+        self.assertEqual(engine.marking._listeners, listeners)
+
+    def test_unpicklable_tokens_raise_checkpoint_error(self) -> None:
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        engine.marking["p3"].append(lambda: None)
+        with self.assertRaises(CheckpointError):
+            engine.checkpoint()
+
+    def test_rejects_other_net_and_garbage(self) -> None:
+        net, _ = parse_pnml(FORMS)
+        data = PNMLEngine(net).checkpoint()
+        other, _ = parse_pnml(FORMS.replace("id: forms", "id: other"))
+        with self.assertRaises(CheckpointError):
+            PNMLEngine.restore(other, data)
+        with self.assertRaises(CheckpointError):
+            PNMLEngine.restore(net, b"nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
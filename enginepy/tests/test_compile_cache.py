@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from enginepy.compile_cache import CompileCache, cache_key
+
+
+class CompileCacheTests(unittest.TestCase):
+    def test_shared_code_compiles_once(self) -> None:
+        cache = CompileCache()
+        first = cache.get_function("expression", "return token + 1")
+        second = cache.get_function("expression", "return token + 1")
+        self.assertEqual((first(1), second(2)), (2, 3))
+        self.assertIs(first.__code__, second.__code__)
+        self.assertIsNot(first.__globals__, second.__globals__)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+
+    def test_guard_without_return_is_an_expression(self) -> None:
+        guard = CompileCache().get_function("guard", "token > 3")
+        self.assertTrue(guard(4))
+        self.assertNotEqual(cache_key("guard", "token > 3"), cache_key("expression", "token > 3"))
+
+    def test_lru_evicts_oldest(self) -> None:
+        cache = CompileCache(maxsize=2)
+        for code in ("return 1", "return 2", "return 3"):
+            cache.get_code("expression", code)
+        cache.get_code("expression", "return 1")
+        self.assertEqual(cache.misses, 4)
+
+    def test_disk_cache_survives_new_process_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            CompileCache(cache_dir=tmp).get_code("expression", "return token * 2")
+            self.assertEqual(len(os.listdir(tmp)), 1)
+            cold = CompileCache(cache_dir=tmp)
+            fn = cold.get_function("expression", "return token * 2")
+            self.assertEqual(fn(21), 42)
+            self.assertEqual((cold.disk_hits, cold.misses), (1, 0))
+
+    def test_corrupt_disk_entry_is_recompiled(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            key = cache_key("expression", "return 7")
+            with open(os.path.join(tmp, f"{key}.bin"), "wb") as f:
+                f.write(b"garbage")
+            cache = CompileCache(cache_dir=tmp)
+            self.assertEqual(cache.get_function("expression", "return 7")(), 7)
+            self.assertEqual(cache.misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
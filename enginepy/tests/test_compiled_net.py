@@ -0,0 +1,93 @@
+import unittest
+
+from enginepy.compiled_net import compile_net, invalidate_compiled_net
+from enginepy.pnml_engine import DebugEngine, PNMLEngine
+from enginepy.pnml_parser import Arc, Place, parse_pnml
+
+SAMPLE = """
+pnml:
+  net:
+    - id: fork
+      page:
+        - id: page1
+          place:
+            - id: p_start
+              evolve:
+                initialTokens:
+                  - value: start
+            - id: p_a
+            - id: p_b
+          transition:
+            - id: t_fork
+            - id: t_a
+          arc:
+            - id: a1
+              source: p_start
+              target: t_fork
+            - id: a2
+              source: t_fork
+              target: p_a
+            - id: a3
+              source: t_fork
+              target: p_b
+            - id: a4
+              source: p_a
+              target: t_a
+"""
+
+
+class CompiledNetTests(unittest.TestCase):
+    def test_adjacency_and_consumers(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        compiled = compile_net(net)
+        self.assertEqual(compiled.inputs_of("t_fork"), ["p_start"])
+        self.assertEqual(compiled.outputs_of("t_fork"), ["p_a", "p_b"])
+        self.assertEqual(compiled.consumers_of("p_a"), ["t_a"])
+        self.assertEqual(compiled.consumers_of("p_b"), [])
+        t_fork = compiled.transition_index["t_fork"]
+        self.assertEqual(compiled.outputs[t_fork], (compiled.place_index["p_a"], compiled.place_index["p_b"]))
+        self.assertTrue(compiled.touches_initial[t_fork])
+
+    def test_io_maps_are_copies(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        engine = PNMLEngine(net)
+        inputs, outputs = engine._build_io_maps()
+        self.assertEqual((inputs["t_fork"], outputs["t_fork"]), (["p_start"], ["p_a", "p_b"]))
+        inputs["t_fork"].append("p_b")
+        outputs.clear()
+        self.assertEqual(compile_net(net).inputs_of("t_fork"), ["p_start"])
+        self.assertEqual(compile_net(net).outputs_of("t_fork"), ["p_a", "p_b"])
+
+    def test_built_once_and_shared(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        engine = PNMLEngine(net)
+        other = PNMLEngine(net)
+        self.assertIs(engine.compiled, other.compiled)
+        engine.step_once()
+        engine.step_once()
+        self.assertIs(engine.compiled, compile_net(net))
+
+    def test_invalidation_picks_up_new_arcs(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        engine = PNMLEngine(net)
+        before = engine.compiled
+        net.places["p_c"] = Place(id="p_c")
+        net.arcs.append(Arc(id="a5", source="t_a", target="p_c"))
+        self.assertIs(engine.compiled, before)
+        engine.invalidate_topology()
+        self.assertIsNot(engine.compiled, before)
+        self.assertGreater(engine.compiled.version, before.version)
+        self.assertEqual(engine.compiled.outputs_of("t_a"), ["p_c"])
+        invalidate_compiled_net(net)
+        self.assertIsNone(net.compiled)
+
+    def test_debug_engine_produced_places(self) -> None:
+        debug = DebugEngine()
+        debug.load(SAMPLE)
+        entry = debug.step_once()
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.produced_places, ["p_a", "p_b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pnml_engine import STEP_CONCURRENT, PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+
+FORK_JOIN = """
+pnml:
+  net:
+    - id: branches
+      page:
+        - id: page1
+          place:
+            - id: p_a
+              evolve:
+                initialTokens:
+                  - value: a
+            - id: p_b
+              evolve:
+                initialTokens:
+                  - value: b
+            - id: p_a_done
+            - id: p_b_done
+            - id: p_end
+          transition:
+            - id: t_a
+              evolve:
+                inscriptions:
+                  - id: in_a
+                    language: python
+                    kind: expression
+                    source: inline
+                    code: |
+                      return None
+            - id: t_b
+              evolve:
+                inscriptions:
+                  - id: in_b
+                    language: python
+                    kind: expression
+                    source: inline
+                    code: |
+                      return None
+            - id: t_join
+          arc:
+            - id: a1
+              source: p_a
+              target: t_a
+            - id: a2
+              source: t_a
+              target: p_a_done
+            - id: a3
+              source: p_b
+              target: t_b
+            - id: a4
+              source: t_b
+              target: p_b_done
+            - id: a5
+              source: p_a_done
+              target: t_join
+            - id: a6
+              source: p_b_done
+              target: t_join
+            - id: a7
+              source: t_join
+              target: p_end
+"""
+
+
+class ConcurrentFiringTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_registry()
+        self.threads = set()
+
+        def slow(_token=None):
+            self.threads.add(threading.get_ident())
+            time.sleep(0.2)
+
+        register_inscription(build_registry_key("branches", "t_a", "expression"), slow)
+        register_inscription(build_registry_key("branches", "t_b", "expression"), slow)
+
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_independent_branches_overlap(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        engine = PNMLEngine(net, step_semantics=STEP_CONCURRENT, max_workers=2)
+        started = time.perf_counter()
+        fired = engine.step_concurrent()
+        elapsed = time.perf_counter() - started
+        engine.close()
+        self.assertEqual(fired, ["t_a", "t_b"])
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(len(self.threads), 2)
+        self.assertEqual(engine.marking["p_a_done"], ["a"])
+        self.assertEqual(engine.marking["p_b_done"], ["b"])
+
+    def test_run_matches_interleaving_result(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        concurrent = PNMLEngine(net, step_semantics=STEP_CONCURRENT)
+        stats = concurrent.run()
+        concurrent.close()
+        net, _ = parse_pnml(FORK_JOIN)
+        sequential = PNMLEngine(net)
+        sequential.run()
+        self.assertEqual(stats.firings, {"t_a": 1, "t_b": 1, "t_join": 1})
+        self.assertEqual(concurrent.marking.snapshot(), sequential.marking.snapshot())
+
+    def test_limit_caps_selected_set(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        engine = PNMLEngine(net, step_semantics=STEP_CONCURRENT)
+        stats = engine.run(max_steps=1)
+        engine.close()
+        self.assertEqual((stats.steps, stats.stop_reason), (1, "max_steps"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 import time
 
 from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
-from enginepy.pnml_engine import DebugEngine, PNMLEngine, PendingOp
+from enginepy.pnml_engine import SCHEDULER_INCREMENTAL, SCHEDULER_SCAN, DebugEngine, PNMLEngine, PendingOp
 from enginepy.pnml_parser import parse_pnml
 from enginepy.async_ops import run_async, AsyncOpRequest
 
@@ -233,6 +233,103 @@ class EngineTests(unittest.TestCase):
         self.assertIsNotNone(entry)
         self.assertEqual(len(engine.history), 1)
 
+    def test_incremental_scheduler_matches_scan(self) -> None:
+        sequences = []
+        for mode in (SCHEDULER_SCAN, SCHEDULER_INCREMENTAL):
+            net, _ = parse_pnml(SAMPLE_WITH_INSCRIPTIONS)
+            net.places["p2"].tokens.clear()
+            clear_registry()
+            register_inscription(build_registry_key("house", "t1", "guard"), lambda token=None: token != "Stop")
+            engine = PNMLEngine(net, scheduler_mode=mode)
+            engine.marking["p1"].extend(["Green", "Stop"])
+            fired = []
+            while True:
+                result = engine.step_once()
+                if result is None:
+                    break
+                fired.append(result)
+            sequences.append((fired, engine.marking["p1"], engine.marking["p2"]))
+        self.assertEqual(sequences[0], sequences[1])
+        self.assertEqual(sequences[1][1], ["Stop"])
+
+    def test_incremental_scheduler_tracks_external_marking_edits(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        engine = PNMLEngine(net, scheduler_mode=SCHEDULER_INCREMENTAL)
+        self.assertEqual(engine.step_once(), "t1")
+        self.assertEqual(engine.enabled_transitions(), [])
+        engine.marking["p1"].append("Green")
+        self.assertEqual(engine.enabled_transitions(), ["t1"])
+        engine.marking["p1"] = []
+        self.assertEqual(engine.enabled_transitions(), [])
+
+    def test_run_to_quiescence(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        engine = PNMLEngine(net)
+        engine.marking["p1"].extend(["Green", "Yellow"])
+        stats = engine.run()
+        self.assertEqual(stats.stop_reason, "quiescent")
+        self.assertEqual(stats.steps, 3)
+        self.assertEqual(stats.firings, {"t1": 3})
+        self.assertGreaterEqual(stats.wall_time, 0.0)
+        self.assertEqual(engine.marking["p2"], ["Blue", "Red", "Green", "Yellow"])
+
+    def test_run_stops_on_budget_predicate_and_pending(self) -> None:
+        net, _ = parse_pnml(SAMPLE)
+        engine = PNMLEngine(net)
+        engine.marking["p1"].extend(["Green", "Yellow"])
+        self.assertEqual(engine.run(max_steps=1).stop_reason, "max_steps")
+        stats = engine.run(until=lambda eng: len(eng.marking["p2"]) >= 3)
+        self.assertEqual((stats.stop_reason, stats.steps), ("until", 1))
+
+        net, _ = parse_pnml(SAMPLE_WITH_ASYNC)
+        clear_registry()
+        register_inscription(
+            build_registry_key("async_demo", "t1", "expression"),
+            lambda _token=None: AsyncOpRequest(operation_type="form"),
+        )
+        engine = PNMLEngine(net)
+        stats = engine.run()
+        self.assertEqual(stats.stop_reason, "pending")
+        self.assertIsInstance(stats.pending, PendingOp)
+        self.assertEqual(stats.firings, {"t1": 1})
+
+    def test_memoized_guards_run_once_per_head_token(self) -> None:
+        calls = {"default": 0, "memo": 0}
+        for mode, memoize in (("default", False), ("memo", True)):
+            net, _ = parse_pnml(SAMPLE_WITH_INSCRIPTIONS)
+            clear_registry()
+
+            def guard(token=None, mode=mode) -> bool:
+                calls[mode] += 1
+                return token != "Stop"
+
+            register_inscription(build_registry_key("house", "t1", "guard"), guard)
+            engine = PNMLEngine(net, memoize_guards=memoize)
+            engine.marking["p1"].extend(["Green", "Stop"])
+            fired = []
+            while True:
+                result = engine.step_once()
+                if result is None:
+                    break
+                fired.append(result)
+            self.assertEqual(fired, ["t1", "t1"])
+            self.assertEqual(engine.marking["p1"], ["Stop"])
+        # Red, Green and Stop are each checked once instead of per query.
+        self.assertEqual(calls["memo"], 3)
+        self.assertGreater(calls["default"], calls["memo"])
+
+    def test_refresh_enabled_drops_memoized_guards(self) -> None:
+        net, _ = parse_pnml(SAMPLE_WITH_INSCRIPTIONS)
+        clear_registry()
+        state = {"open": False}
+        register_inscription(build_registry_key("house", "t1", "guard"), lambda token=None: state["open"])
+        engine = PNMLEngine(net, memoize_guards=True)
+        self.assertEqual(engine.enabled_transitions(), [])
+        state["open"] = True
+        self.assertEqual(engine.enabled_transitions(), [])
+        engine.refresh_enabled(["p1"])
+        self.assertEqual(engine.enabled_transitions(), ["t1"])
+
     def test_lazy_inscription_registry_wiring(self) -> None:
       net, _ = parse_pnml(SAMPLE_WITH_INSCRIPTIONS)
       clear_registry()
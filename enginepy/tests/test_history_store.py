@@ -0,0 +1,138 @@
+import os
+import tempfile
+import types
+import unittest
+
+from benchmarks.netgen import linear_chain
+from enginepy.history_store import HistoryEntry, HistoryStore
+from enginepy.pnml_dap import PNMLDAPServer
+from enginepy.pnml_engine import DebugEngine
+
+
+def _entry(step: int) -> HistoryEntry:
+    return HistoryEntry(step=step, transition_id=f"t{step % 3}", line=step if step % 2 else None, produced_places=[f"p{step % 2}"] * (step % 3))
+
+
+class HistoryStoreTests(unittest.TestCase):
+    def test_round_trips_entries(self) -> None:
+        store = HistoryStore()
+        entries = [_entry(i) for i in range(10)]
+        for entry in entries:
+            store.append(entry)
+        self.assertEqual(len(store), 10)
+        self.assertEqual(list(store), entries)
+        self.assertEqual(store[-1], entries[-1])
+        self.assertEqual(store.page(3, 2), entries[3:5])
+        store.append(HistoryEntry(step=0, transition_id=None, line=None, produced_places=[]))
+        self.assertIsNone(store[-1].transition_id)
+
+    def test_retention_drops_oldest(self) -> None:
+        store = HistoryStore(retention=4)
+        for i in range(20):
+            store.append(_entry(i))
+        self.assertEqual(len(store), 20)
+        self.assertGreaterEqual(store.first_available, 15)
+        self.assertEqual(store[19], _entry(19))
+        with self.assertRaises(IndexError):
+            store[0]
+        self.assertEqual(store.page(0, 1), [store[store.first_available]])
+
+    def test_spill_keeps_evicted_entries_readable(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoryStore(retention=4, spill_path=os.path.join(tmp, "sub", "history.jsonl"))
+            entries = [_entry(i) for i in range(30)]
+            for entry in entries:
+                store.append(entry)
+            self.assertEqual(store.first_available, 0)
+            self.assertEqual(list(store), entries)
+            self.assertEqual(store.page(10, 3), entries[10:13])
+            store.clear()
+            self.assertEqual(len(store), 0)
+            with self.assertRaises(FileExistsError):
+                HistoryStore(retention=4, spill_path=store.spill_path)
+            HistoryStore(retention=4, spill_path=store.spill_path, overwrite=True).close()
+
+    def test_reload_after_spill_keeps_the_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.jsonl")
+            debug = DebugEngine(history_retention=4, history_spill_path=path)
+            text = linear_chain(30)
+            debug.load(text)
+            first = [debug.step_once() for _ in range(20)]
+            with open(path, "rb") as handle:
+                spilled = handle.read()
+            self.assertTrue(spilled)
+            debug.load(text)
+            second = [debug.step_once() for _ in range(20)]
+            self.assertEqual(list(debug.history), second)
+            self.assertEqual(first, second)
+            # Both runs spill the same lines; the first run's are kept.
+            with open(path, "rb") as handle:
+                self.assertEqual(handle.read(), spilled * 2)
+            debug.history.close()
+
+    def test_spill_file_survives_close_and_is_only_replaced_with_overwrite(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.jsonl")
+            store = HistoryStore(retention=4, spill_path=path)
+            entries = [_entry(i) for i in range(30)]
+            for entry in entries[:10]:
+                store.append(entry)
+            store.close()
+            for entry in entries[10:]:
+                store.append(entry)
+            self.assertEqual(list(store), entries)
+            store.close()
+
+            late = HistoryStore(retention=4, spill_path=os.path.join(tmp, "late.jsonl"))
+            with open(late.spill_path, "w", encoding="utf-8") as handle:
+                handle.write("someone else\n")
+            with self.assertRaises(FileExistsError):
+                for entry in entries:
+                    late.append(entry)
+            with open(late.spill_path, "r", encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "someone else\n")
+
+            replacing = HistoryStore(retention=4, spill_path=path, overwrite=True)
+            for entry in entries:
+                replacing.append(entry)
+            replacing.clear()
+            self.assertEqual(os.path.getsize(path), 0)
+            replacing.close()
+
+    def test_dap_spills_only_on_request(self) -> None:
+        server = PNMLDAPServer(start_reader=False)
+        outputs = []
+        server._emit_output = outputs.append
+        server.program = "/tmp/project/src/net.yaml"
+        server._configure_history({})
+        self.assertEqual((server.engine.history.retention, server.engine.history.spill_path), (None, None))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.jsonl")
+            server._configure_history({"historySpillPath": path})
+            self.assertEqual(server.engine.history.spill_path, path)
+            self.assertEqual(server.engine.history.retention, 10_000)
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write("previous session\n")
+            server._configure_history({"historySpillPath": path})
+            self.assertIsNone(server.engine.history.spill_path)
+            self.assertIn("historySpillOverwrite", outputs[-1])
+            with open(path, "r", encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "previous session\n")
+
+    def test_dap_history_scope_pages(self) -> None:
+        server = PNMLDAPServer(start_reader=False)
+        for i in range(1, 8):
+            server.engine.history.append(_entry(i))
+        responses = []
+        server.protocol.send_response = types.MethodType(lambda _self, request, body=None: responses.append(body), server.protocol)
+        server.handle_scopes({})
+        history_scope = responses[-1]["scopes"][1]
+        self.assertEqual(history_scope["indexedVariables"], 7)
+        server.handle_variables({"arguments": {"variablesReference": 2, "start": 2, "count": 3}})
+        names = [v["name"] for v in responses[-1]["variables"]]
+        self.assertEqual(names, ["step 3", "step 4", "step 5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
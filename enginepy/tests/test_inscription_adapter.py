@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+from enginepy.inscription_adapter import adapt_inscription
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pnml_engine import PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+
+NET = """
+pnml:
+  net:
+    - id: adapt
+      page:
+        - id: page1
+          place:
+            - id: p1
+              evolve:
+                initialTokens:
+                  - value: Red
+            - id: p2
+          transition:
+            - id: t1
+              evolve:
+                inscriptions:
+                  - id: in_expr
+                    language: python
+                    kind: expression
+                    source: inline
+                    code: |
+                      return token
+          arc:
+            - id: a1
+              source: p1
+              target: t1
+            - id: a2
+              source: t1
+              target: p2
+"""
+
+
+class InscriptionAdapterTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_token_passing_follows_signature(self) -> None:
+        self.assertEqual(adapt_inscription(lambda token: token)("x"), "x")
+        self.assertEqual(adapt_inscription(lambda: "none")("x"), "none")
+        self.assertEqual(adapt_inscription(lambda *args: args)("x"), ("x",))
+        self.assertEqual(adapt_inscription(lambda token=None: token)(None), None)
+
+    def test_type_error_inside_body_is_not_retried(self) -> None:
+        calls = []
+
+        def expr(token=None):
+            calls.append(token)
+            raise TypeError("bad operand")
+
+        with self.assertRaises(TypeError):
+            adapt_inscription(expr)("x")
+        self.assertEqual(calls, ["x"])
+
+    def test_stats_count_calls_across_threads(self) -> None:
+        sync = adapt_inscription(lambda token: token)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(sync, range(400)))
+        stats = sync.stats()
+        self.assertEqual(stats["calls"], 400)
+        self.assertTrue(stats["accepts_token"])
+        self.assertGreaterEqual(stats["total_time"], 0.0)
+
+    def test_engine_builds_adapter_once_and_reports_metrics(self) -> None:
+        net, _ = parse_pnml(NET)
+        engine = PNMLEngine(net)
+        engine.marking["p1"].append("Blue")
+        engine.run()
+        ins = net.transitions["t1"].inscriptions[0]
+        self.assertIs(ins.adapter.func, ins.func)
+        key = build_registry_key("adapt", "t1", "expression")
+        self.assertEqual(engine.inscription_metrics()[key]["calls"], 2)
+
+    def test_adapter_follows_replaced_function(self) -> None:
+        net, _ = parse_pnml(NET)
+        engine = PNMLEngine(net)
+        engine.step_once()
+        ins = net.transitions["t1"].inscriptions[0]
+        first = ins.adapter
+        register_inscription(ins.registry_key, lambda: None)
+        ins.func = None
+        engine.marking["p1"].append("Blue")
+        engine.step_once()
+        self.assertIsNot(ins.adapter, first)
+        self.assertFalse(ins.adapter.accepts_token)
+
+
+if __name__ == "__main__":
+    unittest.main()
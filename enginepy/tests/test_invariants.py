@@ -0,0 +1,104 @@
+import unittest
+
+from benchmarks.netgen import render_net
+from enginepy.analysis import invariants
+from enginepy.pnml_validator import validate
+from enginepy.tests.nets import build_net, fork_join
+
+NO_TOKENS = """
+pnml:
+  net:
+    - id: stuck
+      page:
+        - id: page1
+          place:
+            - id: p1
+            - id: p2
+          transition:
+            - id: t1
+          arc:
+            - id: a1
+              source: p1
+              target: t1
+            - id: a2
+              source: t1
+              target: p2
+"""
+
+
+@unittest.skipIf(invariants.np is None, "numpy not installed")
+class InvariantTests(unittest.TestCase):
+    def test_cycle_invariants(self) -> None:
+        net = build_net([("a", "t1"), ("t1", "b"), ("b", "t2"), ("t2", "a")], {"a": 1})
+        report = invariants.analyze(net)
+        self.assertEqual(report.p_invariants, [{"a": 1, "b": 1}])
+        self.assertEqual(report.t_invariants, [{"t1": 1, "t2": 1}])
+        self.assertEqual((report.siphons, report.traps), ([["a", "b"]], [["a", "b"]]))
+        self.assertTrue(report.conservative)
+        self.assertEqual(report.hints(), [])
+
+    def test_invariants_annul_the_incidence_matrix(self) -> None:
+        net = fork_join(4)
+        _pre, incidence, place_ids, _tids = invariants.incidence_matrix(net)
+        report = invariants.analyze(net)
+        self.assertEqual(len(report.p_invariants), 4)
+        for inv in report.p_invariants:
+            vector = invariants.np.array([inv.get(pid, 0) for pid in place_ids])
+            self.assertFalse((vector @ incidence).any())
+            # The join moves four tokens into end, so start weighs four times as much.
+            self.assertEqual((inv["start"], inv["end"]), (4, 1))
+        self.assertEqual(report.rank, 6)
+
+    def test_uncovered_and_dead(self) -> None:
+        net = build_net([("p", "t"), ("t", "p"), ("t", "q"), ("r", "t_u"), ("t_u", "s")], {"p": 1})
+        report = invariants.analyze(net)
+        self.assertEqual(report.uncovered_places, ["q"])
+        self.assertIn(["r"], report.unmarked_siphons)
+        self.assertEqual(report.dead_transitions, ["t_u"])
+        self.assertFalse(report.all_dead)
+        self.assertEqual(len(report.hints()), 2)
+
+    def test_analysis_scales_to_long_chains(self) -> None:
+        arcs = []
+        for i in range(400):
+            arcs += [(f"p{i}", f"t{i}"), (f"t{i}", f"p{i + 1}")]
+        report = invariants.analyze(build_net(arcs, {"p0": 1}))
+        self.assertEqual(len(report.p_invariants), 1)
+        self.assertEqual((report.siphons, report.traps), ([["p0"]], [["p400"]]))
+        self.assertFalse(report.truncated)
+
+    def test_validator_reports_unmarked_siphon(self) -> None:
+        # t1 waits on c, which only t2 refills from b, which only t1 fills.
+        arcs = [("a", "t1"), ("c", "t1"), ("t1", "b"), ("b", "t2"), ("t2", "c"), ("p", "t"), ("t", "p")]
+        text = render_net("deadlock", ["a", "b", "c", "p"], ["t1", "t2", "t"], arcs, {"a": 1, "p": 1})
+        self.assertTrue(invariants.precheck(build_net(arcs, {"a": 1, "p": 1}))[0])
+        ok, msg = validate(text)
+        self.assertTrue(ok)
+        self.assertIn("initially unmarked siphons never gain tokens: {b, c} (never fire: t1, t2)", msg)
+        ok, msg = validate(render_net("live", ["a", "b", "c", "p"], ["t1", "t2", "t"], arcs, {"a": 1, "c": 1, "p": 1}))
+        self.assertEqual((ok, msg), (True, "ok"))
+
+
+class PrecheckTests(unittest.TestCase):
+    def test_validator_runs_cheap_precheck(self) -> None:
+        ok, msg = validate(NO_TOKENS)
+        self.assertTrue(ok)
+        self.assertIn("no initial tokens", msg)
+        ok, msg = validate(NO_TOKENS.replace("            - id: p1\n", "            - id: p1\n              evolve:\n                initialTokens:\n                  - value: 1\n"))
+        self.assertEqual((ok, msg), (True, "ok"))
+        ok, msg = validate(NO_TOKENS.replace("source: p1\n              target: t1", "source: t1\n              target: p1"))
+        self.assertFalse(ok)
+        self.assertIn("no transition can ever fire", msg)
+
+    def test_precheck_hints(self) -> None:
+        net = build_net([("p", "t"), ("t", "q"), ("r", "t_u"), ("t_src", "p")], {"p": 1}, places=["lone"])
+        can_fire, hints = invariants.precheck(net)
+        self.assertTrue(can_fire)
+        self.assertEqual(hints, [
+            "transitions without input places never fire: t_src",
+            "places on no arc: lone",
+            "transitions reading unmarked source places never fire: t_u",
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
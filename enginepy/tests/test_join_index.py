@@ -0,0 +1,123 @@
+import json
+import unittest
+
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.join_index import JoinIndex
+from enginepy.marking import Marking
+from enginepy.pnml_engine import SCHEDULER_INCREMENTAL, PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+from enginepy.tests.nets import JOIN
+from enginepy.vector_engine import is_uncoloured
+
+
+
+class JoinIndexTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_parser_reads_join_key(self) -> None:
+        net, _ = parse_pnml(JOIN)
+        self.assertEqual(net.transitions["t_join"].join_key, "rid")
+        self.assertFalse(is_uncoloured(net))
+
+    def test_index_tracks_appends_and_external_edits(self) -> None:
+        marking = Marking({"a": [{"rid": 1}, {"rid": 2}], "b": [{"rid": 2}]})
+        join = JoinIndex("rid", ["a", "b"])
+        join.sync(marking)
+        self.assertEqual(join.match(), [{"rid": 2}, {"rid": 2}])
+        marking["b"].append({"rid": 1})
+        join.sync(marking)
+        self.assertEqual(list(join.ready), [2, 1])
+        marking["a"] = [json.dumps({"rid": 1})]
+        join.sync(marking)
+        self.assertEqual(join.match(), ['{"rid": 1}', {"rid": 1}])
+
+    def test_locate_tracks_positions_across_removals(self) -> None:
+        marking = Marking({"a": [{"rid": i % 7} for i in range(40)], "b": [{"rid": i % 5} for i in range(30)]})
+        join = JoinIndex("rid", ["a", "b"])
+        other = JoinIndex("rid", ["a"])
+        for round_ in range(25):
+            join.sync(marking)
+            other.sync(marking)
+            if round_ % 3 == 0:
+                # Another transition takes the head of a.
+                token = marking.consume("a")
+                join.discard(marking, "a", 0, token)
+                other.discard(marking, "a", 0, token)
+                continue
+            found = join.find()
+            if found is None:
+                break
+            value, tokens = found
+            for pid, expected in zip(join.in_places, tokens):
+                position, token = join.locate(pid, value)
+                self.assertIs(marking[pid][position], token)
+                self.assertIs(token, expected)
+                del marking[pid][position]
+                join.discard(marking, pid, position, token)
+                if pid == "a":
+                    other.discard(marking, pid, position, token)
+            marking["b"].append({"rid": round_ % 7})
+        for index in (join, other):
+            index.sync(marking)
+            fresh = JoinIndex("rid", index.in_places)
+            fresh.sync(marking)
+            for pid, buckets in fresh.buckets.items():
+                self.assertEqual({v: [t for _, t in b] for v, b in index.buckets[pid].items()},
+                                 {v: [t for _, t in b] for v, b in buckets.items()})
+                for value in buckets:
+                    position, token = index.locate(pid, value)
+                    self.assertIs(marking[pid][position], token)
+
+    def test_engine_fires_on_correlated_tokens(self) -> None:
+        for mode in ("scan", SCHEDULER_INCREMENTAL):
+            net, _ = parse_pnml(JOIN)
+            engine = PNMLEngine(net, scheduler_mode=mode)
+            engine.marking["p_req"].extend([{"rid": i, "kind": "req"} for i in range(5)])
+            engine.marking["p_resp"].extend([{"rid": i, "kind": "resp"} for i in reversed(range(1, 5))])
+            stats = engine.run()
+            self.assertEqual(stats.steps, 4)
+            pairs = list(engine.marking["p_done"])
+            self.assertEqual([t["rid"] for t in pairs[::2]], [t["rid"] for t in pairs[1::2]])
+            self.assertEqual(engine.marking["p_req"], [{"rid": 0, "kind": "req"}])
+            self.assertEqual(engine.marking["p_resp"], [])
+
+    def test_guards_see_matched_tokens(self) -> None:
+        register_inscription(build_registry_key("joiner", "t_join", "guard"), lambda token=None: token["rid"] != 1)
+        net, _ = parse_pnml(JOIN.replace(
+            "                joinKey: rid\n",
+            "                joinKey: rid\n"
+            "                inscriptions:\n"
+            "                  - id: g\n"
+            "                    language: python\n"
+            "                    kind: guard\n",
+        ))
+        engine = PNMLEngine(net)
+        engine.marking["p_req"].extend([{"rid": 1}, {"rid": 2}])
+        engine.marking["p_resp"].extend([{"rid": 1}, {"rid": 2}])
+        self.assertEqual(engine.step_once(), "t_join")
+        self.assertEqual(engine.marking["p_done"], [{"rid": 2}, {"rid": 2}])
+        self.assertIsNone(engine.step_once())
+
+    def test_guard_runs_once_per_firing(self) -> None:
+        calls = []
+        register_inscription(build_registry_key("joiner", "t_join", "guard"), lambda token=None: calls.append(token) or True)
+        net, _ = parse_pnml(JOIN.replace(
+            "                joinKey: rid\n",
+            "                joinKey: rid\n"
+            "                inscriptions:\n"
+            "                  - id: g\n"
+            "                    language: python\n"
+            "                    kind: guard\n",
+        ))
+        for mode in ("scan", SCHEDULER_INCREMENTAL):
+            calls.clear()
+            engine = PNMLEngine(net, scheduler_mode=mode)
+            engine.marking["p_req"].extend([{"rid": 1}, {"rid": 2}])
+            engine.marking["p_resp"].extend([{"rid": 2}, {"rid": 1}])
+            self.assertEqual(engine.run().steps, 2)
+            self.assertEqual(len(calls), 2, mode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import time
+import unittest
+
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.journal import JournalError, apply_record, read_journal
+from enginepy.pnml_engine import DebugEngine, PNMLEngine, PendingOp
+from enginepy.pnml_parser import parse_pnml
+from enginepy.tests.nets import FORMS, JOIN
+
+
+class JournalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_registry()
+        self.calls = 0
+
+        def form(token=None):
+            self.calls += 1
+            return AsyncOpRequest(operation_type="form", resume_token=f"tok-{token}")
+
+        register_inscription(build_registry_key("forms", "t_form", "expression"), form)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run", "forms.journal")
+
+    def tearDown(self) -> None:
+        clear_registry()
+        self.tmp.cleanup()
+
+    def _recorded_run(self) -> PNMLEngine:
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        engine.marking["p1"].append("second")
+        engine.start_journal(self.path, sync_every=2)
+        self.assertIsInstance(engine.step_once(), PendingOp)
+        engine.submit_async(resume_token="tok-first", result={"ok": 1})
+        engine.run()
+        engine.step_once()
+        engine.stop_journal()
+        return engine
+
+    def test_replay_rebuilds_state_without_running_inscriptions(self) -> None:
+        engine = self._recorded_run()
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(list(engine.pending_ops_by_token), ["tok-second"])
+
+        replayed = PNMLEngine.replay(parse_pnml(FORMS)[0], self.path)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(replayed.marking, engine.marking)
+        self.assertEqual(replayed.run_id, engine.run_id)
+        self.assertEqual(list(replayed.pending_ops_by_token), ["tok-second"])
+        replayed.submit_async(resume_token="tok-second", result="late")
+        self.assertEqual(replayed.run().firings, {"t_next": 2})
+        self.assertIn("late", replayed.marking["p3"])
+
+    def test_idle_journal_syncs_after_interval(self) -> None:
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        journal = engine.start_journal(self.path, sync_every=1000, sync_interval=0.01)
+        engine.step_once()
+        self.assertEqual(journal.records, 1)
+        deadline = time.monotonic() + 2
+        while journal._unsynced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(journal._unsynced, 0)
+        engine.stop_journal()
+        self.assertFalse(journal._flusher.is_alive())
+
+    def test_replay_repeats_correlated_join_removals(self) -> None:
+        engine = PNMLEngine(parse_pnml(JOIN)[0])
+        engine.start_journal(self.path)
+        engine.marking["p_req"].extend([{"rid": i} for i in range(5)])
+        engine.marking["p_resp"].extend([{"rid": i} for i in (3, 1, 4)])
+        engine.run()
+        engine.stop_journal()
+
+        # Marking edits made after the journal opened are not part of it; replay them by hand.
+        replayed = PNMLEngine(parse_pnml(JOIN)[0])
+        _header, records = read_journal(self.path)
+        replayed.marking["p_req"].extend([{"rid": i} for i in range(5)])
+        replayed.marking["p_resp"].extend([{"rid": i} for i in (3, 1, 4)])
+        for record in records:
+            apply_record(replayed, record)
+        self.assertEqual(replayed.marking, engine.marking)
+        self.assertEqual(replayed.marking["p_req"], [{"rid": 0}, {"rid": 2}])
+
+    def test_replay_stops_at_torn_record(self) -> None:
+        engine = self._recorded_run()
+        _header, records = read_journal(self.path)
+        self.assertEqual(len(list(records)), 5)
+        with open(self.path, "r+b") as handle:
+            handle.truncate(os.path.getsize(self.path) - 3)
+
+        replayed = PNMLEngine.replay(parse_pnml(FORMS)[0], self.path)
+        self.assertEqual(replayed.pending_ops_by_token, {})
+        self.assertNotEqual(replayed.marking, engine.marking)
+        self.assertEqual(len(replayed.marking["p3"]), 2)
+
+    def test_rejects_other_files(self) -> None:
+        self._recorded_run()
+        other, _ = parse_pnml(FORMS.replace("id: forms", "id: other"))
+        with self.assertRaises(JournalError):
+            PNMLEngine.replay(other, self.path)
+        with open(self.path, "wb") as handle:
+            handle.write(b"nope")
+        with self.assertRaises(JournalError):
+            read_journal(self.path)
+
+    def test_debug_engine_replays_into_history(self) -> None:
+        engine = self._recorded_run()
+        debug = DebugEngine()
+        debug.load(FORMS)
+        self.assertEqual(debug.replay_journal(self.path), 5)
+        self.assertEqual([entry.transition_id for entry in debug.history], ["t_form", "t_next", "t_next", "t_form"])
+        self.assertEqual(debug.engine.marking, engine.marking)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from enginepy.marking import Marking, TokenQueue
+
+
+class MarkingTests(unittest.TestCase):
+    def test_list_compatibility(self) -> None:
+        marking = Marking({"p1": ["a", "b"]})
+        self.assertEqual(marking["p1"], ["a", "b"])
+        self.assertEqual(repr(marking), "{'p1': ['a', 'b']}")
+        self.assertEqual(marking["p1"].pop(0), "a")
+        marking.setdefault("p2", []).append("c")
+        self.assertIsInstance(marking["p2"], TokenQueue)
+        marking["p3"] = ["d"]
+        self.assertIsInstance(marking["p3"], TokenQueue)
+        self.assertEqual(marking.snapshot(), {"p1": ["b"], "p2": ["c"], "p3": ["d"]})
+
+    def test_fifo_consume_produce_and_counts(self) -> None:
+        marking = Marking({"p1": []})
+        marking.produce("p1", range(5))
+        marking.produce("p_new", ["x"])
+        self.assertEqual(marking.count("p1"), 5)
+        self.assertEqual(marking.count("missing"), 0)
+        self.assertEqual(marking.head("p1"), 0)
+        self.assertEqual([marking.consume("p1") for _ in range(5)], [0, 1, 2, 3, 4])
+        self.assertEqual(marking["p_new"], ["x"])
+
+    def test_listeners_see_every_mutation(self) -> None:
+        marking = Marking({"p1": ["a"]})
+        seen = []
+        marking.add_listener(seen.append)
+        marking.consume("p1")
+        marking.produce("p2", ["b"])
+        marking["p2"].append("c")
+        marking.setdefault("p3", ["d"])
+        marking["p4"] = []
+        self.assertEqual(seen, ["p1", "p2", "p2", "p3", "p4"])
+
+    def test_head_version_changes_only_with_head(self) -> None:
+        marking = Marking({"p1": ["a"]})
+        version = marking.head_version("p1")
+        marking["p1"].append("b")
+        marking.produce("p1", ["c"])
+        self.assertEqual(marking.head_version("p1"), version)
+        marking.consume("p1")
+        self.assertNotEqual(marking.head_version("p1"), version)
+        version = marking.head_version("p1")
+        marking["p1"].appendleft("z")
+        self.assertNotEqual(marking.head_version("p1"), version)
+        self.assertNotEqual(Marking({"p1": ["a"]}).head_version("p1"), Marking({"p1": ["a"]}).head_version("p1"))
+
+    def test_view_is_read_only_dict_of_lists(self) -> None:
+        marking = Marking({"p1": ["a"]})
+        view = marking.view()
+        tokens = view["p1"]
+        self.assertIsInstance(tokens, list)
+        tokens.append("b")
+        self.assertEqual(marking["p1"], ["a"])
+        self.assertEqual(dict(view.items()), {"p1": ["a"]})
+        with self.assertRaises(TypeError):
+            view["p1"] = []  # type: ignore[index]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import unittest
+
+from enginepy.async_engine import AsyncPNMLEngine
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pending_ops import PendingOpTable
+from enginepy.pnml_engine import PNMLEngine, PendingOp
+from enginepy.pnml_parser import parse_pnml
+
+FORMS = """
+pnml:
+  net:
+    - id: forms
+      page:
+        - id: page1
+          place:
+            - id: p1
+            - id: p2
+          transition:
+            - id: t1
+              evolve:
+                inscriptions:
+                  - id: in_form
+                    language: python
+                    kind: expression
+                    execMode: async
+                    source: inline
+                    code: |
+                      return None
+          arc:
+            - id: a1
+              source: p1
+              target: t1
+            - id: a2
+              source: t1
+              target: p2
+"""
+
+FORM_KEY = build_registry_key("forms", "t1", "expression")
+
+
+def _op(op_id: int, timeout_ms=None, token=None) -> PendingOp:
+    return PendingOp(
+        id=op_id,
+        transition_id="t1",
+        inscription_id=None,
+        transition_name="t1",
+        transition_description=None,
+        net_id="forms",
+        run_id="run",
+        operation_type="form",
+        resume_token=token,
+        output_places=["p2"],
+        moved_tokens=[],
+        metadata={"timeout_ms": timeout_ms} if timeout_ms else None,
+    )
+
+
+class PendingOpTableTests(unittest.TestCase):
+    def test_deadlines_skip_completed_ops(self) -> None:
+        table = PendingOpTable()
+        first, second, untimed = _op(1, 100), _op(2, 500, "tok"), _op(3)
+        for op in (first, second, untimed):
+            table.add(op, now=10.0)
+        self.assertEqual(table.next_deadline(), 10.1)
+        table.remove(first)
+        self.assertEqual(table.next_deadline(), 10.5)
+        self.assertEqual(table.pop_expired(now=10.4), [])
+        self.assertEqual(table.pop_expired(now=10.5), [second])
+        self.assertNotIn("tok", table.by_token)
+        self.assertIsNone(table.next_deadline())
+        self.assertEqual(list(table.by_id), [3])
+
+
+class PendingOpEngineTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_ops_created_together_get_distinct_ids_and_tokens(self) -> None:
+        register_inscription(FORM_KEY, lambda token=None: AsyncOpRequest(operation_type="form"))
+        net, _ = parse_pnml(FORMS)
+        engine = AsyncPNMLEngine(net)
+        engine.marking["p1"].extend(range(50))
+        stats = asyncio.run(engine.arun(idle_timeout=0.0))
+        self.assertEqual(stats.stop_reason, "pending")
+        self.assertEqual(len(engine.pending_ops_by_id), 50)
+        self.assertEqual(len(engine.pending_ops_by_token), 50)
+
+    def test_timed_out_op_becomes_error_token(self) -> None:
+        register_inscription(FORM_KEY, lambda token=None: AsyncOpRequest(operation_type="form", timeout_ms=1000))
+        net, _ = parse_pnml(FORMS)
+        engine = PNMLEngine(net)
+        engine.marking["p1"].append("req")
+        pending = engine.step_once()
+        self.assertIsInstance(pending, PendingOp)
+        deadline = engine.next_deadline()
+        self.assertEqual(deadline, pending.deadline)
+        self.assertEqual(engine.expire_pending(now=deadline - 0.5), [])
+        self.assertEqual(engine.expire_pending(now=deadline), [pending])
+        self.assertEqual(engine.pending_ops_by_id, {})
+        self.assertIn("timeout", engine.marking["p2"][0]["error"])
+        self.assertEqual(engine.marking["p2"][1], "req")
+        engine.submit_async(op_id=pending.id, result="late")
+        self.assertEqual(len(engine.marking["p2"]), 2)
+        self.assertIsNone(engine.next_deadline())
+
+    def test_async_engine_sleeps_until_deadline(self) -> None:
+        register_inscription(FORM_KEY, lambda token=None: AsyncOpRequest(operation_type="form", timeout_ms=20))
+        net, _ = parse_pnml(FORMS)
+        engine = AsyncPNMLEngine(net)
+        engine.marking["p1"].append("req")
+        stats = asyncio.run(engine.arun(idle_timeout=5.0))
+        self.assertEqual(stats.stop_reason, "quiescent")
+        self.assertLess(stats.wall_time, 1.0)
+        self.assertIn("error", engine.marking["p2"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
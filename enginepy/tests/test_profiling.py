@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import types
+import unittest
+
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pnml_dap import PNMLDAPServer
+from enginepy.pnml_engine import PNMLEngine, PendingOp
+from enginepy.pnml_parser import Inscription, parse_pnml
+from enginepy.profiling import LogHistogram, bucket_bounds, bucket_index, slowest
+from enginepy.tests.nets import FORMS
+
+FORM_KEY = build_registry_key("forms", "t_form", "expression")
+
+
+class LogHistogramTests(unittest.TestCase):
+    def test_buckets_cover_values_within_relative_error(self) -> None:
+        previous_upper = -1
+        for index in range(bucket_index(10**12) + 1):
+            lower, upper = bucket_bounds(index)
+            self.assertEqual(lower, previous_upper + 1)
+            self.assertLessEqual(upper - lower, max(lower // 16, 0))
+            previous_upper = upper
+        for value in (0, 7, 31, 32, 1000, 123_456_789):
+            lower, upper = bucket_bounds(bucket_index(value))
+            self.assertTrue(lower <= value <= upper)
+
+    def test_percentiles_and_merge(self) -> None:
+        hist = LogHistogram()
+        for value in range(1, 1001):
+            hist.record(value * 1000)
+        self.assertEqual((hist.count, hist.min, hist.max), (1000, 1000, 1_000_000))
+        self.assertAlmostEqual(hist.percentile(50), 500_000, delta=500_000 / 16)
+        self.assertEqual(hist.percentile(100), 1_000_000)
+        other = LogHistogram()
+        other.record(5)
+        hist.merge(other)
+        self.assertEqual((hist.count, hist.min), (1001, 5))
+        data = hist.to_dict()
+        self.assertEqual(sum(bucket[2] for bucket in data["buckets"]), 1001)
+        self.assertAlmostEqual(data["max"], 0.001)
+
+
+class EngineProfilingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_registry()
+        register_inscription(FORM_KEY, lambda token=None: AsyncOpRequest(operation_type="form", resume_token="tok"))
+        self.net, _ = parse_pnml(FORMS)
+        self.net.transitions["t_next"].inscriptions.append(Inscription(id="g_next", kind="guard", func=lambda token: True))
+
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_metrics_cover_guards_expressions_waits_and_pending_ops(self) -> None:
+        engine = PNMLEngine(self.net)
+        self.assertFalse(engine.metrics()["profiling"])
+        engine.start_profiling()
+        self.assertIsInstance(engine.step_once(), PendingOp)
+        engine.submit_async(resume_token="tok", result={"ok": 1})
+        engine.run()
+
+        metrics = engine.metrics()
+        self.assertTrue(metrics["profiling"])
+        self.assertEqual(metrics["firings"], {"t_form": 1, "t_next": 2})
+        self.assertEqual(metrics["expressions"][FORM_KEY]["count"], 1)
+        self.assertGreaterEqual(metrics["guards"]["g_next"]["count"], 1)
+        self.assertEqual(metrics["pending_ops"]["t_form"]["count"], 1)
+        self.assertEqual(metrics["token_wait"]["p1"]["count"], 1)
+        # The form result and the moved token both reach p2, so t_next fires twice.
+        self.assertEqual(metrics["token_wait"]["p2"]["count"], 2)
+        self.assertEqual(slowest(metrics, "expressions")[0][0], FORM_KEY)
+        self.assertEqual(metrics["inscriptions"][FORM_KEY]["calls"], 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            engine.export_metrics(path)
+            with open(path, "r", encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle)["firings"], metrics["firings"])
+        engine.stop_profiling()
+        self.assertNotIn("firings", engine.metrics())
+
+    def test_dap_metrics_request(self) -> None:
+        server = PNMLDAPServer(start_reader=False)
+        server.engine.load(FORMS)
+        responses = []
+        server.protocol.send_response = types.MethodType(lambda _self, request, body=None: responses.append(body), server.protocol)
+        server.handle_metrics({"arguments": {"start": True}})
+        server.engine.engine.step_once()
+        server.handle_metrics({"arguments": {}})
+        self.assertTrue(responses[0]["metrics"]["profiling"])
+        self.assertEqual(responses[1]["metrics"]["firings"], {"t_form": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import random
+import unittest
+
+from enginepy.analysis.reachability import REDUCTION_STUBBORN, STOP_MAX_MEMORY, STOP_MAX_STATES, StateSpace, explore
+from enginepy.tests.nets import build_net, fork_join
+
+
+
+
+class ReachabilityTests(unittest.TestCase):
+    def test_workflow_terminates_without_deadlock(self) -> None:
+        net = build_net([("start", "t1"), ("t1", "mid"), ("mid", "t2"), ("t2", "end")], {"start": 1})
+        report = explore(net)
+        self.assertEqual((report.states, report.edges), (3, 2))
+        self.assertTrue(report.deadlock_free)
+        self.assertEqual(report.terminal_count, 1)
+        self.assertEqual(report.dead_transitions, [])
+        self.assertTrue(report.safe)
+
+    def test_reports_deadlocks_dead_transitions_and_bounds(self) -> None:
+        # t_left and t_right compete for the one start token; t_join needs both branches.
+        net = build_net(
+            [
+                ("start", "t_left"), ("start", "t_right"),
+                ("t_left", "left"), ("t_right", "right"),
+                ("left", "t_join"), ("right", "t_join"), ("t_join", "end"),
+            ],
+            {"start": 1},
+        )
+        report = explore(net)
+        self.assertEqual(report.deadlock_count, 2)
+        self.assertFalse(report.deadlock_free)
+        self.assertIn({"left": 1}, report.deadlocks)
+        self.assertEqual(report.dead_transitions, ["t_join"])
+        self.assertEqual(report.bounds["end"], 0)
+        self.assertIn("deadlock_free", report.to_dict())
+
+    def test_firing_moves_consumed_tokens_like_the_engine(self) -> None:
+        net = build_net([("a", "t"), ("b", "t"), ("t", "c"), ("t", "d")], {"a": 1, "b": 1})
+        space = StateSpace(net)
+        (t, state), = space.successors(space.initial)
+        self.assertEqual(space.marking_of(state), {"c": 2, "d": 2})
+
+    def test_limits_stop_unbounded_nets(self) -> None:
+        net = build_net([("p", "t"), ("t", "p"), ("t", "q")], {"p": 1})
+        report = explore(net, max_states=50)
+        self.assertEqual((report.complete, report.stop_reason, report.states), (False, STOP_MAX_STATES, 50))
+        self.assertFalse(report.deadlock_free)
+        report = explore(net, max_states=10**7, max_memory_mb=0.5)
+        self.assertEqual(report.stop_reason, STOP_MAX_MEMORY)
+
+    def test_orders_and_modes_agree(self) -> None:
+        net = fork_join(6)
+        expected = explore(net)
+        self.assertEqual(expected.states, 2 + 2 ** 6)
+        for kwargs in ({"order": "dfs"}, {"exact": True}, {"workers": 2, "chunk_size": 16}):
+            report = explore(net, **kwargs)
+            self.assertEqual((report.states, report.edges), (expected.states, expected.edges), kwargs)
+            self.assertTrue(report.deadlock_free)
+            self.assertEqual(report.bounds, expected.bounds)
+
+    def test_stubborn_reduction_keeps_dead_markings(self) -> None:
+        net = fork_join(8)
+        full = explore(net)
+        reduced = explore(net, reduction=REDUCTION_STUBBORN)
+        self.assertEqual(full.states, 2 + 2 ** 8)
+        self.assertEqual(reduced.states, 2 + 8 + 1)
+        self.assertEqual((reduced.terminal_count, reduced.deadlock_count), (1, 0))
+        self.assertEqual(reduced.dead_transitions, [])
+        parallel = explore(net, reduction=REDUCTION_STUBBORN, workers=2, chunk_size=1)
+        self.assertEqual(parallel.states, reduced.states)
+
+        rng = random.Random(7)
+        for _ in range(60):
+            places = [f"p{i}" for i in range(rng.randint(3, 6))]
+            arcs = []
+            for t in range(rng.randint(2, 6)):
+                arcs += [(rng.choice(places), f"t{t}") for _ in range(rng.randint(1, 2))]
+                arcs += [(f"t{t}", rng.choice(places)) for _ in range(rng.randint(0, 2))]
+            random_net = build_net(arcs, {rng.choice(places): rng.randint(1, 2)}, places=places)
+            full = explore(random_net, max_states=5000, exact=True, max_reports=5000)
+            if not full.complete:
+                continue
+            reduced = explore(random_net, max_states=5000, exact=True, max_reports=5000, reduction=REDUCTION_STUBBORN)
+            self.assertLessEqual(reduced.states, full.states)
+            self.assertEqual(
+                (reduced.deadlock_count, reduced.terminal_count, sorted(map(sorted, map(dict.items, reduced.deadlocks)))),
+                (full.deadlock_count, full.terminal_count, sorted(map(sorted, map(dict.items, full.deadlocks)))),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
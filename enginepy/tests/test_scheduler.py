@@ -0,0 +1,118 @@
+import unittest
+
+from enginepy.pnml_engine import SCHEDULER_INCREMENTAL, PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+from enginepy.scheduler import FifoScheduler, RandomScheduler, TransitionScheduler, make_scheduler
+from enginepy.tests.nets import build_net, fork_join
+
+PRIORITY_NET = """
+pnml:
+  net:
+    - id: prio
+      page:
+        - id: page1
+          place:
+            - id: p
+              evolve:
+                initialTokens:
+                  - value: 1
+            - id: low_out
+            - id: high_out
+          transition:
+            - id: t_low
+            - id: t_high
+              evolve:
+                priority: 5
+          arc:
+            - id: a1
+              source: p
+              target: t_low
+            - id: a2
+              source: p
+              target: t_high
+            - id: a3
+              source: t_low
+              target: low_out
+            - id: a4
+              source: t_high
+              target: high_out
+"""
+
+
+def loops():
+    """Two self-loops that are always enabled; the default choice starves t_b."""
+    return build_net([("a", "t_a"), ("t_a", "a"), ("b", "t_b"), ("t_b", "b")], {"a": 1, "b": 1})
+
+
+def fired(engine, steps):
+    return [engine.step_once() for _ in range(steps)]
+
+
+class SchedulerTests(unittest.TestCase):
+    def test_default_policy_keeps_historical_choice(self) -> None:
+        self.assertEqual(fired(PNMLEngine(loops()), 4), ["t_a"] * 4)
+        for mode in ("scan", SCHEDULER_INCREMENTAL):
+            engine = PNMLEngine(fork_join(3), scheduler_mode=mode)
+            self.assertEqual(engine.run().firings, {"t_fork": 1, "t_0": 1, "t_1": 1, "t_2": 1, "t_join": 1})
+
+    def test_priority_from_evolve_block(self) -> None:
+        net, _ = parse_pnml(PRIORITY_NET)
+        self.assertEqual(net.transitions["t_high"].priority, 5)
+        self.assertEqual(net.transitions["t_low"].priority, 0)
+        self.assertEqual(PNMLEngine(net).step_once(), "t_low")
+        net, _ = parse_pnml(PRIORITY_NET)
+        self.assertEqual(PNMLEngine(net, scheduler="priority").step_once(), "t_high")
+
+    def test_fair_policies_do_not_starve(self) -> None:
+        for policy in ("fifo", "round_robin"):
+            for mode in ("scan", SCHEDULER_INCREMENTAL):
+                engine = PNMLEngine(loops(), scheduler_mode=mode, scheduler=policy)
+                self.assertEqual(fired(engine, 4), ["t_a", "t_b", "t_a", "t_b"], (policy, mode))
+
+    def test_seeded_random_is_reproducible(self) -> None:
+        runs = [fired(PNMLEngine(loops(), scheduler="random", seed=7), 40) for _ in range(2)]
+        self.assertEqual(runs[0], runs[1])
+        self.assertEqual(set(runs[0]), {"t_a", "t_b"})
+
+    def test_heap_discard_and_compaction(self) -> None:
+        scheduler = FifoScheduler()
+        for i in range(100):
+            scheduler.add(f"t{i}")
+        for i in range(99):
+            scheduler.discard(f"t{i}")
+        self.assertEqual(len(scheduler), 1)
+        self.assertLess(len(scheduler._heap), 40)
+        self.assertEqual(scheduler.choose(), "t99")
+        scheduler.sync(["t5", "t99"])
+        self.assertEqual(scheduler.choose(), "t99")
+        scheduler.fired("t99")
+        self.assertEqual(scheduler.choose(), "t5")
+
+    def test_random_indexed_set(self) -> None:
+        scheduler = RandomScheduler(seed=1)
+        for tid in ("a", "b", "c"):
+            scheduler.add(tid)
+        scheduler.discard("a")
+        self.assertEqual(sorted(scheduler.members()), ["b", "c"])
+        self.assertIn(scheduler.choose(), ("b", "c"))
+        scheduler.discard("b")
+        scheduler.discard("c")
+        self.assertIsNone(scheduler.choose())
+
+    def test_sync_reports_changes(self) -> None:
+        scheduler = RandomScheduler(seed=1)
+        self.assertTrue(scheduler.sync(["c", "a", "b"]))
+        self.assertEqual(scheduler._items, ["a", "b", "c"])
+        positions = scheduler._positions
+        self.assertFalse(scheduler.sync(["b", "c", "a"]))
+        self.assertIs(scheduler._positions, positions)
+        self.assertTrue(scheduler.sync(["c"]))
+        self.assertEqual(list(scheduler.members()), ["c"])
+        with self.assertRaises(TypeError):
+            TransitionScheduler()  # type: ignore[abstract]
+        with self.assertRaises(ValueError):
+            make_scheduler("lottery")
+
+
+if __name__ == "__main__":
+    unittest.main()
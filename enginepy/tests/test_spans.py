@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+
+from enginepy.async_ops import AsyncOpRequest
+from enginepy.inscription_registry import build_registry_key, clear_registry, register_inscription
+from enginepy.pnml_engine import STEP_CONCURRENT, PNMLEngine, PendingOp
+from enginepy.pnml_parser import Inscription, parse_pnml
+from enginepy.tests.nets import FORMS, fork_join
+from enginepy.trace.spans import read_spans, trace_id_for
+
+
+def attributes(span):
+    return {attr["key"]: next(iter(attr["value"].values())) for attr in span.get("attributes", [])}
+
+
+class SpanExportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_registry()
+        register_inscription(
+            build_registry_key("forms", "t_form", "expression"),
+            lambda token=None: AsyncOpRequest(operation_type="form", resume_token="tok"),
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "traces", "run.otlp.jsonl")
+
+    def tearDown(self) -> None:
+        clear_registry()
+        self.tmp.cleanup()
+
+    def _spans(self):
+        return [span for _resource, span in read_spans(self.path)]
+
+    def test_async_op_links_firings_causally(self) -> None:
+        net, _ = parse_pnml(FORMS)
+        net.transitions["t_next"].inscriptions.append(Inscription(id="g_next", kind="guard", func=lambda token: True))
+        engine = PNMLEngine(net)
+        engine.start_tracing(self.path, batch_size=2)
+        self.assertIsInstance(engine.step_once(), PendingOp)
+        engine.submit_async(resume_token="tok", result={"ok": 1})
+        engine.run()
+        engine.stop_tracing()
+
+        spans = self._spans()
+        self.assertEqual({span["traceId"] for span in spans}, {trace_id_for(engine.run_id)})
+        by_name = {}
+        for span in spans:
+            by_name.setdefault(span["name"], []).append(span)
+        form, = by_name["fire t_form"]
+        op, = by_name["async form"]
+        nexts = by_name["fire t_next"]
+        self.assertNotIn("parentSpanId", form)
+        self.assertEqual(op["parentSpanId"], form["spanId"])
+        self.assertEqual(attributes(op)["pnml.op.resume_token"], "tok")
+        self.assertEqual(attributes(form)["pnml.op.id"], attributes(op)["pnml.op.id"])
+        self.assertEqual(len(nexts), 2)
+        self.assertTrue(all(span["parentSpanId"] == op["spanId"] for span in nexts))
+        guards = by_name["guard g_next"]
+        self.assertTrue(guards)
+        self.assertEqual({span["parentSpanId"] for span in guards}, {op["spanId"]})
+        for span in spans:
+            self.assertLessEqual(int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"]))
+
+        with open(self.path, "r", encoding="utf-8") as handle:
+            lines = [json.loads(line) for line in handle]
+        self.assertGreater(len(lines), 1)
+        resource = lines[0]["resourceSpans"][0]["resource"]
+        self.assertIn({"key": "pnml.run.id", "value": {"stringValue": engine.run_id}}, resource["attributes"])
+
+    def test_concurrent_join_links_every_producer(self) -> None:
+        engine = PNMLEngine(fork_join(3), step_semantics=STEP_CONCURRENT)
+        engine.start_tracing(self.path)
+        engine.run()
+        engine.stop_tracing()
+        spans = {span["name"]: span for span in self._spans()}
+        branches = {spans[f"fire t_{i}"]["spanId"] for i in range(3)}
+        for i in range(3):
+            self.assertEqual(spans[f"fire t_{i}"]["parentSpanId"], spans["fire t_fork"]["spanId"])
+        join = spans["fire t_join"]
+        self.assertEqual({join["parentSpanId"]} | {link["spanId"] for link in join["links"]}, branches)
+
+    def test_stop_tracing_closes_open_ops(self) -> None:
+        engine = PNMLEngine(parse_pnml(FORMS)[0])
+        engine.start_tracing(self.path)
+        engine.step_once()
+        engine.stop_tracing()
+        self.assertIsNone(engine.tracer)
+        op, = [span for span in self._spans() if span["name"] == "async form"]
+        self.assertTrue(attributes(op)["pnml.op.open"])
+
+
+if __name__ == "__main__":
+    unittest.main()
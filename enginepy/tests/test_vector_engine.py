@@ -0,0 +1,152 @@
+import unittest
+
+from benchmarks.netgen import dense_conflict
+from enginepy.pnml_engine import PNMLEngine
+from enginepy.pnml_parser import parse_pnml
+from enginepy.vector_engine import VectorEngine, create_engine, is_uncoloured, np
+
+FORK_JOIN = """
+pnml:
+  net:
+    - id: fork_join
+      page:
+        - id: page1
+          place:
+            - id: p_start
+              evolve:
+                initialTokens:
+                  - value: start
+                  - value: start
+            - id: p_a
+            - id: p_b
+            - id: p_a_done
+            - id: p_b_done
+            - id: p_end
+          transition:
+            - id: t_fork
+            - id: t_a
+            - id: t_b
+            - id: t_join
+          arc:
+            - id: a1
+              source: p_start
+              target: t_fork
+            - id: a2
+              source: t_fork
+              target: p_a
+            - id: a3
+              source: t_fork
+              target: p_b
+            - id: a4
+              source: p_a
+              target: t_a
+            - id: a5
+              source: t_a
+              target: p_a_done
+            - id: a6
+              source: p_b
+              target: t_b
+            - id: a7
+              source: t_b
+              target: p_b_done
+            - id: a8
+              source: p_a_done
+              target: t_join
+            - id: a9
+              source: p_b_done
+              target: t_join
+            - id: a10
+              source: t_join
+              target: p_end
+"""
+
+WITH_GUARD = """
+pnml:
+  net:
+    - id: guarded
+      page:
+        - id: page1
+          place:
+            - id: p1
+          transition:
+            - id: t1
+              evolve:
+                inscriptions:
+                  - id: g1
+                    language: python
+                    kind: guard
+                    source: inline
+                    code: |
+                      True
+"""
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class VectorEngineTests(unittest.TestCase):
+    def test_matches_dict_engine(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        vector = create_engine(net, vector=True)
+        self.assertNotIsInstance(vector, PNMLEngine)
+        dict_net, _ = parse_pnml(FORK_JOIN)
+        reference = PNMLEngine(dict_net)
+        fired = []
+        while True:
+            tid = reference.step_once()
+            if tid is None:
+                break
+            fired.append(tid)
+            self.assertEqual(vector.step_once(), tid)
+        self.assertIsNone(vector.step_once())
+        expected = {pid: len(tokens) for pid, tokens in reference.marking.items()}
+        self.assertEqual(vector.marking_counts(), expected)
+        self.assertEqual(expected["p_end"], 4)
+
+    def test_conflicting_transitions_fire_in_dict_engine_order(self) -> None:
+        for seed in range(5):
+            text = dense_conflict(12, 30, tokens=2, seed=seed)
+            vector = create_engine(parse_pnml(text)[0])
+            reference = PNMLEngine(parse_pnml(text)[0])
+            while True:
+                tid = reference.step_once()
+                self.assertEqual(vector.step_once(), tid)
+                self.assertEqual(vector.enabled_transitions(), reference.enabled_transitions())
+                if tid is None:
+                    break
+            self.assertEqual(vector.marking_counts(), {pid: len(tokens) for pid, tokens in reference.marking.items()})
+
+    def test_picked_automatically_unless_engine_options_are_given(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        self.assertIsInstance(create_engine(net), VectorEngine)
+        self.assertIsInstance(create_engine(net, scheduler_mode="incremental"), PNMLEngine)
+
+    def test_batch_run_stats(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        engine = create_engine(net, vector=True)
+        stats = engine.run(max_steps=3)
+        self.assertEqual((stats.stop_reason, stats.steps), ("max_steps", 3))
+        stats = engine.run()
+        self.assertEqual(stats.stop_reason, "quiescent")
+        self.assertEqual(stats.steps, 5)
+        self.assertEqual(stats.firings["t_join"], 2)
+        self.assertEqual(engine.enabled_transitions(), [])
+        self.assertEqual(engine.marking["p_end"], ["start"] * 4)
+
+    def test_inscribed_nets_use_dict_engine(self) -> None:
+        net, _ = parse_pnml(WITH_GUARD)
+        self.assertFalse(is_uncoloured(net))
+        self.assertIsInstance(create_engine(net, vector=True), PNMLEngine)
+
+    def test_only_exact_nets_are_uncoloured(self) -> None:
+        net, _ = parse_pnml(FORK_JOIN)
+        self.assertIsInstance(create_engine(net, vector=False), PNMLEngine)
+        net, _ = parse_pnml(FORK_JOIN.replace("- value: start\n", "- value: Red\n", 1))
+        self.assertFalse(is_uncoloured(net))
+        net, _ = parse_pnml(FORK_JOIN)
+        net.arcs.append(net.arcs[0])
+        self.assertFalse(is_uncoloured(net))
+        reference = PNMLEngine(net)
+        self.assertEqual(reference.step_once(), "t_fork")
+
+
+if __name__ == "__main__":
+    unittest.main()
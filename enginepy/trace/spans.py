@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+SCOPE_NAME = "enginepy.pnml_engine"
+SPAN_KIND_INTERNAL = 1
+STATUS_ERROR = 2
+
+
+def trace_id_for(run_id: str) -> str:
+    """32-hex-digit OTLP trace id derived from a run id."""
+    return hashlib.blake2b(run_id.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _new_span_id(rng: random.Random) -> str:
+    return f"{rng.getrandbits(64) or 1:016x}"
+
+
+class Span:
+    """A finished or in-flight span; attributes hold plain str/int/float/bool values."""
+
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "links", "error", "previous")
+
+    def __init__(self, name: str, span_id: str, parent_id: Optional[str], start_ns: int) -> None:
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = start_ns
+        self.attributes: Dict[str, object] = {}
+        self.links: List[str] = []
+        self.error: Optional[str] = None
+        # Span that was current before this one was activated.
+        self.previous: Optional["Span"] = None
+
+
+def _attribute(key: str, value: object) -> Dict[str, object]:
+    if isinstance(value, bool):
+        encoded: Dict[str, object] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def encode_span(span: Span, trace_id: str) -> Dict[str, object]:
+    data: Dict[str, object] = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+        "status": {"code": STATUS_ERROR, "message": span.error} if span.error else {},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    if span.links:
+        data["links"] = [{"traceId": trace_id, "spanId": link} for link in span.links]
+    return data
+
+
+class SpanExporter:
+    """Writes spans to path from a background thread, one OTLP-JSON request per batch.
+
+    Each line of the file is an ExportTraceServiceRequest in its JSON
+    encoding, the format of the OpenTelemetry collector file exporter.
+    submit() only enqueues, so the engine never waits on encoding or I/O. A
+    batch is written once batch_size spans are queued or flush_interval
+    seconds passed; close() drains the queue and stops the thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        trace_id: str,
+        resource: Optional[Dict[str, object]] = None,
+        batch_size: int = 512,
+        flush_interval: float = 0.2,
+    ) -> None:
+        self.path = path
+        self.trace_id = trace_id
+        self.resource = dict(resource or {})
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.exported = 0
+        self._queue: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="pnml-spans", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as handle:
+            stopping = False
+            while not stopping:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch: List[Span] = []
+                deadline = time.monotonic() + self.flush_interval
+                item: Optional[Span] = first
+                while True:
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if batch:
+                    handle.write(json.dumps(self._request(batch), separators=(",", ":")) + "\n")
+                    handle.flush()
+                    self.exported += len(batch)
+
+    def _request(self, batch: List[Span]) -> Dict[str, object]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_attribute(key, value) for key, value in self.resource.items()]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [encode_span(span, self.trace_id) for span in batch],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+class SpanTracer:
+    """Builds firing, guard and async-op spans for one engine, see PNMLEngine.start_tracing().
+
+    A firing's parent is the span that produced the first token it consumed
+    (a firing, or the async op whose completion delivered it); producers of
+    its other consumed tokens become links. Producers are tracked per place in
+    token order, like EngineProfiler arrival times, and forgotten when the
+    marking is edited outside the engine.
+    """
+
+    def __init__(self, run_id: str, exporter: SpanExporter) -> None:
+        self.run_id = run_id
+        self.exporter = exporter
+        self._rng = random.Random()
+        self._local = threading.local()
+        self._producers: Dict[str, Deque[Optional[str]]] = {}
+        self._ops: Dict[int, Span] = {}
+
+    @property
+    def current(self) -> Optional[Span]:
+        return getattr(self._local, "current", None)
+
+    def _start(self, name: str, parent_id: Optional[str], start_ns: Optional[int] = None) -> Span:
+        return Span(name, _new_span_id(self._rng), parent_id, time.time_ns() if start_ns is None else start_ns)
+
+    def _activate(self, span: Span) -> Span:
+        span.previous = self.current
+        self._local.current = span
+        return span
+
+    def finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        if self.current is span:
+            self._local.current = span.previous
+        span.previous = None
+        self.exporter.submit(span)
+
+    def start_firing(self, tid: str) -> Span:
+        span = self._start(f"fire {tid}", None)
+        span.attributes["pnml.transition.id"] = tid
+        span.attributes["pnml.run.id"] = self.run_id
+        return self._activate(span)
+
+    def suspend(self, span: Span) -> None:
+        """Stop attributing tokens to span without finishing it (see resume())."""
+        if self.current is span:
+            self._local.current = span.previous
+        span.previous = None
+
+    def resume(self, span: Span) -> None:
+        """Make a suspended span current again, e.g. while committing a concurrent batch."""
+        self._activate(span)
+
+    def consumed(self, pid: str, position: int, queued: int) -> None:
+        producers = self._producers_for(pid, queued)
+        producer = producers[position]
+        del producers[position]
+        span = self.current
+        if span is None or producer is None:
+            return
+        if span.parent_id is None:
+            span.parent_id = producer
+        elif producer != span.parent_id and producer not in span.links:
+            span.links.append(producer)
+
+    def produced(self, pid: str, count: int, queued: int) -> None:
+        span = self.current
+        producers = self._producers_for(pid, queued - count)
+        producers.extend([span.span_id if span is not None else None] * count)
+
+    def head_producer(self, pid: str, queued: int) -> Optional[str]:
+        producers = self._producers.get(pid)
+        if producers and len(producers) == queued:
+            return producers[0]
+        return None
+
+    def _producers_for(self, pid: str, expected: int) -> Deque[Optional[str]]:
+        producers = self._producers.get(pid)
+        if producers is None or len(producers) != expected:
+            producers = self._producers[pid] = deque([None] * max(expected, 0))
+        return producers
+
+    def guarding(self, tid: str, parent_id: Optional[str]) -> None:
+        """Set the transition and parent for the guard spans recorded next on this thread."""
+        self._local.guard = (tid, parent_id)
+
+    def guard(self, key: str, elapsed_ns: int, result: Optional[bool], error: Optional[str] = None) -> None:
+        tid, parent_id = getattr(self._local, "guard", (None, None))
+        end = time.time_ns()
+        span = self._start(f"guard {key}", parent_id, end - elapsed_ns)
+        span.end_ns = end
+        span.attributes["pnml.inscription.key"] = key
+        if tid is not None:
+            span.attributes["pnml.transition.id"] = tid
+        if result is not None:
+            span.attributes["pnml.guard.result"] = bool(result)
+        span.error = error
+        self.exporter.submit(span)
+
+    def op_registered(self, op_id: int, tid: str, operation_type: str, resume_token: Optional[str]) -> None:
+        current = self.current
+        span = self._start(f"async {operation_type}", current.span_id if current is not None else None)
+        span.attributes.update({
+            "pnml.transition.id": tid,
+            "pnml.op.id": op_id,
+            "pnml.op.type": operation_type,
+        })
+        if resume_token:
+            span.attributes["pnml.op.resume_token"] = resume_token
+        self._ops[op_id] = span
+
+    def op_delivering(self, op_id: int, error: Optional[str]) -> Optional[Span]:
+        """Activate the op's span so the tokens its completion produces name it as their producer."""
+        span = self._ops.pop(op_id, None)
+        if span is None:
+            return None
+        span.error = error
+        return self._activate(span)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        for span in list(self._ops.values()):
+            span.attributes["pnml.op.open"] = True
+            self.finish(span)
+        self._ops.clear()
+        self.exporter.close(timeout)
+
+
+def read_spans(path: str) -> Iterator[Tuple[Dict[str, object], Dict[str, object]]]:
+    """(resource attributes, span) pairs from an OTLP-JSON lines file."""
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                resource = {
+                    attr["key"]: next(iter(attr["value"].values()))
+                    for attr in resource_spans.get("resource", {}).get("attributes", [])
+                }
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        yield resource, span
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import heapq
+import time
+
+from .compiled_net import CompiledNet, compile_net
+from .pnml_engine import PNMLEngine, PendingOp, RunStats
+from .pnml_parser import PNMLNet
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# Placeholder used when a count-only marking is rendered as dict-of-lists.
+CONTROL_TOKEN = "token"
+_SCALARS = (str, int, float, bool)
+
+
+def _control_value(net: PNMLNet) -> Tuple[bool, object]:
+    """(True, value) when every initial token is the same scalar, so counts render exactly."""
+    tokens = [token for place in net.places.values() for token in place.tokens]
+    if not tokens:
+        return True, CONTROL_TOKEN
+    first = tokens[0]
+    if not isinstance(first, _SCALARS):
+        return False, None
+    if any(type(token) is not type(first) or token != first for token in tokens):
+        return False, None
+    return True, first
+
+
+def is_uncoloured(net: PNMLNet) -> bool:
+    """True when only token counts matter, so VectorEngine reproduces PNMLEngine exactly.
+
+    That needs no inscription or join key on any transition or arc, every
+    initial token to be the same scalar (tokens are moved, never created,
+    so the value never changes) and no input arc listed twice: PNMLEngine
+    enables such a transition with one token, a count vector needs two.
+    """
+    if any(t.inscriptions or t.join_key for t in net.transitions.values()):
+        return False
+    if any(arc.inscriptions for arc in net.arcs):
+        return False
+    inputs = [(arc.source, arc.target) for arc in net.arcs if arc.source in net.places]
+    if len(inputs) != len(set(inputs)):
+        return False
+    return _control_value(net)[0]
+
+
+def create_engine(net: PNMLNet, vector: Optional[bool] = None, **kwargs: object) -> Union[PNMLEngine, "VectorEngine"]:
+    """Return a VectorEngine for uncoloured nets when NumPy is available, else a PNMLEngine.
+
+    vector=None picks the vector engine automatically unless PNMLEngine
+    options are passed in kwargs; vector=False always returns a PNMLEngine.
+    """
+    if vector is None:
+        vector = not kwargs
+    if vector and np is not None and is_uncoloured(net):
+        return VectorEngine(net)
+    return PNMLEngine(net, **kwargs)  # type: ignore[arg-type]
+
+
+class VectorEngine:
+    """P/T engine over an integer marking vector.
+
+    Mirrors PNMLEngine's token flow for nets without inscriptions: a transition
+    needs one token per input arc and emits the moved tokens (or one control
+    token when it has no inputs) to every output place. Transitions without
+    input arcs never fire, and the transition choice follows PNMLEngine
+    (first enabled, preferring ones that do not consume initially marked places).
+    Token values are not tracked, only counts; marking renders every token
+    as the net's single initial token value (CONTROL_TOKEN when it has none).
+
+    Enabledness is kept incrementally: each transition counts its short input
+    places, and a firing only revisits the consumers of the places it changed.
+    Enabled transitions sit in a heap keyed by selection order, so picking the
+    next one does not scan the net.
+    """
+
+    def __init__(self, net: PNMLNet) -> None:
+        if np is None:
+            raise RuntimeError("VectorEngine requires numpy")
+        self.net = net
+        self.compiled: CompiledNet = compile_net(net)
+        self.pending_ops_by_id: Dict[int, PendingOp] = {}
+        self.pending_ops_by_token: Dict[str, PendingOp] = {}
+        self.run_id: str = f"run-{int(time.time() * 1000)}"
+        exact, value = _control_value(net)
+        self.token_value: object = value if exact else CONTROL_TOKEN
+        compiled = self.compiled
+        self._counts: List[int] = [len(net.places[pid].tokens) for pid in compiled.place_ids]
+
+        # Transitions in selection order: those with inputs only, non-initial first.
+        order = sorted(compiled.enable_order, key=lambda t: compiled.touches_initial[t])
+        self._order = order
+
+        # Per ordered transition: net change per place; per place: (transition, weight)
+        # for every transition consuming it.
+        self._deltas: List[List[Tuple[int, int]]] = []
+        self._consumers: List[List[Tuple[int, int]]] = [[] for _ in compiled.place_ids]
+        self._short: List[int] = []
+        for k, t in enumerate(order):
+            weights: Dict[int, int] = {}
+            for p in compiled.inputs[t]:
+                weights[p] = weights.get(p, 0) + 1
+            short = 0
+            for p, w in weights.items():
+                self._consumers[p].append((k, w))
+                short += self._counts[p] < w
+            self._short.append(short)
+            moved = max(len(compiled.inputs[t]), 1)
+            delta: Dict[int, int] = {p: -w for p, w in weights.items()}
+            for p in compiled.outputs[t]:
+                delta[p] = delta.get(p, 0) + moved
+            self._deltas.append([(p, d) for p, d in delta.items() if d])
+        self._firings: List[int] = [0] * len(order)
+        # Every enabled transition has one entry; disabled ones may have a stale one.
+        self._heap: List[int] = [k for k, short in enumerate(self._short) if not short]
+        self._queued: List[bool] = [not short for short in self._short]
+
+    @property
+    def counts(self) -> "np.ndarray":
+        return np.array(self._counts, dtype=np.int64)
+
+    @property
+    def marking(self) -> Dict[str, List[object]]:
+        return {pid: [self.token_value] * n for pid, n in zip(self.compiled.place_ids, self._counts)}
+
+    def marking_counts(self) -> Dict[str, int]:
+        return dict(zip(self.compiled.place_ids, self._counts))
+
+    def enabled_transitions(self) -> List[str]:
+        ids = self.compiled.transition_ids
+        enabled = {self._order[k] for k, short in enumerate(self._short) if not short}
+        return [ids[t] for t in self.compiled.enable_order if t in enabled]
+
+    def fire(self, steps: int = 1) -> int:
+        """Fire up to steps transitions; return how many fired before quiescence."""
+        counts, short, queued, heap = self._counts, self._short, self._queued, self._heap
+        deltas, consumers, firings = self._deltas, self._consumers, self._firings
+        push, pop = heapq.heappush, heapq.heappop
+        fired = 0
+        while fired < steps:
+            while heap and short[heap[0]]:
+                queued[pop(heap)] = False
+            if not heap:
+                break
+            # The fired transition stays at the head; the next pass drops it if it got disabled.
+            k = heap[0]
+            for p, d in deltas[k]:
+                old = counts[p]
+                new = counts[p] = old + d
+                for c, w in consumers[p]:
+                    if old >= w:
+                        if new < w:
+                            short[c] += 1
+                    elif new >= w:
+                        short[c] -= 1
+                        if not short[c] and not queued[c]:
+                            queued[c] = True
+                            push(heap, c)
+            firings[k] += 1
+            fired += 1
+        return fired
+
+    def step_once(self) -> Optional[str]:
+        heap, short, queued = self._heap, self._short, self._queued
+        while heap and short[heap[0]]:
+            queued[heapq.heappop(heap)] = False
+        if not heap:
+            return None
+        k = heap[0]
+        self.fire(1)
+        return self.compiled.transition_ids[self._order[k]]
+
+    def run(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[["VectorEngine"], bool]] = None,
+        batch: int = 1024,
+    ) -> RunStats:
+        """Fire in batches until quiescence or max_steps; until(engine) is checked between batches."""
+        stats = RunStats()
+        started = time.perf_counter()
+        before = list(self._firings)
+        while True:
+            if max_steps is not None and stats.steps >= max_steps:
+                stats.stop_reason = "max_steps"
+                break
+            if until is not None and until(self):
+                stats.stop_reason = "until"
+                break
+            chunk = batch if until is None else 1
+            if max_steps is not None:
+                chunk = min(chunk, max_steps - stats.steps)
+            fired = self.fire(chunk)
+            stats.steps += fired
+            if fired < chunk:
+                stats.stop_reason = "quiescent"
+                break
+        ids = self.compiled.transition_ids
+        for k, (now, then) in enumerate(zip(self._firings, before)):
+            if now != then:
+                stats.firings[ids[self._order[k]]] = now - then
+        stats.wall_time = time.perf_counter() - started
+        return stats
+
+    def submit_async(self, *args: object, **kwargs: object) -> None:
+        # Uncoloured nets have no inscriptions, so no async op can be pending.
+        return None